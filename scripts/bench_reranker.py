@@ -0,0 +1,72 @@
+"""
+CPU throughput benchmark for the evidence reranker.
+
+Scores N synthetic evidence items against a topic with each RERANK_BACKEND
+and reports items/sec for a cold embedding cache and for a warm one (the
+same items reranked again, as on a re-plan iteration or a repeated query).
+
+    python scripts/bench_reranker.py
+    python scripts/bench_reranker.py --items 500 --file texts.txt --topic "vector databases"
+"""
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+REPO = Path(__file__).parent.parent
+sys.path.insert(0, str(REPO))
+
+from src.config import settings  # noqa: E402
+from src.rerank import EmbeddingCache, Reranker  # noqa: E402
+
+WORDS = ("retrieval augmented generation vector database embedding index latency throughput "
+         "benchmark model context window chunking reranking transformer attention query "
+         "document corpus evaluation precision recall cache memory cpu gpu quantization").split()
+
+
+def synthetic_texts(n, words=120, seed=7):
+    rng = random.Random(seed)
+    return [" ".join(rng.choice(WORDS) for _ in range(words)) for _ in range(n)]
+
+
+def timed(reranker, topic, texts):
+    start = time.perf_counter()
+    reranker.rank(topic, texts)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--items", type=int, default=200)
+    parser.add_argument("--file", help="file with one evidence text per line (default: synthetic text)")
+    parser.add_argument("--topic", default="retrieval augmented generation latency")
+    parser.add_argument("--backend", choices=["embedding", "bm25"], action="append",
+                        help="benchmark only these backends (repeatable)")
+    args = parser.parse_args()
+
+    if args.file:
+        texts = [line.strip() for line in Path(args.file).read_text().splitlines() if line.strip()][:args.items]
+    else:
+        texts = synthetic_texts(args.items)
+
+    print(f"{len(texts)} items, batch {settings.rerank_batch_size}\n")
+    print(f"{'backend':<10} {'cold items/s':>13} {'warm items/s':>13}")
+    fell_back = False
+    for backend in args.backend or ["embedding", "bm25"]:
+        settings.rerank_backend = backend
+        reranker = Reranker(EmbeddingCache(max_entries=len(texts) + 1))
+        if backend == "embedding":
+            reranker.preload(timeout=600)  # model load / first-use download is not throughput
+        cold = timed(reranker, args.topic, texts)
+        warm = timed(reranker, args.topic, texts)
+        label = backend
+        if reranker.backend() != backend:
+            label, fell_back = f"{backend}*", True
+        print(f"{label:<10} {len(texts) / cold:>13.0f} {len(texts) / warm:>13.0f}")
+    if fell_back:
+        print("\n* embedding model unavailable, numbers are for the BM25 fallback")
+
+
+if __name__ == "__main__":
+    main()
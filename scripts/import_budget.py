@@ -0,0 +1,108 @@
+"""
+Import-time budget report for Research-Agent.
+
+Runs each entry point in a fresh interpreter with `python -X importtime`,
+reports the cumulative import cost of the project modules and the heaviest
+third-party packages they pull in, and exits non-zero when a budget is exceeded.
+
+    python scripts/import_budget.py
+    python scripts/import_budget.py --top 15 --module src.tools.research_tools
+"""
+import argparse
+import re
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+REPO = Path(__file__).parent.parent
+
+# Entry point -> budget in milliseconds (cumulative import time)
+BUDGETS_MS = {
+    "src.main": 700,
+    "src.agent": 700,
+    "src.scheduler": 500,
+    "src.tools.research_tools": 800,
+    "src.tools.youtube_tools": 800,
+    "src.tools.reporting_tools": 700,
+}
+
+# Backends that must only load when the node that needs them runs
+LAZY_BACKENDS = [
+    "langgraph", "fpdf", "docx", "markdown", "smtplib", "github", "arxiv",
+    "semanticscholar", "youtube_search", "langchain_classic", "pypdf", "chromadb",
+]
+
+LINE_RE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def measure(module: str):
+    """Return ({module: cumulative_us} for top-level imports, total_us) for one fresh import."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=REPO, capture_output=True, text=True,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{proc.stderr[-2000:]}")
+
+    cumulative = {}
+    total = 0
+    for line in proc.stderr.splitlines():
+        m = LINE_RE.match(line)
+        if not m:
+            continue
+        cum_us, indent, name = int(m.group(2)), len(m.group(3)), m.group(4)
+        cumulative[name] = max(cumulative.get(name, 0), cum_us)
+        if indent == 1:  # top-level import of this interpreter
+            total += cum_us
+        if name == module:
+            total = max(total, cum_us)
+    return cumulative, total
+
+
+def help_wall_time() -> float:
+    start = time.perf_counter()
+    subprocess.run([sys.executable, "src/main.py", "--help"], cwd=REPO, capture_output=True, check=True)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import-time budget report")
+    parser.add_argument("--module", action="append", help="Only measure these modules (repeatable)")
+    parser.add_argument("--top", type=int, default=8, help="Heaviest imports to list per module")
+    args = parser.parse_args()
+
+    modules = args.module or list(BUDGETS_MS)
+    failures = []
+
+    for module in modules:
+        cumulative, own = measure(module)
+        budget = BUDGETS_MS.get(module)
+        status = "OK" if budget is None or own / 1000 <= budget else "OVER"
+        if status == "OVER":
+            failures.append(module)
+        budget_txt = f"{budget} ms" if budget else "-"
+        print(f"\n{module:<32} {own / 1000:>8.1f} ms  (budget {budget_txt})  {status}")
+
+        leaked = sorted(b for b in LAZY_BACKENDS if b in cumulative)
+        if leaked:
+            failures.append(module)
+            print(f"  eagerly imports lazy backends: {', '.join(leaked)}")
+
+        heaviest = sorted(
+            ((n, us) for n, us in cumulative.items() if "." not in n and n != module),
+            key=lambda item: item[1], reverse=True,
+        )[:args.top]
+        for name, us in heaviest:
+            print(f"  {name:<30} {us / 1000:>8.1f} ms")
+
+    if not args.module:
+        print(f"\npython src/main.py --help: {help_wall_time():.2f} s wall time")
+
+    if failures:
+        print(f"\nImport budget exceeded: {', '.join(sorted(set(failures)))}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
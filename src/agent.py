@@ -1,13 +1,8 @@
 # src/agent.py
 
 import logging
-from langgraph.graph import StateGraph, END
+import threading
 from .state import AgentState
-from .tools.reporting_tools import generate_report_node, send_email_node
-from .tools.router_tools import plan_research_node, evaluate_research_node
-from .tools.synthesis_tools import consolidate_research_node
-from .tools.chat_tools import chat_node
-from .tools.parallel_tools import parallel_search_node
 
 logger = logging.getLogger(__name__)
 
@@ -49,7 +44,8 @@ def initialize_state_node(state: AgentState) -> dict:
         "evaluation_report": state.get("evaluation_report", ""),
         "queries": state.get("queries", {}),
         "source_metadata": state.get("source_metadata", {}),
-        "use_rag": state.get("use_rag", False)
+        "use_rag": state.get("use_rag", False),
+        "session_id": state.get("session_id", "")
     }
 
     return defaults
@@ -115,61 +111,99 @@ def save_db_node(state: AgentState) -> dict:
         print(f"⚠️ Error al guardar sesión: {e}")
     return {} # No state update needed
 
-# Create workflow graph
-workflow = StateGraph(AgentState)
-
-# Add nodes
-logger.info("Defining workflow nodes...")
-workflow.add_node("initialize_state", initialize_state_node)
-workflow.add_node("plan_research", plan_research_node)
-workflow.add_node("parallel_search", parallel_search_node)
-workflow.add_node("consolidate_research", consolidate_research_node)
-workflow.add_node("generate_report", generate_report_node)
-workflow.add_node("send_email", send_email_node)
-workflow.add_node("save_db", save_db_node)
-workflow.add_node("chat", chat_node)
-workflow.add_node("evaluate_research", evaluate_research_node)
-
-# Add edges - simplified parallel flow
-logger.info("Connecting nodes with edges...")
-workflow.set_entry_point("initialize_state")
-workflow.add_edge("initialize_state", "plan_research")
-
-workflow.add_edge("plan_research", "parallel_search")
-workflow.add_edge("parallel_search", "consolidate_research")
-workflow.add_edge("consolidate_research", "evaluate_research")
-
 
 def route_evaluation(state: AgentState):
     """Route based on evaluation result."""
     return state.get("next_node", "END")
 
 
-workflow.add_conditional_edges(
-    "evaluate_research",
-    route_evaluation,
-    {
-        "plan_research": "plan_research",
-        "END": "generate_report"
-    }
-)
-
-workflow.add_edge("generate_report", "send_email")
-
-# Chat node is kept for manual interaction, but not as part of the automated sequence
-workflow.add_conditional_edges(
-    "chat",
-    route_chat,
-    {
-        "re_plan": "plan_research",
-        "send_email": "send_email"
-    }
-)
-
-workflow.add_edge("send_email", "save_db")
-workflow.add_edge("save_db", END)
-
-# Compile the agent
-logger.info("Compiling agent...")
-app = workflow.compile()
-logger.info("Agent compiled successfully!")
+def build_graph():
+    """Build and compile the research workflow.
+
+    LangGraph and the node modules are imported here rather than at module
+    import time, so `import src.agent` stays cheap; use `get_app()` (or
+    `from src.agent import app`) to get the shared compiled graph.
+    """
+    from langgraph.graph import StateGraph, END
+    from .tools.reporting_tools import generate_report_node, send_email_node
+    from .tools.router_tools import plan_research_node, evaluate_research_node
+    from .tools.synthesis_tools import consolidate_research_node
+    from .tools.chat_tools import chat_node
+    from .tools.parallel_tools import parallel_search_node
+    from .tools.evidence_tools import refine_evidence_node
+
+    # Create workflow graph
+    workflow = StateGraph(AgentState)
+
+    # Add nodes
+    logger.info("Defining workflow nodes...")
+    workflow.add_node("initialize_state", initialize_state_node)
+    workflow.add_node("plan_research", plan_research_node)
+    workflow.add_node("parallel_search", parallel_search_node)
+    workflow.add_node("refine_evidence", refine_evidence_node)
+    workflow.add_node("consolidate_research", consolidate_research_node)
+    workflow.add_node("generate_report", generate_report_node)
+    workflow.add_node("send_email", send_email_node)
+    workflow.add_node("save_db", save_db_node)
+    workflow.add_node("chat", chat_node)
+    workflow.add_node("evaluate_research", evaluate_research_node)
+
+    # Add edges - simplified parallel flow
+    logger.info("Connecting nodes with edges...")
+    workflow.set_entry_point("initialize_state")
+    workflow.add_edge("initialize_state", "plan_research")
+
+    workflow.add_edge("plan_research", "parallel_search")
+    workflow.add_edge("parallel_search", "refine_evidence")
+    workflow.add_edge("refine_evidence", "consolidate_research")
+    workflow.add_edge("consolidate_research", "evaluate_research")
+
+    workflow.add_conditional_edges(
+        "evaluate_research",
+        route_evaluation,
+        {
+            "plan_research": "plan_research",
+            "END": "generate_report"
+        }
+    )
+
+    workflow.add_edge("generate_report", "send_email")
+
+    # Chat node is kept for manual interaction, but not as part of the automated sequence
+    workflow.add_conditional_edges(
+        "chat",
+        route_chat,
+        {
+            "re_plan": "plan_research",
+            "send_email": "send_email"
+        }
+    )
+
+    workflow.add_edge("send_email", "save_db")
+    workflow.add_edge("save_db", END)
+
+    # Compile the agent
+    logger.info("Compiling agent...")
+    compiled = workflow.compile()
+    logger.info("Agent compiled successfully!")
+    return compiled
+
+
+_app = None
+_app_lock = threading.Lock()
+
+
+def get_app():
+    """Compiled graph shared by the CLI, dashboard, scheduler and batch runner (built on first use)."""
+    global _app
+    with _app_lock:
+        if _app is None:
+            _app = build_graph()
+        return _app
+
+
+def __getattr__(name):
+    # Keeps `from src.agent import app` working without compiling at import time
+    if name == "app":
+        return get_app()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
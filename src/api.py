@@ -0,0 +1,270 @@
+# src/api.py — lightweight async HTTP API over the research graph
+#
+#   POST /jobs                      submit a research job       -> 202 {job_id, position, eta_seconds}
+#   GET  /jobs/{job_id}             job status, queue position and ETA
+#   GET  /jobs/{job_id}/events      progress stream (Server-Sent Events)
+#   GET  /jobs/{job_id}/result      final state (consolidated summary, sources, report paths)
+#   GET  /jobs/{job_id}/artifacts/{kind}   generated report file (pdf | docx | md | html)
+#   GET  /health                    liveness + scheduler load + last readiness snapshot
+#   GET  /ready                     200 once the LLM and disk checks pass, 503 otherwise
+#
+# Run with:  python -m src.api  (or python src/api.py)
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import sys
+
+from aiohttp import web
+
+# Add project root to sys.path so the 'src' package resolves when run as `python src/api.py`
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from pydantic import ValidationError  # noqa: E402
+from src.config import settings  # noqa: E402
+from src.circuit_breaker import source_breakers  # noqa: E402
+from src.rate_limit import api_limiters  # noqa: E402
+from src.singleflight import source_flights  # noqa: E402
+from src.rerank import reranker  # noqa: E402
+from src.events import progress_bus  # noqa: E402
+from src.health import get_readiness_probe  # noqa: E402
+from src.scheduler import get_scheduler, QueueFullError, FINISHED_STATUSES  # noqa: E402
+from src.validators import ResearchRequest  # noqa: E402
+
+logger = logging.getLogger(__name__)
+
+SCHEDULER_KEY = web.AppKey("scheduler", object)
+PROBE_KEY = web.AppKey("readiness_probe", object)
+
+ARTIFACTS = {
+    "pdf": ("pdf_path", "application/pdf"),
+    "docx": ("docx_path", "application/vnd.openxmlformats-officedocument.wordprocessingml.document"),
+    "md": ("md_path", "text/markdown"),
+    "html": ("html_path", "text/html"),
+}
+
+ALL_SOURCES = ["wiki", "web", "arxiv", "scholar", "github", "hn", "so", "youtube", "reddit"]
+
+
+class AsyncQueueSink:
+    """Thread-safe bridge from the (threaded) progress bus into an asyncio queue."""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop):
+        self.loop = loop
+        self.queue: asyncio.Queue = asyncio.Queue()
+
+    def put_nowait(self, event: dict):
+        self.loop.call_soon_threadsafe(self.queue.put_nowait, event)
+
+
+def _json(data, status: int = 200, headers=None) -> web.Response:
+    return web.json_response(data, status=status, headers=headers, dumps=lambda d: json.dumps(d, default=str, ensure_ascii=False))
+
+
+def _public_event(event: dict) -> dict:
+    """Strip full state chunks from node events; clients only need what happened."""
+    if event.get("type") != "node":
+        return event
+    nodes = list(event.get("chunk", {}).keys())
+    updates = [u for u in event.get("chunk", {}).values() if isinstance(u, dict)]
+    next_node = next((u["next_node"] for u in updates if u.get("next_node")), None)
+    return {"type": "node", "session_id": event["session_id"], "ts": event["ts"], "nodes": nodes, "next_node": next_node}
+
+
+def _get_job(request: web.Request):
+    job = request.app[SCHEDULER_KEY].get(request.match_info["job_id"])
+    if job is None:
+        raise web.HTTPNotFound(text=json.dumps({"error": "unknown job"}), content_type="application/json")
+    return job
+
+
+async def submit_job(request: web.Request) -> web.Response:
+    probe = request.app[PROBE_KEY]
+    if probe.ready is False:
+        # Runs would only fail against a missing LLM; refuse early instead of queueing them
+        return _json({"error": "service not ready", **probe.snapshot()}, status=503,
+                     headers={"Retry-After": str(int(probe.interval))})
+
+    try:
+        body = await request.json()
+    except json.JSONDecodeError:
+        return _json({"error": "body must be JSON"}, status=400)
+    if not isinstance(body, dict):
+        return _json({"error": "body must be a JSON object"}, status=400)
+
+    try:
+        req = ResearchRequest(
+            topic=body.get("topic", ""),
+            research_depth=body.get("research_depth", "standard"),
+            persona=body.get("persona", "general"),
+        )
+    except ValidationError as e:
+        return _json({"error": "invalid request", "details": json.loads(e.json())}, status=422)
+
+    sources = body.get("sources", ALL_SOURCES)
+    if not isinstance(sources, list) or not all(isinstance(s, str) for s in sources):
+        return _json({"error": "sources must be a list of source names", "allowed": ALL_SOURCES}, status=422)
+    sources = [s for s in sources if s in ALL_SOURCES]
+    use_rag = bool(body.get("use_rag", False))
+    plan = (["local_rag"] if use_rag else []) + sources
+
+    inputs = {
+        "topic": req.topic,
+        "original_topic": req.topic,
+        "research_depth": req.research_depth,
+        "persona": req.persona,
+        "time_range": body.get("time_range"),
+        "use_rag": use_rag,
+    }
+    if body.get("search_budget_s") is not None:
+        try:
+            inputs["search_budget"] = float(body["search_budget_s"])
+        except (TypeError, ValueError):
+            return _json({"error": "search_budget_s must be a number of seconds"}, status=422)
+    if plan:
+        inputs["research_plan"] = plan
+        inputs["next_node"] = "parallel_search"
+
+    scheduler = request.app[SCHEDULER_KEY]
+    try:
+        job = scheduler.submit(inputs)
+    except QueueFullError as e:
+        retry_after = int(scheduler.average_duration() / max(scheduler.slots, 1))
+        return _json({"error": str(e)}, status=503, headers={"Retry-After": str(retry_after)})
+
+    return _json(scheduler.status(job.job_id), status=202, headers={"Location": f"/jobs/{job.job_id}"})
+
+
+async def job_status(request: web.Request) -> web.Response:
+    job = _get_job(request)
+    return _json(request.app[SCHEDULER_KEY].status(job.job_id))
+
+
+async def job_events(request: web.Request) -> web.StreamResponse:
+    """Stream the job's progress as SSE until it finishes."""
+    job = _get_job(request)
+    scheduler = request.app[SCHEDULER_KEY]
+
+    response = web.StreamResponse(headers={
+        "Content-Type": "text/event-stream",
+        "Cache-Control": "no-cache",
+        "X-Accel-Buffering": "no",
+    })
+    await response.prepare(request)
+
+    async def send(event_type: str, data: dict):
+        payload = json.dumps(data, default=str, ensure_ascii=False)
+        await response.write(f"event: {event_type}\ndata: {payload}\n\n".encode("utf-8"))
+
+    # Subscribe before the snapshot so no event falls between the two
+    sink = AsyncQueueSink(asyncio.get_running_loop())
+    progress_bus.subscribe(job.job_id, sink)
+    try:
+        await send("status", scheduler.status(job.job_id))
+        if job.status in FINISHED_STATUSES:
+            await send("done", {"status": job.status})
+            return response
+
+        while True:
+            try:
+                event = await asyncio.wait_for(sink.queue.get(), timeout=settings.api_keepalive_interval)
+            except asyncio.TimeoutError:
+                await response.write(b": keep-alive\n\n")
+                continue
+            await send(event["type"], _public_event(event))
+            if event["type"] == "done":
+                break
+    except ConnectionResetError:
+        logger.debug(f"SSE client for job {job.job_id} disconnected")
+    finally:
+        progress_bus.unsubscribe(job.job_id, sink)
+    return response
+
+
+async def job_result(request: web.Request) -> web.Response:
+    job = _get_job(request)
+    if job.status == "error":
+        return _json({"job_id": job.job_id, "status": "error", "error": job.error}, status=500)
+    if job.status != "done":
+        return _json(request.app[SCHEDULER_KEY].status(job.job_id), status=202)
+
+    result = {k: v for k, v in (job.result or {}).items() if k not in ("messages", "report")}
+    return _json({"job_id": job.job_id, "status": "done", "result": result})
+
+
+async def job_artifact(request: web.Request) -> web.StreamResponse:
+    job = _get_job(request)
+    kind = request.match_info["kind"]
+    if kind not in ARTIFACTS:
+        return _json({"error": f"unknown artifact '{kind}'", "available": list(ARTIFACTS)}, status=404)
+    if job.status != "done":
+        return _json(request.app[SCHEDULER_KEY].status(job.job_id), status=202)
+
+    state_key, content_type = ARTIFACTS[kind]
+    path = (job.result or {}).get(state_key)
+    if not path or not os.path.exists(path):
+        return _json({"error": f"{kind} artifact not generated"}, status=404)
+
+    return web.FileResponse(path, headers={
+        "Content-Type": content_type,
+        "Content-Disposition": f'attachment; filename="reporte.{kind}"',
+    })
+
+
+async def health(request: web.Request) -> web.Response:
+    return _json({
+        "status": "ok",
+        "scheduler": request.app[SCHEDULER_KEY].stats(),
+        "readiness": request.app[PROBE_KEY].snapshot(),
+        "sources": source_breakers.snapshot(),
+        "rate_limits": api_limiters.snapshot(),
+        "single_flight": source_flights.stats(),
+        "rerank": reranker.stats(),
+    })
+
+
+async def ready(request: web.Request) -> web.Response:
+    snapshot = request.app[PROBE_KEY].snapshot()
+    return _json(snapshot, status=200 if snapshot["ready"] else 503)
+
+
+def create_app(scheduler=None, probe=None) -> web.Application:
+    app = web.Application()
+    app[SCHEDULER_KEY] = scheduler or get_scheduler()
+    app[PROBE_KEY] = probe or get_readiness_probe()
+    app.router.add_post("/jobs", submit_job)
+    app.router.add_get("/jobs/{job_id}", job_status)
+    app.router.add_get("/jobs/{job_id}/events", job_events)
+    app.router.add_get("/jobs/{job_id}/result", job_result)
+    app.router.add_get("/jobs/{job_id}/artifacts/{kind}", job_artifact)
+    app.router.add_get("/health", health)
+    app.router.add_get("/ready", ready)
+    return app
+
+
+def main():
+    """Entry point for the HTTP API server."""
+    from dotenv import load_dotenv
+    from src.utils import setup_logging, bypass_proxy_for_ollama
+
+    load_dotenv(os.path.join(project_root, ".env"))
+    parser = argparse.ArgumentParser(description="Research-Agent HTTP API")
+    parser.add_argument("--host", default=settings.api_host)
+    parser.add_argument("--port", type=int, default=settings.api_port)
+    parser.add_argument("--log-level", choices=["DEBUG", "INFO", "WARNING", "ERROR"], default=settings.log_level)
+    args = parser.parse_args()
+
+    setup_logging(args.log_level)
+    bypass_proxy_for_ollama()
+    # Load the rerank model while the server comes up, not inside the first run
+    from src.rerank import reranker
+    reranker.preload()
+    web.run_app(create_app(), host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
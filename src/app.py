@@ -11,7 +11,6 @@ if project_root not in sys.path:
 from dotenv import load_dotenv
 load_dotenv(os.path.join(project_root, ".env"))
 
-from src.agent import app
 import streamlit.components.v1 as components
 from src.db_manager import get_recent_sessions, load_session, clear_history
 from src.i18n import T
@@ -293,13 +292,18 @@ if "messages" not in st.session_state:
 if "agent_state" not in st.session_state:
     st.session_state.agent_state = None
 
-    # Auto-detectar reportes existentes al iniciar
-if not st.session_state.investigation_done:
-    if os.path.exists("reports/reporte_final.html"):
-        with open("reports/reporte_final.html", "r", encoding="utf-8") as f:
-            st.session_state.report_html = f.read()
-        st.session_state.investigation_done = True
-        st.session_state.last_topic = "__saved_report__"
+
+@st.cache_resource
+def _startup_maintenance():
+    """Once per process: prune report folders of old sessions and start loading the rerank model."""
+    from src.db_manager import cleanup_old_reports
+    from src.rerank import reranker
+    cleanup_old_reports()
+    reranker.preload()
+    return True
+
+
+_startup_maintenance()
 
 # Main UI
 st.title("🔍 Research-Agent")
@@ -307,9 +311,19 @@ st.subheader(_["page_subtitle"])
 
 topic = st.text_input(_["topic_label"], placeholder=_["topic_placeholder"])
 
+# Readiness is checked in the background; the page only reads the latest snapshot
+from src.health import get_readiness_probe, CRITICAL_CHECKS
+readiness = get_readiness_probe().snapshot()
+unreachable = [s for s in selected_sources if f"source:{s}" in readiness["degraded"]]
+if unreachable:
+    st.caption(_["sources_degraded"].format(sources=", ".join(unreachable)))
+
 if st.button(_["start_btn"]):
     if not topic:
         st.warning(_["topic_warning"])
+    elif readiness["ready"] is False:
+        failed = [c for c in CRITICAL_CHECKS if not readiness["checks"].get(c)]
+        st.error(_["service_not_ready"].format(checks=", ".join(failed)))
     else:
         # Clear previous state to ensure clean start
         st.session_state.investigation_done = False
@@ -318,15 +332,14 @@ if st.button(_["start_btn"]):
 
         with st.status(_["status_running"], expanded=True) as status:
             try:
-                # Actualizar variables de entorno para el modelo seleccionado
-                os.environ["OLLAMA_MODEL"] = llm_model
-
-                # Pass selected sources and depth to the agent
+                # Pass selected sources, depth and model to the agent. The model travels
+                # in the state: the job may start after another session picked a different one.
                 inputs = {
                     "topic": topic,
                     "original_topic": topic, # Preserve original for titles
                     "research_depth": research_depth,
                     "persona": persona,
+                    "llm_model": llm_model,
                     "time_range": time_range,
                     "use_rag": use_rag
                 }
@@ -361,129 +374,120 @@ if st.button(_["start_btn"]):
                     "search_so": _["node_search_so"],
                     "search_reddit": _["node_search_reddit"],
                     "local_rag": _["node_local_rag"],
+                    "refine_evidence": _["node_refine_evidence"],
                     "consolidate_research": _["node_consolidate_research"],
                     "evaluate_research": _["node_evaluate_research"],
                     "generate_report": _["node_generate_report"],
                     "send_email": _["node_send_email"],
                 }
 
-                # Streaming execution with Threading and Queue to allow Progress Polling
-                import threading
-                import queue
-                import time
-                import json
-                from src.tools.parallel_tools import PARALLEL_STATUS_FILE
+                # Research runs go through the shared job scheduler, which bounds
+                # how many execute at once. Agent chunks, queue updates and node
+                # progress share the session's event channel, so the UI blocks on
+                # a single queue instead of spinning.
+                import uuid
+                from src.events import progress_bus, collect_events
+                from src.config import settings
+                from src.scheduler import get_scheduler, QueueFullError
+
+                session_id = uuid.uuid4().hex
+                inputs["session_id"] = session_id
+                ui_q = progress_bus.subscribe(session_id)
 
                 final_state = inputs.copy()
                 status_container = st.empty()
                 rag_progress_bar = st.empty()
                 
-                # Queue for agent events
-                event_q = queue.Queue()
-                
-                def run_agent_in_thread(inputs_dict, q):
-                    try:
-                        for chunk in app.stream(inputs_dict, config={"recursion_limit": 100}):
-                            q.put(chunk)
-                    except Exception as e:
-                        q.put({"error": str(e)})
-                    finally:
-                        q.put(None) # Sentinel
-                
-                # Start Agent Thread
-                agent_thread = threading.Thread(target=run_agent_in_thread, args=(inputs, event_q))
-                agent_thread.start()
-                
-                # Main Loop: consume events AND poll RAG/parallel status
-                rag_status_file = "/app/data/rag_status.json"
+                try:
+                    job = get_scheduler().submit(inputs)
+                except QueueFullError:
+                    progress_bus.close(session_id)
+                    raise Exception(_["queue_full"])
                 
-                while True:
-                    # 1. Poll Queue for Agent Events
-                    try:
-                        while True:
-                            # Non-blocking get all available items
-                            chunk = event_q.get_nowait()
-                            
-                            if chunk is None: # Sentinel
-                                agent_thread.join()
-                                break
-                            
-                            if "error" in chunk and isinstance(chunk, dict) and len(chunk) == 1:
-                                raise Exception(chunk["error"])
-                                
-                            for node_name, state_update in chunk.items():
-                                if isinstance(state_update, dict):
-                                    final_state.update(state_update)
-                                
-                                # UI Updates for Completed Nodes
-                                completed_msg = node_messages.get(node_name, f"Ejecutando {node_name}...")
-                                st.write(f"✅ {completed_msg}")
-                                # Clean up progress bar when RAG finishes
-                                if node_name == "local_rag":
-                                     rag_progress_bar.empty()
-                                
-                                next_node = state_update.get("next_node") if state_update else None
-                                if next_node and next_node != "END":
-                                    next_msg = node_messages.get(next_node, f"Iniciando {next_node}...")
-                                    status_container.info(f"⏳ {next_msg}")
-                                else:
-                                    status_container.empty()
+                def render_progress(event):
+                    if event["type"] == "queue":
+                        status_container.info(_["queue_position"].format(position=event["position"], eta=int(event["eta_seconds"])))
+                    elif event["type"] == "started":
+                        status_container.empty()
+                    elif event["type"] == "parallel_search":
+                        timed_out = event.get("timed_out", [])
+                        done = [s for s in event.get("done", []) if s not in timed_out]
+                        running = event.get("running", [])
+                        total = event.get("total", 1)
+                        done_labels = [source_labels.get(s, s) for s in done]
+                        run_labels = [source_labels.get(s, s) for s in running]
+                        parts = []
+                        if done_labels:
+                            parts.append("✅ " + ", ".join(done_labels))
+                        if run_labels:
+                            parts.append("⏳ " + ", ".join(run_labels))
+                        if timed_out:
+                            parts.append("⌛ " + ", ".join(source_labels.get(s, s) for s in timed_out))
+                        status_container.info(f"🔍 **Búsqueda paralela** ({len(done) + len(timed_out)}/{total})\n\n" + "\n\n".join(parts))
+                    elif event["type"] == "rag":
+                        current = event.get("current", 0)
+                        total = event.get("total", 1)
+                        fname = event.get("last_file", "...")
+                        if total > 0:
+                            progress = min(current / total, 1.0)
+                            rag_progress_bar.progress(progress, text=f"📂 RAG: Analizando {current}/{total}: {fname}")
+
+                # Main Loop: block for events, repaint at most once per refresh interval
+                try:
+                    finished = False
+                    while not finished:
+                        batch = collect_events(ui_q, timeout=settings.ui_event_timeout, window=settings.ui_refresh_interval)
+                        if not batch:
+                            if job.is_finished and ui_q.empty():
+                                break # Finished without its sentinel reaching us
+                            continue
+
+                        # Only the latest snapshot of each progress stream is worth drawing
+                        latest_progress = {}
+                        for event in batch:
+                            if event["type"] == "done":
+                                finished = True
+                            elif event["type"] == "error":
+                                raise Exception(event["error"])
+                            elif event["type"] == "node":
+                                for node_name, state_update in event["chunk"].items():
+                                    if isinstance(state_update, dict):
+                                        final_state.update(state_update)
                                     
-                    except queue.Empty:
-                        pass
-                    
-                    if not agent_thread.is_alive() and event_q.empty():
-                        break
-                        
-                    # 2. Poll Parallel Search Status File
-                    if os.path.exists(PARALLEL_STATUS_FILE):
-                        try:
-                            with open(PARALLEL_STATUS_FILE, "r") as f:
-                                ps = json.load(f)
-                            done = ps.get("done", [])
-                            running = ps.get("running", [])
-                            total = ps.get("total", 1)
-                            done_labels = [source_labels.get(s, s) for s in done]
-                            run_labels = [source_labels.get(s, s) for s in running]
-                            parts = []
-                            if done_labels:
-                                parts.append("✅ " + ", ".join(done_labels))
-                            if run_labels:
-                                parts.append("⏳ " + ", ".join(run_labels))
-                            status_container.info(f"🔍 **Búsqueda paralela** ({len(done)}/{total})\n\n" + "\n\n".join(parts))
-                        except Exception:
-                            pass
-
-                    # 3. Poll RAG Status File (if exists)
-                    if os.path.exists(rag_status_file):
-                        try:
-                            with open(rag_status_file, "r") as f:
-                                status_data = json.load(f)
-                            
-                            current = status_data.get("current", 0)
-                            total = status_data.get("total", 1)
-                            fname = status_data.get("last_file", "...")
-                            
-                            # Update Progress Bar
-                            if total > 0:
-                                progress = min(current / total, 1.0)
-                                rag_progress_bar.progress(progress, text=f"📂 RAG: Analizando {current}/{total}: {fname}")
-                        except:
-                            pass # Ignore read errors during race conditions
-                    
-                    time.sleep(0.2) # Yield to allow thread to work
-                
-                # Cleanup status file if left over
-                if os.path.exists(rag_status_file):
-                    try:
-                        os.remove(rag_status_file)
-                    except: pass
+                                    # UI Updates for Completed Nodes
+                                    completed_msg = node_messages.get(node_name, f"Ejecutando {node_name}...")
+                                    st.write(f"✅ {completed_msg}")
+                                    # A finished node supersedes its pending progress snapshot
+                                    latest_progress.pop(node_name, None)
+                                    # Clean up progress bar when RAG finishes
+                                    if node_name in ("local_rag", "parallel_search"):
+                                        rag_progress_bar.empty()
+                                        latest_progress.pop("rag", None)
+                                    
+                                    next_node = state_update.get("next_node") if state_update else None
+                                    if next_node and next_node != "END":
+                                        next_msg = node_messages.get(next_node, f"Iniciando {next_node}...")
+                                        status_container.info(f"⏳ {next_msg}")
+                                    else:
+                                        status_container.empty()
+                            else:
+                                latest_progress[event["type"]] = event
+
+                        for event in latest_progress.values():
+                            render_progress(event)
+                finally:
+                    progress_bus.close(session_id)
+                job.wait(timeout=settings.ui_event_timeout)
+                if job.result:
+                    final_state.update(job.result)
+                get_scheduler().forget(job.job_id)
                     
                 st.session_state.agent_state = final_state
 
                 # Guardar resultados en session_state para persistencia
-                if os.path.exists("reports/reporte_final.html"):
-                    with open("reports/reporte_final.html", "r", encoding="utf-8") as f:
+                html_path = final_state.get("html_path") or "reports/reporte_final.html"
+                if os.path.exists(html_path):
+                    with open(html_path, "r", encoding="utf-8") as f:
                         st.session_state.report_html = f.read()
 
                 st.session_state.last_topic = topic
@@ -499,31 +503,37 @@ if st.button(_["start_btn"]):
 # --- SECCIÓN DE RESULTADOS ---
 if st.session_state.investigation_done:
     st.divider()
-    _topic = _["autoreport_topic"] if st.session_state.last_topic == "__saved_report__" else st.session_state.last_topic
-    st.subheader(_["results_header"].format(topic=_topic))
+    st.subheader(_["results_header"].format(topic=st.session_state.last_topic))
 
     # Multi-format Download Center
     st.write(_["downloads_header"])
     col1, col2, col3, col4 = st.columns(4)
 
+    # Scheduled runs write to a per-session folder; fall back to the legacy CLI paths
+    _paths = st.session_state.agent_state or {}
+    pdf_file = _paths.get("pdf_path") or "reports/reporte_investigacion.pdf"
+    docx_file = _paths.get("docx_path") or "reports/reporte_final.docx"
+    md_file = _paths.get("md_path") or "reports/reporte_final.md"
+    html_file = _paths.get("html_path") or "reports/reporte_final.html"
+
     with col1:
-        if os.path.exists("reports/reporte_investigacion.pdf"):
-            with open("reports/reporte_investigacion.pdf", "rb") as f:
+        if os.path.exists(pdf_file):
+            with open(pdf_file, "rb") as f:
                 st.download_button("📕 PDF", f, "reporte.pdf", "application/pdf")
 
     with col2:
-        if os.path.exists("reports/reporte_final.docx"):
-            with open("reports/reporte_final.docx", "rb") as f:
+        if os.path.exists(docx_file):
+            with open(docx_file, "rb") as f:
                 st.download_button("📘 Word", f, "reporte.docx", "application/vnd.openxmlformats-officedocument.wordprocessingml.document")
 
     with col3:
-        if os.path.exists("reports/reporte_final.md"):
-            with open("reports/reporte_final.md", "rb") as f:
+        if os.path.exists(md_file):
+            with open(md_file, "rb") as f:
                 st.download_button("📝 Markdown", f, "reporte.md", "text/markdown")
 
     with col4:
-        if os.path.exists("reports/reporte_final.html"):
-            with open("reports/reporte_final.html", "rb") as f:
+        if os.path.exists(html_file):
+            with open(html_file, "rb") as f:
                 st.download_button("🌐 HTML", f, "reporte.html", "text/html")
 
     # Mostrar el reporte HTML persistido
@@ -607,7 +617,8 @@ if st.session_state.investigation_done:
                     st.markdown(ai_response)
                     st.session_state.messages.append({"role": "assistant", "content": ai_response})
 
-                    # Update persisted agent state
+                    # Update persisted agent state (session id and rolling chat summary included)
+                    current_state.update({k: v for k, v in response_state.items() if k != "messages"})
                     current_state["messages"].append(AIMessage(content=ai_response))
                     st.session_state.agent_state = current_state
 
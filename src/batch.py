@@ -0,0 +1,146 @@
+import hashlib
+import json
+import logging
+import os
+import sys
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, List, Optional
+
+from .config import settings
+from .db_manager import init_db, mark_batch_topic, get_batch_status
+
+logger = logging.getLogger(__name__)
+
+
+def read_topics(source: str) -> List[str]:
+    """Read one topic per line from a file, or from stdin when ``source`` is '-'.
+
+    Blank lines and lines starting with '#' are ignored; duplicates keep their first position.
+    """
+    if source == "-":
+        lines = sys.stdin.read().splitlines()
+    else:
+        with open(source, "r", encoding="utf-8") as f:
+            lines = f.read().splitlines()
+
+    topics = []
+    seen = set()
+    for line in lines:
+        topic = line.strip()
+        if not topic or topic.startswith("#") or topic in seen:
+            continue
+        seen.add(topic)
+        topics.append(topic)
+    return topics
+
+
+def default_batch_id(topics: List[str]) -> str:
+    """Deterministic id so re-running the same topic list resumes the same batch."""
+    return hashlib.md5("\n".join(topics).encode("utf-8")).hexdigest()[:12]
+
+
+def run_topic(topic: str, batch_id: str, base_inputs: Optional[dict] = None, runner=None) -> dict:
+    """Run the full graph for one topic and record its outcome in the batch table."""
+    if runner is None:
+        from .agent import app
+        runner = app.invoke
+
+    inputs = {"topic": topic, "messages": [], "session_id": uuid.uuid4().hex}
+    inputs.update(base_inputs or {})
+
+    mark_batch_topic(batch_id, topic, "running")
+    start = time.time()
+    try:
+        runner(inputs, config={"recursion_limit": 100})
+        duration = time.time() - start
+        mark_batch_topic(batch_id, topic, "done", duration=duration)
+        logger.info(f"[batch {batch_id}] '{topic}' done in {duration:.1f}s")
+        return {"topic": topic, "status": "done", "duration": duration}
+    except Exception as e:
+        duration = time.time() - start
+        mark_batch_topic(batch_id, topic, "error", duration=duration, error=str(e))
+        logger.error(f"[batch {batch_id}] '{topic}' failed after {duration:.1f}s: {e}")
+        return {"topic": topic, "status": "error", "duration": duration, "error": str(e)}
+
+
+def run_batch(topics: List[str], workers: Optional[int] = None, batch_id: Optional[str] = None,
+              base_inputs: Optional[dict] = None, runner=None, use_caches: bool = True) -> Dict:
+    """Research many topics concurrently, skipping the ones a previous run already finished.
+
+    Source results and LLM responses go through shared caches so topics that
+    issue identical queries or prompts only pay for them once. The source cache
+    is switched on only for the duration of the batch.
+    """
+    workers = max(1, workers or settings.batch_workers)
+    batch_id = batch_id or default_batch_id(topics)
+
+    init_db()
+    source_cache_was_enabled = settings.source_cache_enabled
+    if use_caches:
+        settings.source_cache_enabled = True
+        from .llm import enable_llm_cache
+        enable_llm_cache()
+    try:
+        previous = get_batch_status(batch_id)
+        skipped = [t for t in topics if previous.get(t, {}).get("status") == "done"]
+        pending = [t for t in topics if t not in skipped]
+        if skipped:
+            logger.info(f"[batch {batch_id}] resuming: {len(skipped)} topic(s) already done, {len(pending)} pending")
+
+        results = []
+        start = time.time()
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(run_topic, topic, batch_id, base_inputs, runner) for topic in pending]
+            for future in as_completed(futures):
+                results.append(future.result())
+        wall_time = time.time() - start
+    finally:
+        settings.source_cache_enabled = source_cache_was_enabled
+
+    return build_batch_report(batch_id, results, skipped, wall_time, workers)
+
+
+def build_batch_report(batch_id: str, results: List[dict], skipped: List[str], wall_time: float, workers: int) -> Dict:
+    """Aggregate per-topic timings into a throughput report."""
+    done = [r for r in results if r["status"] == "done"]
+    durations = sorted(r["duration"] for r in done)
+    report = {
+        "batch_id": batch_id,
+        "workers": workers,
+        "completed": len(done),
+        "failed": len(results) - len(done),
+        "skipped": len(skipped),
+        "wall_time_s": round(wall_time, 2),
+        "throughput_per_hour": round(len(done) / wall_time * 3600, 2) if wall_time > 0 else 0.0,
+        "avg_topic_s": round(sum(durations) / len(durations), 2) if durations else 0.0,
+        "p95_topic_s": round(durations[min(len(durations) - 1, int(len(durations) * 0.95))], 2) if durations else 0.0,
+        "topics": sorted(results, key=lambda r: r["topic"]),
+    }
+    return report
+
+
+def write_batch_report(report: Dict, reports_dir: str = "reports") -> str:
+    os.makedirs(reports_dir, exist_ok=True)
+    path = os.path.join(reports_dir, f"batch_{report['batch_id']}.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    return path
+
+
+def format_batch_report(report: Dict) -> str:
+    """Human-readable summary printed at the end of a batch run."""
+    lines = [f"{'Topic':<60} {'Status':<8} {'Time (s)':>9}"]
+    for r in report["topics"]:
+        lines.append(f"{r['topic'][:60]:<60} {r['status']:<8} {r['duration']:>9.1f}")
+    lines.append("")
+    lines.append(
+        f"Batch {report['batch_id']}: {report['completed']} done, {report['failed']} failed, "
+        f"{report['skipped']} skipped (already done) with {report['workers']} worker(s)"
+    )
+    lines.append(
+        f"Wall time {report['wall_time_s']:.1f}s | avg {report['avg_topic_s']:.1f}s/topic | "
+        f"p95 {report['p95_topic_s']:.1f}s | throughput {report['throughput_per_hour']:.1f} topics/hour"
+    )
+    return "\n".join(lines)
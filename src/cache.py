@@ -4,7 +4,7 @@ import os
 import time
 from functools import wraps
 from typing import Any, Optional
-from config import settings
+from .config import settings
 
 CACHE_DIR = "cache"
 
@@ -58,6 +58,47 @@ def save_to_cache(cache_key: str, data: Any):
         pass  # Fail silently if cache write fails
 
 
+def get_source_cache_key(source: str, state: dict) -> str:
+    """Key a source call by the query it will actually issue, not by the topic wording.
+
+    Different topics that expand to the same search queries (e.g. the English and
+    Spanish phrasing of one subject) share a cache entry.
+    """
+    queries = state.get("queries") or {}
+    query_part = json.dumps(queries, sort_keys=True) if queries else state.get("topic", "")
+    content = "|".join([
+        source,
+        query_part,
+        state.get("research_depth", "standard"),
+        state.get("persona", "general"),
+        str(state.get("time_range")),
+    ])
+    return hashlib.md5(content.lower().encode()).hexdigest()
+
+
+def cached_source_call(source: str, func, state: dict) -> dict:
+    """Run a source node through the on-disk cache when SOURCE_CACHE_ENABLED is set."""
+    if not settings.source_cache_enabled:
+        return func(state)
+
+    cache_key = get_source_cache_key(source, state)
+    cached = get_from_cache(cache_key)
+    if cached:
+        return cached['data']
+
+    result = func(state)
+    # Only cache calls that produced something; empty lists usually mean a timeout or outage
+    if any(isinstance(v, list) and v for v in result.values()):
+        save_to_cache(cache_key, result)
+    return result
+
+
+def get_cached_source_result(source: str, state: dict) -> Optional[dict]:
+    """Last cached result for this source and query, if any (used while a source's circuit is open)."""
+    cached = get_from_cache(get_source_cache_key(source, state))
+    return cached['data'] if cached else None
+
+
 def cache_research(source: str = ""):
     """Decorator to cache research results."""
     def decorator(func):
@@ -0,0 +1,95 @@
+import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class ChatHistoryCompactor:
+    """Rolling summaries of long chat histories, refreshed off the request path.
+
+    A session's history is sent as ``(summary of messages[:upto], messages[upto:])``.
+    After each turn, once more than ``CHAT_COMPACT_BATCH`` messages older than
+    the last ``CHAT_HISTORY_TURNS`` turns are unsummarized, a background
+    worker folds them into the summary. The turn that triggered it never waits:
+    the next turn picks up whatever summary is finished by then and sends the
+    not-yet-folded messages verbatim.
+    """
+
+    def __init__(self, max_sessions: int = 256, workers: int = 1):
+        self.max_sessions = max_sessions
+        self.workers = workers
+        self._memories: "OrderedDict[str, Tuple[str, int]]" = OrderedDict()
+        self._pending: Dict[str, Future] = {}
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def latest(self, session_id: str, summary: str = "", upto: int = 0) -> Tuple[str, int]:
+        """The most advanced summary between the in-memory one and ``(summary, upto)`` from state."""
+        with self._lock:
+            memory = self._memories.get(session_id)
+        if memory and memory[1] > upto:
+            return memory
+        return summary or "", upto or 0
+
+    def compacted(self, session_id: str, messages: List, summary: str = "",
+                  upto: int = 0) -> Tuple[str, int, List]:
+        """``(summary, upto, recent messages)`` to send for this turn."""
+        summary, upto = self.latest(session_id, summary, upto)
+        if upto > len(messages):
+            # History was replaced (new conversation under the same session): start over
+            summary, upto = "", 0
+        return summary, upto, list(messages[upto:])
+
+    def schedule(self, session_id: str, messages: List, summarize: Callable[[str, List], str],
+                 summary: str = "", upto: int = 0) -> Optional[Future]:
+        """Fold old messages into the summary in the background, if enough have piled up.
+
+        ``(summary, upto)`` is the summary persisted in the session state, so a
+        session reloaded after a restart extends it instead of starting over.
+        """
+        keep = settings.chat_history_turns * 2
+        target = len(messages) - keep
+        summary, upto = self.latest(session_id, summary, upto)
+        if upto > len(messages):
+            summary, upto = "", 0
+        with self._lock:
+            pending = self._pending.get(session_id)
+            if target - upto < settings.chat_compact_batch or (pending and not pending.done()):
+                return None
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="chat-compact")
+            future = self._executor.submit(self._refresh, session_id, summary, list(messages[upto:target]),
+                                           target, summarize)
+            self._pending[session_id] = future
+            return future
+
+    def pending(self, session_id: str) -> Optional[Future]:
+        with self._lock:
+            return self._pending.get(session_id)
+
+    def _refresh(self, session_id: str, summary: str, messages: List, upto: int,
+                 summarize: Callable[[str, List], str]):
+        try:
+            new_summary = summarize(summary, messages)
+            with self._lock:
+                current = self._memories.get(session_id)
+                if not current or current[1] < upto:
+                    self._memories[session_id] = (new_summary, upto)
+                self._memories.move_to_end(session_id)
+                while len(self._memories) > self.max_sessions:
+                    self._memories.popitem(last=False)
+            logger.info(f"Chat history of {session_id}: {upto} messages folded into the summary")
+        except Exception as e:
+            logger.warning(f"Chat history compaction failed for {session_id}: {e}")
+        finally:
+            with self._lock:
+                self._pending.pop(session_id, None)
+
+
+# Global compactor shared by all chat sessions
+chat_compactor = ChatHistoryCompactor()
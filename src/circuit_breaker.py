@@ -0,0 +1,157 @@
+import logging
+import threading
+import time
+from collections import deque
+from typing import Deque, Dict, Iterable, List, Optional
+
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Failure-rate circuit breaker for one research source.
+
+    Tracks the outcome of the last ``BREAKER_WINDOW`` real calls. Once at least
+    ``BREAKER_MIN_CALLS`` are recorded and the failure rate (errors + timeouts)
+    reaches ``BREAKER_FAILURE_RATE`` the breaker opens and callers skip the
+    source. After ``BREAKER_COOLDOWN_S`` a single trial call is let through
+    (half-open): success closes the breaker, failure re-opens it.
+    """
+
+    def __init__(self, name: str, window: Optional[int] = None, min_calls: Optional[int] = None,
+                 failure_rate: Optional[float] = None, cooldown: Optional[float] = None):
+        self.name = name
+        self.min_calls = min_calls or settings.breaker_min_calls
+        self.failure_threshold = failure_rate or settings.breaker_failure_rate
+        self.cooldown = cooldown if cooldown is not None else settings.breaker_cooldown_s
+        self._outcomes: Deque[str] = deque(maxlen=window or settings.breaker_window)
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._trial_started: Optional[float] = None
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state
+
+    def failure_rate(self) -> float:
+        with self._lock:
+            return self._failure_rate()
+
+    def health_score(self) -> float:
+        """1.0 for a fully healthy source, 0.0 while it is short-circuited."""
+        with self._lock:
+            if self._state == OPEN:
+                return 0.0
+            return round(1.0 - self._failure_rate(), 2)
+
+    def is_available(self) -> bool:
+        """Whether a call would be let through right now (without claiming the trial slot)."""
+        with self._lock:
+            return self._can_pass(time.time())
+
+    def allow(self) -> bool:
+        """Ask to make a call; in half-open state only one trial is granted at a time."""
+        now = time.time()
+        with self._lock:
+            if not self._can_pass(now):
+                return False
+            if self._state == OPEN:
+                self._state = HALF_OPEN
+                logger.info(f"Circuit for '{self.name}' half-open: sending a trial request")
+            if self._state == HALF_OPEN:
+                self._trial_started = now
+            return True
+
+    def record_success(self):
+        with self._lock:
+            if self._state == HALF_OPEN:
+                logger.info(f"Circuit for '{self.name}' closed: trial request succeeded")
+                self._state = CLOSED
+                self._outcomes.clear()
+                self._trial_started = None
+            self._outcomes.append("ok")
+
+    def record_failure(self, kind: str = "error"):
+        """Record a failed call; ``kind`` is "error" or "timeout"."""
+        now = time.time()
+        with self._lock:
+            self._outcomes.append(kind)
+            if self._state == HALF_OPEN:
+                self._open(now, "trial request failed")
+            elif self._state == CLOSED and len(self._outcomes) >= self.min_calls \
+                    and self._failure_rate() >= self.failure_threshold:
+                self._open(now, f"failure rate {self._failure_rate():.0%} over last {len(self._outcomes)} calls")
+
+    def to_dict(self) -> dict:
+        with self._lock:
+            return {
+                "state": self._state,
+                "calls": len(self._outcomes),
+                "errors": sum(1 for o in self._outcomes if o == "error"),
+                "timeouts": sum(1 for o in self._outcomes if o == "timeout"),
+                "failure_rate": round(self._failure_rate(), 2),
+                "health_score": 0.0 if self._state == OPEN else round(1.0 - self._failure_rate(), 2),
+                "retry_in_s": max(0.0, round(self._opened_at + self.cooldown - time.time(), 1)) if self._state == OPEN else 0.0,
+            }
+
+    # Callers hold the lock for the helpers below
+
+    def _failure_rate(self) -> float:
+        if not self._outcomes:
+            return 0.0
+        return sum(1 for o in self._outcomes if o != "ok") / len(self._outcomes)
+
+    def _can_pass(self, now: float) -> bool:
+        if self._state == CLOSED:
+            return True
+        if self._state == OPEN:
+            return now - self._opened_at >= self.cooldown
+        # Half-open: one trial at a time, but don't wait forever on a trial that never reported
+        return self._trial_started is None or now - self._trial_started >= self.cooldown
+
+    def _open(self, now: float, reason: str):
+        self._state = OPEN
+        self._opened_at = now
+        self._trial_started = None
+        logger.warning(f"Circuit for '{self.name}' opened ({reason}); skipping it for {self.cooldown:.0f}s")
+
+
+class BreakerRegistry:
+    """Process-wide circuit breakers, one per source, shared by every session."""
+
+    def __init__(self):
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def get(self, source: str) -> CircuitBreaker:
+        with self._lock:
+            if source not in self._breakers:
+                self._breakers[source] = CircuitBreaker(source)
+            return self._breakers[source]
+
+    def unavailable(self, sources: Optional[Iterable[str]] = None) -> List[str]:
+        """Sources currently short-circuited (open and still cooling down)."""
+        with self._lock:
+            breakers = dict(self._breakers)
+        names = sources if sources is not None else breakers.keys()
+        return [s for s in names if s in breakers and not breakers[s].is_available()]
+
+    def snapshot(self) -> Dict[str, dict]:
+        with self._lock:
+            breakers = dict(self._breakers)
+        return {name: breaker.to_dict() for name, breaker in breakers.items()}
+
+    def reset(self):
+        with self._lock:
+            self._breakers.clear()
+
+
+# Global breaker registry
+source_breakers = BreakerRegistry()
@@ -0,0 +1,119 @@
+import logging
+import re
+from collections import Counter
+from typing import Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+_SENTENCE_END = re.compile(r"(?<=[.!?…])\s+|\n+")
+
+# Function words that carry no topical signal (Spanish + English; the UI and queries use both)
+STOPWORDS = frozenset("""
+a al algo como con de del el ella ellos en entre es esa ese eso esta este esto fue ha han hay la las le les lo los
+mas más me mi muy no nos o para pero por que qué se sea ser si sí sin sobre su sus también te tu un una uno unos y ya
+an and are as at be been but by can do does for from had has have he her his how i if in into is it its just me my
+not of on or our she so than that the their them then there these they this to was we were what when which who will
+with you your
+""".split())
+
+CHARS_PER_TOKEN = 4  # rough average for Spanish/English text with local tokenizers
+
+
+def estimate_tokens(text: str) -> int:
+    return len(text or "") // CHARS_PER_TOKEN
+
+
+def tokenize(text: str) -> List[str]:
+    return [w for w in _WORD_RE.findall((text or "").lower()) if len(w) > 1 and w not in STOPWORDS]
+
+
+def split_sentences(text: str, max_words: int = 40) -> List[str]:
+    """Split on sentence punctuation and newlines; unpunctuated runs (auto-generated
+    transcripts) are cut into windows of ``max_words`` words."""
+    sentences = []
+    for part in _SENTENCE_END.split(text or ""):
+        words = part.split()
+        for start in range(0, len(words), max_words):
+            sentences.append(" ".join(words[start:start + max_words]))
+    return [s for s in sentences if s]
+
+
+def query_terms(topic: str, queries: Optional[dict] = None) -> List[str]:
+    """Distinct scoring terms from the topic and its expanded per-language queries."""
+    texts = [topic or ""] + [q for q in (queries or {}).values() if isinstance(q, str)]
+    return list(dict.fromkeys(t for text in texts for t in tokenize(text)))
+
+
+def bm25_scores(terms: List[str], sentences: List[str], k1: float = 1.5, b: float = 0.75):
+    """BM25 relevance of each sentence (as a document) to ``terms``, as a numpy vector."""
+    import numpy as np
+
+    if not terms or not sentences:
+        return np.zeros(len(sentences))
+    index = {term: i for i, term in enumerate(terms)}
+    tf = np.zeros((len(sentences), len(terms)))
+    lengths = np.empty(len(sentences))
+    for row, sentence in enumerate(sentences):
+        tokens = tokenize(sentence)
+        lengths[row] = len(tokens)
+        for token, count in Counter(tokens).items():
+            col = index.get(token)
+            if col is not None:
+                tf[row, col] = count
+    df = (tf > 0).sum(axis=0)
+    idf = np.log(1 + (len(sentences) - df + 0.5) / (df + 0.5))
+    avg_len = max(lengths.mean(), 1.0)
+    norm = k1 * (1 - b + b * lengths / avg_len)
+    return ((tf * (k1 + 1)) / (tf + norm[:, None]) * idf).sum(axis=1)
+
+
+def select_sentences(sentences: List[str], scores, budget_tokens: int) -> List[str]:
+    """Highest-scoring sentences that fit in ``budget_tokens``, returned in document order.
+
+    Sentences that match no query term are never used as filler, and repeated
+    sentences (common in transcripts and scraped pages) are kept once.
+    """
+    chosen, used, seen = [], 0, set()
+    for i in sorted(range(len(sentences)), key=lambda i: -scores[i]):
+        if scores[i] <= 0:
+            break
+        cost = estimate_tokens(sentences[i]) + 1
+        key = sentences[i].lower()
+        if key in seen or used + cost > budget_tokens:
+            continue
+        seen.add(key)
+        chosen.append(i)
+        used += cost
+    return [sentences[i] for i in sorted(chosen)]
+
+
+def compress_text(text: str, terms: Iterable[str], budget_tokens: int, separator: str = " ") -> str:
+    """Query-focused extractive compression of ``text`` down to ``budget_tokens``.
+
+    Text already within budget is returned untouched. When no sentence
+    mentions any term, the opening of the text is kept (lead bias) rather
+    than an arbitrary selection.
+    """
+    if estimate_tokens(text) <= budget_tokens:
+        return text
+    sentences = split_sentences(text)
+    scores = bm25_scores(list(terms), sentences)
+    if not scores.any():
+        return text[:budget_tokens * CHARS_PER_TOKEN]
+    return separator.join(select_sentences(sentences, scores, budget_tokens))
+
+
+def chunk_text(text: str, chunk_tokens: int) -> List[str]:
+    """Split ``text`` on sentence boundaries into chunks of about ``chunk_tokens``."""
+    chunks, current, used = [], [], 0
+    for sentence in split_sentences(text):
+        cost = estimate_tokens(sentence) + 1
+        if current and used + cost > chunk_tokens:
+            chunks.append(" ".join(current))
+            current, used = [], 0
+        current.append(sentence)
+        used += cost
+    if current:
+        chunks.append(" ".join(current))
+    return chunks
@@ -1,5 +1,5 @@
 from pydantic_settings import BaseSettings, SettingsConfigDict
-from typing import Optional, List
+from typing import Optional, List, Dict
 
 class Settings(BaseSettings):
     # AI Configuration
@@ -9,7 +9,7 @@ class Settings(BaseSettings):
     # API Keys
     tavily_api_key: Optional[str] = None
     github_token: Optional[str] = None
-    youtube_api_key: Optional[str] = None
+    youtube_api_key: Optional[str] = None  # enables the YouTube Data API v3 search backend
     openai_api_key: Optional[str] = None
 
     # Email Configuration
@@ -25,16 +25,111 @@ class Settings(BaseSettings):
     max_content_length: int = 50000
     request_timeout: int = 30
     cache_expiry_hours: int = 24
+    source_cache_enabled: bool = False  # share source results across runs with identical queries
+    llm_cache_path: str = "cache/llm_cache.db"
+    batch_workers: int = 2
     
+    # Job Scheduling (dashboard / API runs)
+    max_concurrent_jobs: int = 3
+    max_queued_jobs: int = 20
+    llm_max_concurrency: int = 2  # parallel runs a local Ollama can serve
+    llm_cloud_max_concurrency: int = 8  # parallel runs for OpenAI-compatible APIs
+    job_default_duration_s: int = 180  # ETA seed until real run durations are observed
+    max_finished_jobs: int = 200  # finished jobs kept for result/artifact lookups
+
+    # HTTP API server
+    api_host: str = "0.0.0.0"
+    api_port: int = 8000
+    api_keepalive_interval: float = 15.0  # seconds between SSE keep-alive comments
+
     # Timeout Configuration
     web_search_timeout: int = 12
     llm_request_timeout: int = 60
     content_fetch_timeout: int = 3
     thread_execution_timeout: int = 12
+
+    # Source deadlines (parallel search)
+    source_timeouts: Dict[str, float] = {
+        "wiki": 10, "arxiv": 12, "scholar": 25, "github": 20, "hn": 10,
+        "so": 15, "reddit": 15, "youtube": 60, "local_rag": 60,
+    }  # hard cap per source (web uses web_search_timeout)
+    search_time_budget: float = 60.0  # whole fan-out; slower sources are dropped and partial results returned
+    latency_window: int = 50  # recent calls per source used for adaptive deadlines
+    latency_min_samples: int = 5  # observations before a source's deadline adapts
+    latency_deadline_factor: float = 1.5  # deadline = p95 latency * factor (capped by source_timeouts)
+    latency_min_deadline: float = 2.0
+
+    # Per-source circuit breakers
+    breaker_window: int = 10  # recent calls considered
+    breaker_min_calls: int = 3  # calls needed before the breaker may open
+    breaker_failure_rate: float = 0.5  # errors + timeouts ratio that opens it
+    breaker_cooldown_s: float = 120.0  # time open before a half-open trial request
+
+    # External API rate limits (shared by all sessions; corrected by the servers' rate-limit headers)
+    api_rate_limits: Dict[str, float] = {
+        "github_search": 0.5, "github_core": 1.0, "github_graphql": 1.0, "scholar": 1.0, "stackexchange": 5.0,
+    }  # requests per second
+    api_rate_burst: int = 3
+    api_rate_wait_timeout: float = 15.0  # max wait for a request slot before giving up on the source
+    api_rate_backoff_s: float = 60.0  # pause after a 403/429 that doesn't say how long to wait
     
+    # Health checks
+    health_check_timeout: float = 3.0  # per check; all checks run concurrently
+    health_cache_ttl: float = 30.0  # seconds a check round is reused
+    health_probe_interval: float = 60.0  # background readiness refresh period
+
+    # Dashboard event loop
+    ui_refresh_interval: float = 0.5  # seconds; progress is repainted at most this often
+    ui_event_timeout: float = 5.0  # seconds to block waiting for agent events
+
+    # Progressive synthesis: summarize each source while slower ones are still searching
+    progressive_synthesis: bool = False
+    partial_summary_workers: int = 1  # concurrent map-summaries (keep low for local Ollama)
+    partial_summary_timeout: int = 90
+
+    # YouTube
+    youtube_require_captions: bool = False  # Data API backend: skip videos without uploaded captions (auto-generated ones don't count)
+    transcript_token_budget: int = 1500  # transcript tokens kept per video by extractive pre-compression
+    transcript_chunk_tokens: int = 800  # map-step chunk size
+    video_map_workers: int = 2  # concurrent map calls per video (keep low for local Ollama)
+
     # Content Limits
     max_synthesis_context_chars: int = 25000
     max_content_preview_chars: int = 5000
+    synthesis_item_token_budget: int = 250  # per-item text kept for synthesis by query-focused compression (0 = verbatim)
+
+    # Evidence refinement (between parallel_search and synthesis)
+    evidence_dedup: bool = True  # merge the same document found by several sources (URL, DOI/arXiv id, SimHash)
+    dedup_simhash_distance: int = 3  # max differing bits (of 64) for near-duplicate text
+    quality_filter_sources: List[str] = ["web", "reddit"]  # sources whose low-quality items are dropped
+    quality_min_score: float = 0.1  # src/quality.py score (0-1); 0.1 drops near-empty hits (<100 chars, no keywords or links)
+    rerank_backend: str = "embedding"  # "embedding" (local MiniLM ONNX bi-encoder), "bm25" (lexical) or "off"
+    rerank_batch_size: int = 32
+    rerank_cache_size: int = 5000  # embeddings kept in memory, keyed by content hash
+    evidence_passage_tokens: int = 120  # passage size of the per-session BM25 evidence index
+    evidence_index_sessions: int = 64  # sessions whose evidence index is kept in memory
+    synthesis_evidence_passages: int = 80  # passages considered when the full synthesis context doesn't fit
+    eval_max_claims: int = 5  # "Verificación de Datos" claims checked against the evidence index
+    eval_evidence_per_claim: int = 2
+
+    # Chat
+    chat_context_tokens: int = 1500  # retrieved summary + source passages per chat turn
+    chat_summary_passages: int = 4
+    chat_source_passages: int = 6
+    chat_history_turns: int = 4  # most recent user/assistant turns sent verbatim
+    chat_compact_batch: int = 4  # older messages that must pile up before the summary is refreshed
+    chat_summary_words: int = 250
+    chat_summary_timeout: int = 60
+
+    # Web page content (web search result enhancement)
+    page_extractor: str = "jina"  # "jina" (r.jina.ai reader proxy) or "local" (direct fetch + in-process extraction)
+    page_cache_dir: str = "cache/pages"
+    page_cache_ttl_hours: float = 24.0  # after this, entries are revalidated with ETag / Last-Modified
+    page_cache_max_chars: int = 50000  # cleaned text stored per page; previews are sliced from it
+    page_cache_max_mb: float = 200.0  # oldest entries are deleted beyond this
+    page_prefetch: bool = True  # keep downloading pages in the background past content_fetch_timeout
+    page_prefetch_timeout: float = 15.0  # per-page limit for background fetches
+    page_prefetch_workers: int = 8
     
     # File Upload Limits
     max_file_size_mb: int = 10
@@ -42,6 +137,8 @@ class Settings(BaseSettings):
     
     # Database Configuration
     db_path: str = "research_sessions.db"
+    reports_dir: str = "reports"  # scheduled runs write to <reports_dir>/<session_id>/
+    reports_retention_days: int = 30  # per-session report folders older than this are removed at app startup
     
     # Research Keywords
     research_trigger_keywords: List[str] = [
@@ -1,6 +1,10 @@
 import sqlite3
 import json
 import logging
+import os
+import re
+import shutil
+import time
 from datetime import datetime
 from typing import Optional, List, Tuple, Dict, Any
 
@@ -9,6 +13,8 @@ logger = logging.getLogger(__name__)
 from .config import settings
 
 DB_PATH = settings.db_path
+# Report folders are named after the session (a uuid4 hex); nothing else under reports/ is ours to delete
+SESSION_DIR_RE = re.compile(r"^[0-9a-f]{32}$")
 
 def init_db(db_path: str = DB_PATH) -> None:
     """Initialize the SQLite database and create necessary tables."""
@@ -26,6 +32,19 @@ def init_db(db_path: str = DB_PATH) -> None:
     )
     ''')
 
+    # Table for headless batch runs (one row per topic, enables resume after a crash)
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS batch_topics (
+        batch_id TEXT NOT NULL,
+        topic TEXT NOT NULL,
+        status TEXT NOT NULL,
+        duration REAL,
+        error TEXT,
+        updated_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+        PRIMARY KEY (batch_id, topic)
+    )
+    ''')
+
     conn.commit()
     conn.close()
     logger.info(f"Database initialized at {db_path}")
@@ -127,3 +146,54 @@ def cleanup_old_sessions(days: int = 30, db_path: str = DB_PATH) -> int:
     except Exception as e:
         logger.error(f"Failed to cleanup old sessions: {e}")
         return 0
+
+def cleanup_old_reports(days: Optional[int] = None, reports_dir: Optional[str] = None) -> int:
+    """Delete per-session report folders (<reports_dir>/<session_id>/) untouched for a certain number of days."""
+    days = days if days is not None else settings.reports_retention_days
+    reports_dir = reports_dir or settings.reports_dir
+    cutoff = time.time() - days * 86400
+    deleted_count = 0
+    try:
+        folders = [entry for entry in os.scandir(reports_dir)
+                   if entry.is_dir() and SESSION_DIR_RE.match(entry.name)]
+    except OSError:
+        return 0
+    for folder in folders:
+        try:
+            newest = max([folder.stat().st_mtime] + [f.stat().st_mtime for f in os.scandir(folder.path)])
+            if newest < cutoff:
+                shutil.rmtree(folder.path)
+                deleted_count += 1
+        except OSError as e:
+            logger.error(f"Failed to remove report folder {folder.path}: {e}")
+    if deleted_count > 0:
+        logger.info(f"Cleaned up {deleted_count} old report folders (older than {days} days).")
+    return deleted_count
+
+def mark_batch_topic(batch_id: str, topic: str, status: str, duration: Optional[float] = None,
+                     error: Optional[str] = None, db_path: str = DB_PATH) -> None:
+    """Record the status of one topic of a batch run ('running', 'done' or 'error')."""
+    try:
+        conn = sqlite3.connect(db_path)
+        cursor = conn.cursor()
+        cursor.execute('''
+        INSERT OR REPLACE INTO batch_topics (batch_id, topic, status, duration, error, updated_at)
+        VALUES (?, ?, ?, ?, ?, ?)
+        ''', (batch_id, topic, status, duration, error, datetime.now().isoformat()))
+        conn.commit()
+        conn.close()
+    except Exception as e:
+        logger.error(f"Failed to record batch topic {topic}: {e}")
+
+def get_batch_status(batch_id: str, db_path: str = DB_PATH) -> Dict[str, Dict[str, Any]]:
+    """Return {topic: {"status", "duration", "error"}} for every recorded topic of a batch."""
+    try:
+        conn = sqlite3.connect(db_path)
+        cursor = conn.cursor()
+        cursor.execute('SELECT topic, status, duration, error FROM batch_topics WHERE batch_id = ?', (batch_id,))
+        rows = cursor.fetchall()
+        conn.close()
+        return {row[0]: {"status": row[1], "duration": row[2], "error": row[3]} for row in rows}
+    except Exception as e:
+        logger.error(f"Failed to read batch {batch_id}: {e}")
+        return {}
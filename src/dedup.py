@@ -0,0 +1,127 @@
+import hashlib
+import logging
+import re
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+from .compression import tokenize
+
+logger = logging.getLogger(__name__)
+
+# Query parameters that identify a campaign or session, never the page
+TRACKING_PARAMS = re.compile(r"^(utm_\w+|fbclid|gclid|mc_cid|mc_eid|ref|ref_src|source|share|igshid|si)$", re.I)
+DOI_RE = re.compile(r"\b(10\.\d{4,9}/[^\s\"'<>?#]+)", re.I)
+ARXIV_RE = re.compile(r"arxiv\.org/(?:abs|pdf)/([a-z\-]+/\d{7}|\d{4}\.\d{4,5})(?:v\d+)?", re.I)
+
+SIMHASH_BITS = 64
+SIMHASH_BANDS = 4  # 4 x 16-bit bands: any pair within 3 differing bits shares a band
+MIN_SIMHASH_TOKENS = 25  # shorter texts (titles, snippets) don't fingerprint reliably
+
+
+def canonical_url(url: Optional[str]) -> Optional[str]:
+    """Scheme-, ``www.``-, fragment- and tracking-parameter-insensitive form of ``url``."""
+    if not url or not isinstance(url, str) or "://" not in url:
+        return None
+    parts = urlsplit(url.strip())
+    host = parts.netloc.lower()
+    if host.startswith("www."):
+        host = host[4:]
+    host = host.replace("old.reddit.com", "reddit.com").replace("m.wikipedia.org", "wikipedia.org")
+    path = parts.path.rstrip("/") or "/"
+    query = urlencode(sorted((k, v) for k, v in parse_qsl(parts.query) if not TRACKING_PARAMS.match(k)))
+    return f"{host}{path}" + (f"?{query}" if query else "")
+
+
+def paper_ids(item: dict) -> List[str]:
+    """Every DOI and arXiv identifier of a paper, from explicit fields and its URL.
+
+    A Semantic Scholar item often carries both; returning all of them lets it
+    match the arXiv node's copy as well as another source's DOI-only copy.
+    """
+    ids = []
+    if item.get("doi"):
+        ids.append(f"doi:{str(item['doi']).lower()}")
+    if item.get("arxiv_id"):
+        ids.append(f"arxiv:{re.sub(r'v[0-9]+$', '', str(item['arxiv_id']).lower())}")
+    url = item.get("url") or ""
+    if isinstance(url, str):
+        match = ARXIV_RE.search(url)
+        if match:
+            ids.append(f"arxiv:{match.group(1).lower()}")
+        match = DOI_RE.search(url)
+        if match:
+            ids.append(f"doi:{match.group(1).lower().rstrip('.')}")
+    return list(dict.fromkeys(ids))
+
+
+def simhash(text: str) -> Optional[int]:
+    """64-bit SimHash of ``text``'s token bag, or None when the text is too short."""
+    import numpy as np
+
+    tokens = tokenize(text)
+    if len(tokens) < MIN_SIMHASH_TOKENS:
+        return None
+    counts: Dict[str, int] = defaultdict(int)
+    for token in tokens:
+        counts[token] += 1
+    hashes = np.array([int.from_bytes(hashlib.blake2b(t.encode(), digest_size=8).digest(), "big")
+                       for t in counts], dtype=np.uint64)
+    weights = np.array(list(counts.values()), dtype=np.int64)
+    bits = (hashes[:, None] >> np.arange(SIMHASH_BITS, dtype=np.uint64)) & np.uint64(1)
+    votes = (np.where(bits == 1, 1, -1) * weights[:, None]).sum(axis=0)
+    return int(sum(1 << i for i in np.flatnonzero(votes > 0)))
+
+
+class _UnionFind:
+    def __init__(self, n: int):
+        self.parent = list(range(n))
+
+    def find(self, i: int) -> int:
+        while self.parent[i] != i:
+            self.parent[i] = self.parent[self.parent[i]]
+            i = self.parent[i]
+        return i
+
+    def union(self, a: int, b: int):
+        a, b = self.find(a), self.find(b)
+        if a != b:
+            self.parent[max(a, b)] = min(a, b)
+
+
+def duplicate_groups(keys: List[Iterable[str]], fingerprints: List[Optional[int]],
+                     max_distance: int = 3) -> List[List[int]]:
+    """Group item indices that share any exact key or have near-identical fingerprints.
+
+    Exact keys (canonical URL, DOI, arXiv id...) are joined through a hash map.
+    Fingerprints are bucketed per 16-bit band, so only items that agree on a
+    whole band are compared; with ``max_distance`` below the band count every
+    near-duplicate pair lands in a shared bucket. Both passes are linear in the
+    number of items for realistic (non-degenerate) inputs.
+    """
+    uf = _UnionFind(len(keys))
+    owners: Dict[str, int] = {}
+    for i, item_keys in enumerate(keys):
+        for key in item_keys:
+            if key in owners:
+                uf.union(owners[key], i)
+            else:
+                owners[key] = i
+
+    band_bits = SIMHASH_BITS // SIMHASH_BANDS
+    mask = (1 << band_bits) - 1
+    buckets: Dict[Tuple[int, int], List[int]] = defaultdict(list)
+    for i, fp in enumerate(fingerprints):
+        if fp is None:
+            continue
+        for band in range(SIMHASH_BANDS):
+            bucket = buckets[(band, (fp >> (band * band_bits)) & mask)]
+            for j in bucket:
+                if uf.find(i) != uf.find(j) and bin(fp ^ fingerprints[j]).count("1") <= max_distance:
+                    uf.union(i, j)
+            bucket.append(i)
+
+    groups: Dict[int, List[int]] = defaultdict(list)
+    for i in range(len(keys)):
+        groups[uf.find(i)].append(i)
+    return list(groups.values())
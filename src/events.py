@@ -0,0 +1,130 @@
+import logging
+import queue
+import threading
+import time
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class ProgressChannel:
+    """Fan-out channel carrying the progress events of a single research session."""
+
+    def __init__(self, session_id: str):
+        self.session_id = session_id
+        self._subscribers: List = []
+        self._lock = threading.Lock()
+
+    def publish(self, event_type: str, **payload) -> dict:
+        """Deliver an event to every current subscriber (never blocks)."""
+        event = {"type": event_type, "session_id": self.session_id, "ts": time.time()}
+        event.update(payload)
+
+        with self._lock:
+            subscribers = list(self._subscribers)
+
+        for q in subscribers:
+            q.put_nowait(event)
+        return event
+
+    def subscribe(self, sink=None):
+        """Register a consumer and return the sink it should read from.
+
+        ``sink`` is anything with a non-blocking ``put_nowait`` (e.g. a bridge
+        into an asyncio queue); by default a fresh ``queue.Queue`` is created.
+        """
+        q = sink if sink is not None else queue.Queue()
+        with self._lock:
+            self._subscribers.append(q)
+        return q
+
+    def unsubscribe(self, q):
+        """Stop delivering events to a consumer queue."""
+        with self._lock:
+            if q in self._subscribers:
+                self._subscribers.remove(q)
+
+    @property
+    def subscriber_count(self) -> int:
+        with self._lock:
+            return len(self._subscribers)
+
+
+class ProgressBus:
+    """Process-wide registry of per-session progress channels."""
+
+    def __init__(self):
+        self._channels: Dict[str, ProgressChannel] = {}
+        self._lock = threading.Lock()
+
+    def channel(self, session_id: str) -> ProgressChannel:
+        """Get (or lazily create) the channel for a session."""
+        with self._lock:
+            channel = self._channels.get(session_id)
+            if channel is None:
+                channel = ProgressChannel(session_id)
+                self._channels[session_id] = channel
+            return channel
+
+    def publish(self, session_id: Optional[str], event_type: str, **payload) -> Optional[dict]:
+        """Publish an event for a session.
+
+        Only subscribing opens a channel: with nobody listening (no session,
+        a batch or CLI run, or a channel already closed) this is a no-op, so a
+        late event can't bring back a closed channel.
+        """
+        if not session_id:
+            return None
+        with self._lock:
+            channel = self._channels.get(session_id)
+        if channel is None:
+            return None
+        return channel.publish(event_type, **payload)
+
+    def subscribe(self, session_id: str, sink=None):
+        return self.channel(session_id).subscribe(sink)
+
+    def unsubscribe(self, session_id: str, sink):
+        with self._lock:
+            channel = self._channels.get(session_id)
+        if channel:
+            channel.unsubscribe(sink)
+
+    def close(self, session_id: str):
+        """Drop a session channel once nobody needs its events anymore."""
+        with self._lock:
+            self._channels.pop(session_id, None)
+        logger.debug(f"Progress channel closed for session {session_id}")
+
+
+# Global progress bus instance
+progress_bus = ProgressBus()
+
+
+def collect_events(q: queue.Queue, timeout: float, window: float) -> List[dict]:
+    """Block for the next event, then gather everything else that arrives within ``window``.
+
+    Returns an empty list if nothing arrived before ``timeout``. Consumers
+    render once per batch, which bounds their refresh rate to ``1 / window``
+    while costing no CPU when the run is idle.
+    """
+    try:
+        events = [q.get(timeout=timeout)]
+    except queue.Empty:
+        return []
+
+    deadline = time.monotonic() + window
+    while True:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        try:
+            events.append(q.get(timeout=remaining))
+        except queue.Empty:
+            break
+    return events
+
+
+def publish_progress(state: dict, event_type: str, **payload) -> Optional[dict]:
+    """Publish a progress event on the channel of the session that owns ``state``."""
+    return progress_bus.publish(state.get("session_id"), event_type, **payload)
@@ -0,0 +1,165 @@
+import hashlib
+import logging
+import threading
+import time
+from collections import Counter, OrderedDict
+from typing import Dict, List, Optional
+
+from .compression import chunk_text, query_terms, tokenize
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class EvidenceIndex:
+    """In-memory BM25 index over a run's evidence passages.
+
+    Postings are stored term-major in flat arrays (CSR layout): the postings
+    of term ``t`` are ``doc_ids[indptr[t]:indptr[t + 1]]`` with their term
+    frequencies in ``tfs``. A query touches only the postings of its own
+    terms and scores every passage with one vectorized pass per term.
+    """
+
+    def __init__(self, passages: List[dict], k1: float = 1.5, b: float = 0.75):
+        import numpy as np
+
+        self.passages = passages
+        self.k1 = k1
+        self.b = b
+        self.vocab: Dict[str, int] = {}
+        term_ids, doc_ids, tfs = [], [], []
+        lengths = np.zeros(len(passages), dtype=np.float32)
+        for doc, passage in enumerate(passages):
+            tokens = tokenize(f"{passage.get('title') or ''} {passage['text']}")
+            lengths[doc] = len(tokens)
+            for token, count in Counter(tokens).items():
+                term_ids.append(self.vocab.setdefault(token, len(self.vocab)))
+                doc_ids.append(doc)
+                tfs.append(count)
+
+        term_ids = np.asarray(term_ids, dtype=np.int32)
+        order = np.argsort(term_ids, kind="stable")
+        self.doc_ids = np.asarray(doc_ids, dtype=np.int32)[order]
+        self.tfs = np.asarray(tfs, dtype=np.float32)[order]
+        df = np.bincount(term_ids, minlength=len(self.vocab))
+        self.indptr = np.concatenate(([0], np.cumsum(df))).astype(np.int64)
+        self.idf = np.log(1 + (len(passages) - df + 0.5) / (df + 0.5)).astype(np.float32)
+        avg_len = max(float(lengths.mean()) if len(passages) else 0.0, 1.0)
+        self.norm = (k1 * (1 - b + b * lengths / avg_len)).astype(np.float32)
+
+    def __len__(self) -> int:
+        return len(self.passages)
+
+    def scores(self, terms: List[str]):
+        import numpy as np
+
+        scores = np.zeros(len(self.passages), dtype=np.float32)
+        for term in set(terms):
+            t = self.vocab.get(term)
+            if t is None:
+                continue
+            start, end = self.indptr[t], self.indptr[t + 1]
+            docs, tf = self.doc_ids[start:end], self.tfs[start:end]
+            scores[docs] += self.idf[t] * tf * (self.k1 + 1) / (tf + self.norm[docs])
+        return scores
+
+    def search(self, query: str, k: int = 5, queries: Optional[dict] = None) -> List[dict]:
+        """Top ``k`` passages for ``query`` (plus expanded ``queries``), best first, with ``score``."""
+        import numpy as np
+
+        if not self.passages:
+            return []
+        scores = self.scores(query_terms(query, queries))
+        k = min(k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return [{**self.passages[i], "score": float(scores[i])} for i in top if scores[i] > 0]
+
+
+def evidence_passages(state: dict, passage_tokens: Optional[int] = None) -> List[dict]:
+    """Every research item and video summary in ``state`` cut into passages.
+
+    Each passage keeps its source, title and URL, so whatever is retrieved
+    can still be cited.
+    """
+    from .tools.evidence_tools import collect_evidence, item_text
+
+    passage_tokens = passage_tokens or settings.evidence_passage_tokens
+    passages = []
+
+    def add(source, title, url, text):
+        for chunk in chunk_text(text, passage_tokens) or [""]:
+            if chunk or title:
+                passages.append({"source": source, "title": title, "url": url, "text": chunk})
+
+    for source, item in collect_evidence(state):
+        add(source, item.get("title") or item.get("name"), item.get("url"), item_text(source, item))
+    video_meta = state.get("video_metadata") or []
+    for i, summary in enumerate(state.get("summaries") or []):
+        meta = video_meta[i] if i < len(video_meta) else {}
+        add("youtube", meta.get("title"), meta.get("url"), summary if isinstance(summary, str) else "")
+    return passages
+
+
+def summary_passages(summary: str, passage_tokens: Optional[int] = None) -> List[dict]:
+    """The consolidated summary cut into passages (no URL: it cites its sources inline)."""
+    chunks = chunk_text(summary or "", passage_tokens or settings.evidence_passage_tokens)
+    return [{"source": "summary", "title": "Síntesis", "url": None, "text": chunk} for chunk in chunks]
+
+
+class EvidenceIndexRegistry:
+    """One ``EvidenceIndex`` per research session, most recently used kept.
+
+    refine_evidence builds the session's index once its evidence is final;
+    synthesis, evaluation and chat look it up by ``session_id``. Sessions
+    without an index (no id, evicted, or reloaded from the database) get one
+    built from their state on first use. Chat also keeps an index of the
+    session's consolidated summary, rebuilt only when the summary changes.
+    """
+
+    def __init__(self, max_sessions: Optional[int] = None):
+        self.max_sessions = max_sessions or settings.evidence_index_sessions
+        self._indexes: "OrderedDict[str, EvidenceIndex]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def build(self, state: dict) -> EvidenceIndex:
+        started = time.perf_counter()
+        index = EvidenceIndex(evidence_passages(state))
+        logger.info(f"Evidence index: {len(index)} passages, {len(index.vocab)} terms "
+                    f"in {(time.perf_counter() - started) * 1000:.0f} ms")
+        if state.get("session_id"):
+            self._put(state["session_id"], index)
+        return index
+
+    def _put(self, key: str, index: EvidenceIndex):
+        with self._lock:
+            self._indexes[key] = index
+            self._indexes.move_to_end(key)
+            while len(self._indexes) > self.max_sessions:
+                self._indexes.popitem(last=False)
+
+    def get(self, session_id: Optional[str]) -> Optional[EvidenceIndex]:
+        if not session_id:
+            return None
+        with self._lock:
+            index = self._indexes.get(session_id)
+            if index is not None:
+                self._indexes.move_to_end(session_id)
+            return index
+
+    def for_state(self, state: dict) -> EvidenceIndex:
+        index = self.get(state.get("session_id"))
+        return index if index is not None else self.build(state)
+
+    def for_summary(self, state: dict) -> EvidenceIndex:
+        summary = state.get("consolidated_summary") or ""
+        key = f"{state.get('session_id') or ''}#summary:{hashlib.md5(summary.encode()).hexdigest()}"
+        index = self.get(key)
+        if index is None:
+            index = EvidenceIndex(summary_passages(summary))
+            self._put(key, index)
+        return index
+
+
+# Global registry shared by the graph nodes of all sessions
+evidence_indexes = EvidenceIndexRegistry()
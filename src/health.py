@@ -1,32 +1,91 @@
 import requests
 import shutil
 import logging
-from typing import Dict, Tuple
-from config import settings
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, Optional, Tuple
+from .config import settings
 
 logger = logging.getLogger(__name__)
 
+# Lightweight endpoint per research source; any HTTP answer below 500 means reachable
+SOURCE_ENDPOINTS = {
+    "wiki": "https://en.wikipedia.org/w/api.php?action=query&meta=siteinfo&format=json",
+    "arxiv": "https://export.arxiv.org/api/query?search_query=all:test&max_results=0",
+    "scholar": "https://api.semanticscholar.org/graph/v1/paper/search?query=test&limit=1",
+    "github": "https://api.github.com/rate_limit",
+    "hn": "https://hn.algolia.com/api/v1/search?query=test&hitsPerPage=1",
+    "so": "https://api.stackexchange.com/2.3/info?site=stackoverflow",
+    "youtube": "https://www.youtube.com/robots.txt",
+}
+
+# A run cannot succeed without these; anything else only degrades results
+CRITICAL_CHECKS = ("ollama", "llm_model", "disk_space")
+
 
 def check_ollama_connection() -> bool:
-    """Check if Ollama service is available."""
+    """Check if the LLM endpoint (Ollama or OpenAI-compatible) is available."""
     try:
-        from utils import bypass_proxy_for_ollama
+        from .utils import bypass_proxy_for_ollama
         bypass_proxy_for_ollama()
-        response = requests.get(f"{settings.ollama_base_url}/api/tags", timeout=5)
+        base_url, api_key = _llm_endpoint()
+        if api_key:
+            response = requests.get(f"{base_url}/models", headers=_auth(api_key), timeout=settings.health_check_timeout)
+            if response.status_code in (401, 403):
+                logger.warning(f"LLM endpoint rejected the API key (HTTP {response.status_code})")
+                return False
+            # 404: the server doesn't list models (see check_llm_model), but it answered
+            return 200 <= response.status_code < 300 or response.status_code == 404
+        response = requests.get(f"{base_url}/api/tags", timeout=settings.health_check_timeout)
         return response.status_code == 200
     except Exception:
         return False
 
 
+def check_llm_model() -> bool:
+    """Check that the configured model is actually served by the LLM endpoint."""
+    model = os.environ.get("OLLAMA_MODEL") or settings.ollama_model
+    base_url, api_key = _llm_endpoint()
+    try:
+        if api_key:
+            response = requests.get(f"{base_url}/models", headers=_auth(api_key), timeout=settings.health_check_timeout)
+            if response.status_code == 404:
+                # Some OpenAI-compatible servers don't list models; reachable is the best we can tell
+                return True
+            ids = {m.get("id", "") for m in response.json().get("data", [])}
+            return model in ids or any(i.endswith(f"/{model}") for i in ids)
+
+        response = requests.get(f"{base_url}/api/tags", timeout=settings.health_check_timeout)
+        names = {m.get("name", "") for m in response.json().get("models", [])}
+        return model in names or f"{model}:latest" in names
+    except Exception:
+        return False
+
+
 def check_internet_connection() -> bool:
     """Check internet connectivity."""
     try:
-        response = requests.get("https://httpbin.org/status/200", timeout=5)
+        response = requests.get("https://httpbin.org/status/200", timeout=settings.health_check_timeout)
         return response.status_code == 200
     except Exception:
         return False
 
 
+def check_source_endpoint(source: str) -> bool:
+    """Check that a research source's API answers at all."""
+    url = _source_url(source)
+    if not url:
+        return True
+    try:
+        response = requests.get(url, timeout=settings.health_check_timeout, stream=True)
+        response.close()
+        return response.status_code < 500
+    except Exception:
+        return False
+
+
 def check_disk_space(min_gb: float = 1.0) -> bool:
     """Check available disk space."""
     try:
@@ -37,13 +96,71 @@ def check_disk_space(min_gb: float = 1.0) -> bool:
         return False
 
 
-def check_dependencies() -> Tuple[bool, Dict[str, bool]]:
-    """Verify all required services are available."""
-    checks = {
-        'ollama': check_ollama_connection(),
-        'internet': check_internet_connection(),
-        'disk_space': check_disk_space()
+def _llm_endpoint() -> Tuple[str, Optional[str]]:
+    from .llm import _is_cloud_endpoint
+
+    base_url = (os.environ.get("OLLAMA_BASE_URL") or settings.ollama_base_url).rstrip("/")
+    api_key = os.environ.get("OPENAI_API_KEY") or settings.openai_api_key
+    if api_key or _is_cloud_endpoint(base_url):
+        if base_url == "http://localhost:11434":
+            base_url = "https://api.openai.com/v1"
+        return base_url, api_key or "ollama"
+    return base_url, None
+
+
+def _auth(api_key: str) -> dict:
+    return {"Authorization": f"Bearer {api_key}"}
+
+
+def _source_url(source: str) -> Optional[str]:
+    if source in ("web", "reddit"):
+        # Both go through Tavily when a key is configured, DuckDuckGo otherwise
+        tavily_key = settings.tavily_api_key or os.getenv("TAVILY_API_KEY")
+        return "https://api.tavily.com" if tavily_key else "https://duckduckgo.com"
+    return SOURCE_ENDPOINTS.get(source)
+
+
+_cache: Dict[tuple, Tuple[float, Dict[str, bool]]] = {}
+_cache_lock = threading.Lock()
+
+
+def run_checks(sources: Optional[Iterable[str]] = None, use_cache: bool = True) -> Dict[str, bool]:
+    """Run every check concurrently; results are reused for ``settings.health_cache_ttl`` seconds."""
+    sources = tuple(sorted(sources)) if sources is not None else tuple(sorted({*SOURCE_ENDPOINTS, "web", "reddit"}))
+    now = time.time()
+    if use_cache:
+        with _cache_lock:
+            cached = _cache.get(sources)
+            if cached and now - cached[0] < settings.health_cache_ttl:
+                return dict(cached[1])
+
+    probes = {
+        "ollama": check_ollama_connection,
+        "llm_model": check_llm_model,
+        "internet": check_internet_connection,
+        "disk_space": check_disk_space,
     }
+    for source in sources:
+        probes[f"source:{source}"] = lambda s=source: check_source_endpoint(s)
+
+    # Every check has its own request timeout, so the whole round takes about one timeout
+    with ThreadPoolExecutor(max_workers=len(probes), thread_name_prefix="health") as executor:
+        futures = {name: executor.submit(fn) for name, fn in probes.items()}
+        checks = {}
+        for name, future in futures.items():
+            try:
+                checks[name] = bool(future.result())
+            except Exception:
+                checks[name] = False
+
+    with _cache_lock:
+        _cache[sources] = (time.time(), checks)
+    return dict(checks)
+
+
+def check_dependencies(sources: Optional[Iterable[str]] = None, use_cache: bool = True) -> Tuple[bool, Dict[str, bool]]:
+    """Verify all required services are available."""
+    checks = run_checks(sources, use_cache=use_cache)
 
     all_healthy = all(checks.values())
 
@@ -54,3 +171,69 @@ def check_dependencies() -> Tuple[bool, Dict[str, bool]]:
             logger.warning(f"❌ {service} - FAILED")
 
     return all_healthy, checks
+
+
+class ReadinessProbe:
+    """Re-runs the health checks in the background so callers only read a snapshot."""
+
+    def __init__(self, interval: Optional[float] = None, checker=None):
+        self.interval = interval or settings.health_probe_interval
+        self._checker = checker or (lambda: run_checks(use_cache=False))
+        self._snapshot = {"ready": None, "degraded": [], "checks": {}, "checked_at": None}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> "ReadinessProbe":
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._loop, name="readiness-probe", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    def refresh(self) -> dict:
+        """Run one round of checks now and publish the result."""
+        try:
+            checks = self._checker()
+        except Exception as e:
+            logger.error(f"Readiness check failed: {e}")
+            checks = {}
+        snapshot = {
+            "ready": bool(checks) and all(checks.get(name, False) for name in CRITICAL_CHECKS),
+            "degraded": sorted(name for name, ok in checks.items() if not ok and name not in CRITICAL_CHECKS),
+            "checks": checks,
+            "checked_at": time.time(),
+        }
+        with self._lock:
+            self._snapshot = snapshot
+        return dict(snapshot)
+
+    def snapshot(self) -> dict:
+        """Latest result; ``ready`` is None until the first round completes."""
+        with self._lock:
+            return dict(self._snapshot)
+
+    @property
+    def ready(self) -> Optional[bool]:
+        return self.snapshot()["ready"]
+
+    def _loop(self):
+        while not self._stop.is_set():
+            self.refresh()
+            self._stop.wait(self.interval)
+
+
+_probe: Optional[ReadinessProbe] = None
+_probe_lock = threading.Lock()
+
+
+def get_readiness_probe() -> ReadinessProbe:
+    """Process-wide probe, started on first use."""
+    global _probe
+    with _probe_lock:
+        if _probe is None:
+            _probe = ReadinessProbe().start()
+        return _probe
@@ -71,6 +71,10 @@ STRINGS: dict[str, dict[str, str]] = {
         "status_done": "✅ ¡Investigación Completada!",
         "status_error": "❌ Error en la investigación",
         "error_msg": "Ocurrió un error durante la investigación: {e}",
+        "queue_position": "⏳ En cola: posición {position} · tiempo estimado ~{eta}s",
+        "queue_full": "El servidor está ocupado: la cola de investigaciones está llena. Inténtalo de nuevo en unos minutos.",
+        "service_not_ready": "El servicio no está listo (fallan: {checks}). Revisa el LLM configurado e inténtalo de nuevo.",
+        "sources_degraded": "⚠️ Fuentes sin respuesta en la última comprobación: {sources}",
         # Node progress messages
         "node_initialize_state": "⚙️ Inicializando estado...",
         "node_plan_research": "🗺️ Planificando estrategia de búsqueda...",
@@ -85,6 +89,7 @@ STRINGS: dict[str, dict[str, str]] = {
         "node_search_so": "💙 Consultando Stack Overflow...",
         "node_search_reddit": "🤖 Analizando opiniones en Reddit...",
         "node_local_rag": "📁 Analizando conocimiento local (RAG)...",
+        "node_refine_evidence": "🧹 Depurando resultados (duplicados y baja calidad)...",
         "node_consolidate_research": "🧠 Sintetizando toda la información...",
         "node_evaluate_research": "⚖️ Evaluando calidad y buscando vacíos...",
         "node_generate_report": "📄 Generando informe final...",
@@ -108,7 +113,6 @@ STRINGS: dict[str, dict[str, str]] = {
         "chat_thinking": "Pensando...",
         "chat_error": "Error en el chat: {e}",
         # Auto-loaded report
-        "autoreport_topic": "Reporte Guardado",
     },
     "en": {
         # Sidebar
@@ -175,6 +179,10 @@ STRINGS: dict[str, dict[str, str]] = {
         "status_done": "✅ Research Complete!",
         "status_error": "❌ Research error",
         "error_msg": "An error occurred during research: {e}",
+        "queue_position": "⏳ Queued: position {position} · estimated ~{eta}s",
+        "queue_full": "The server is busy: the research queue is full. Please try again in a few minutes.",
+        "service_not_ready": "The service is not ready (failing: {checks}). Check the configured LLM and try again.",
+        "sources_degraded": "⚠️ Sources that did not answer the last check: {sources}",
         # Node progress messages
         "node_initialize_state": "⚙️ Initializing state...",
         "node_plan_research": "🗺️ Planning research strategy...",
@@ -189,6 +197,7 @@ STRINGS: dict[str, dict[str, str]] = {
         "node_search_so": "💙 Querying Stack Overflow...",
         "node_search_reddit": "🤖 Analyzing Reddit discussions...",
         "node_local_rag": "📁 Analyzing local knowledge (RAG)...",
+        "node_refine_evidence": "🧹 Cleaning results (duplicates and low quality)...",
         "node_consolidate_research": "🧠 Synthesizing all information...",
         "node_evaluate_research": "⚖️ Evaluating quality and finding gaps...",
         "node_generate_report": "📄 Generating final report...",
@@ -212,7 +221,6 @@ STRINGS: dict[str, dict[str, str]] = {
         "chat_thinking": "Thinking...",
         "chat_error": "Chat error: {e}",
         # Auto-loaded report
-        "autoreport_topic": "Saved Report",
     },
 }
 
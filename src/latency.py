@@ -0,0 +1,74 @@
+import logging
+import threading
+from collections import defaultdict, deque
+from typing import Deque, Dict, Optional
+
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def source_timeout(source: str) -> float:
+    """Hard cap for one source call (``SOURCE_TIMEOUTS``, ``WEB_SEARCH_TIMEOUT`` for web)."""
+    if source == "web":
+        return float(settings.web_search_timeout)
+    return float(settings.source_timeouts.get(source, settings.thread_execution_timeout))
+
+
+class LatencyTracker:
+    """Rolling window of observed call latencies per source.
+
+    Deadlines follow the recent distribution: ``p95 * LATENCY_DEADLINE_FACTOR``,
+    clamped between ``LATENCY_MIN_DEADLINE`` and the source's hard cap. Until a
+    source has ``LATENCY_MIN_SAMPLES`` observations its hard cap is used.
+    Calls that miss their deadline keep running in the background and still
+    record their real duration, so a source that slows down pushes its own
+    deadline back up instead of being starved.
+    """
+
+    def __init__(self, window: Optional[int] = None):
+        self.window = window or settings.latency_window
+        self._samples: Dict[str, Deque[float]] = defaultdict(lambda: deque(maxlen=self.window))
+        self._lock = threading.Lock()
+
+    def record(self, source: str, seconds: float):
+        with self._lock:
+            self._samples[source].append(seconds)
+
+    def percentile(self, source: str, q: float) -> Optional[float]:
+        with self._lock:
+            samples = sorted(self._samples.get(source, ()))
+        if not samples:
+            return None
+        index = min(len(samples) - 1, int(round(q * (len(samples) - 1))))
+        return samples[index]
+
+    def deadline(self, source: str) -> float:
+        cap = source_timeout(source)
+        with self._lock:
+            count = len(self._samples.get(source, ()))
+        if count < settings.latency_min_samples:
+            return cap
+        p95 = self.percentile(source, 0.95)
+        return max(settings.latency_min_deadline, min(cap, p95 * settings.latency_deadline_factor))
+
+    def snapshot(self) -> Dict[str, dict]:
+        with self._lock:
+            sources = list(self._samples)
+        return {
+            source: {
+                "samples": len(self._samples[source]),
+                "p50": self.percentile(source, 0.5),
+                "p95": self.percentile(source, 0.95),
+                "deadline": self.deadline(source),
+            }
+            for source in sources
+        }
+
+    def reset(self):
+        with self._lock:
+            self._samples.clear()
+
+
+# Global latency tracker instance (shared by every run in the process)
+latency_tracker = LatencyTracker()
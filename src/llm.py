@@ -40,19 +40,22 @@ def _is_cloud_endpoint(base_url: str) -> bool:
     return any(frag in base_url.lower() for frag in _CLOUD_URL_FRAGMENTS)
 
 
-def get_llm(temperature: float = 0, timeout: int = None):
+def get_llm(temperature: float = 0, timeout: int = None, model: str = None):
     """
     Return a LangChain chat model configured from environment variables.
 
     Reads os.environ at call time so runtime overrides (e.g. from the
     HF Spaces sidebar key input) take effect without restarting the process.
+    ``model`` is the run's own choice (``llm_model`` in the agent state); runs
+    wait in the scheduler queue, so a model set in the process environment
+    could be another session's by the time they start.
     """
     t = timeout or settings.llm_request_timeout
 
     # Read live env vars so runtime sidebar overrides work
     api_key = os.environ.get("OPENAI_API_KEY") or settings.openai_api_key
     base_url = os.environ.get("OLLAMA_BASE_URL") or settings.ollama_base_url
-    model = os.environ.get("OLLAMA_MODEL") or settings.ollama_model
+    model = model or os.environ.get("OLLAMA_MODEL") or settings.ollama_model
 
     if api_key or _is_cloud_endpoint(base_url):
         from langchain_openai import ChatOpenAI
@@ -79,3 +82,21 @@ def get_llm(temperature: float = 0, timeout: int = None):
             temperature=temperature,
             request_timeout=t,
         )
+
+
+def enable_llm_cache(path: str = None) -> None:
+    """
+    Cache LLM responses process-wide in SQLite, keyed by prompt and model params.
+
+    Used by batch mode so identical calls across topics (query expansion,
+    planning of near-identical topics, re-runs after a crash) hit the model once.
+    """
+    from langchain_core.globals import set_llm_cache
+    from langchain_community.cache import SQLiteCache
+
+    cache_path = path or settings.llm_cache_path
+    cache_dir = os.path.dirname(cache_path)
+    if cache_dir:
+        os.makedirs(cache_dir, exist_ok=True)
+    set_llm_cache(SQLiteCache(database_path=cache_path))
+    logger.info(f"LLM response cache enabled at {cache_path}")
@@ -1,14 +1,21 @@
 # src/main.py
 
 import argparse
-from dotenv import load_dotenv
-from agent import app
-from utils import setup_logging, validate_env_vars
-from validators import validate_topic
-from health import check_dependencies
-from progress import init_progress
-from metrics import metrics
-from config import settings
+import os
+import sys
+
+# Add project root to sys.path so the 'src' package resolves when run as `python src/main.py`
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from dotenv import load_dotenv  # noqa: E402
+from src.utils import setup_logging, validate_env_vars  # noqa: E402
+from src.validators import validate_topic  # noqa: E402
+from src.health import check_dependencies  # noqa: E402
+from src.progress import init_progress  # noqa: E402
+from src.metrics import metrics  # noqa: E402
+from src.config import settings  # noqa: E402
 
 
 def parse_args():
@@ -32,9 +39,46 @@ def parse_args():
         action="store_true",
         help="Skip health checks on startup"
     )
+    parser.add_argument(
+        "--batch",
+        metavar="FILE",
+        help="Research every topic in FILE (one per line, '-' for stdin) instead of a single topic"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=settings.batch_workers,
+        help="Concurrent topics in batch mode"
+    )
+    parser.add_argument(
+        "--batch-id",
+        help="Batch identifier used to resume an interrupted batch (default: derived from the topic list)"
+    )
     return parser.parse_args()
 
 
+def run_batch_mode(args, logger):
+    """Headless batch research over many topics, resumable through the session DB."""
+    from src.batch import read_topics, run_batch, write_batch_report, format_batch_report
+
+    topics = []
+    for raw in read_topics(args.batch):
+        try:
+            topics.append(validate_topic(raw))
+        except ValueError as e:
+            logger.warning(f"Skipping invalid topic '{raw}': {e}")
+
+    if not topics:
+        logger.error("No valid topics to research")
+        return
+
+    logger.info(f"Starting batch of {len(topics)} topics with {args.workers} worker(s)")
+    report = run_batch(topics, workers=args.workers, batch_id=args.batch_id)
+    path = write_batch_report(report)
+    print(format_batch_report(report))
+    logger.info(f"Batch report written to {path}")
+
+
 def run_agent():
     """Main function to configure and run the research agent."""
     load_dotenv()
@@ -43,13 +87,10 @@ def run_agent():
     logger = setup_logging(args.log_level)
 
     # Bypass proxy for Ollama before any service calls
-    from utils import bypass_proxy_for_ollama
+    from src.utils import bypass_proxy_for_ollama
     bypass_proxy_for_ollama()
 
     try:
-        # Validate topic
-        validated_topic = validate_topic(args.topic)
-
         # Health checks
         if not args.skip_health_check:
             logger.info("Running health checks...")
@@ -57,12 +98,22 @@ def run_agent():
             if not healthy:
                 logger.warning("Some health checks failed, but continuing...")
 
+        validate_env_vars()
+
+        if args.batch:
+            run_batch_mode(args, logger)
+            metrics.log_stats()
+            return
+
+        # Validate topic
+        validated_topic = validate_topic(args.topic)
+
         # Initialize progress tracking (12 total steps)
         init_progress(12)
 
-        validate_env_vars()
         logger.info(f"Starting research agent for topic: '{validated_topic}'")
 
+        from src.agent import app
         initial_state = {"topic": validated_topic, "messages": []}
         app.invoke(initial_state)
 
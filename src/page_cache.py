@@ -0,0 +1,117 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from typing import Optional
+
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+PRUNE_EVERY = 100  # writes between size checks of the cache directory
+
+
+class PageCache:
+    """Cleaned page text keyed by URL, one JSON file per page.
+
+    Entries hold the full cleaned text (up to ``PAGE_CACHE_MAX_CHARS``) so any
+    preview length can be sliced from them, plus the validators the server sent
+    (``ETag`` / ``Last-Modified``). After ``PAGE_CACHE_TTL_HOURS`` an entry is
+    stale: callers revalidate it with a conditional request instead of
+    downloading the page again. The directory is kept under
+    ``PAGE_CACHE_MAX_MB`` by deleting the least recently written entries.
+    """
+
+    def __init__(self, directory: Optional[str] = None, ttl_hours: Optional[float] = None):
+        self.directory = directory or settings.page_cache_dir
+        self.ttl_hours = ttl_hours if ttl_hours is not None else settings.page_cache_ttl_hours
+        self._writes = 0
+        self._lock = threading.Lock()
+
+    def key(self, url: str, extractor: str = "") -> str:
+        return hashlib.md5(f"{extractor}|{url}".encode()).hexdigest()
+
+    def get(self, url: str, extractor: str = "") -> Optional[dict]:
+        path = self._path(url, extractor)
+        try:
+            with open(path, "r") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def is_fresh(self, entry: dict) -> bool:
+        return time.time() - entry.get("fetched_at", 0) < self.ttl_hours * 3600
+
+    def put(self, url: str, text: str, extractor: str = "", etag: Optional[str] = None,
+            last_modified: Optional[str] = None) -> dict:
+        entry = {
+            "url": url,
+            "text": text[:settings.page_cache_max_chars],
+            "etag": etag,
+            "last_modified": last_modified,
+            "fetched_at": time.time(),
+        }
+        self._write(url, extractor, entry)
+        return entry
+
+    def touch(self, url: str, entry: dict, extractor: str = "") -> dict:
+        """Mark an entry fresh again after a ``304 Not Modified``."""
+        entry = {**entry, "fetched_at": time.time()}
+        self._write(url, extractor, entry)
+        return entry
+
+    def prune(self, max_bytes: Optional[int] = None) -> int:
+        """Delete the oldest entries until the cache is back under 90% of ``max_bytes``."""
+        max_bytes = max_bytes if max_bytes is not None else int(settings.page_cache_max_mb * 1024 * 1024)
+        try:
+            entries = []
+            with os.scandir(self.directory) as it:
+                for entry in it:
+                    if entry.name.endswith(".json"):
+                        stat = entry.stat()
+                        entries.append((stat.st_mtime, stat.st_size, entry.path))
+        except OSError:
+            return 0
+
+        total = sum(size for _, size, _ in entries)
+        if total <= max_bytes:
+            return 0
+        removed = 0
+        for _, size, path in sorted(entries):
+            if total <= max_bytes * 0.9:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+            removed += 1
+        logger.info(f"Page cache pruned: {removed} entries removed, {total / 1024 / 1024:.1f} MB kept")
+        return removed
+
+    def _path(self, url: str, extractor: str) -> str:
+        return os.path.join(self.directory, f"{self.key(url, extractor)}.json")
+
+    def _write(self, url: str, extractor: str, entry: dict):
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            # Write-then-rename so concurrent readers never see a half-written file
+            path = self._path(url, extractor)
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(entry, f)
+            os.replace(tmp_path, path)
+        except (OSError, TypeError) as e:
+            logger.debug(f"Page cache write failed for {url}: {e}")
+            return
+        with self._lock:
+            self._writes += 1
+            check = self._writes % PRUNE_EVERY == 1  # also on the first write after a restart
+        if check:
+            self.prune()
+
+
+# Global page cache instance
+page_cache = PageCache()
@@ -0,0 +1,255 @@
+import logging
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Any, Callable, Deque, Dict, Mapping, Optional
+
+from .config import settings
+from .singleflight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+
+class RateLimitExceeded(RuntimeError):
+    """An API is throttling us (403/429) or no request slot freed up in time."""
+
+
+def is_rate_limit_error(exc: BaseException) -> bool:
+    """Recognise throttling errors raised by PyGithub, requests, StackAPI and semanticscholar."""
+    if isinstance(exc, RateLimitExceeded):
+        return True
+    status = getattr(exc, "status", None)
+    if status is None:
+        status = getattr(getattr(exc, "response", None), "status_code", None)
+    text = str(exc).lower()
+    if status == 429 or "too many requests" in text or "throttle" in text:
+        return True
+    # GitHub answers 403 both for bad credentials and for exhausted quotas
+    return status == 403 and "rate limit" in text
+
+
+def _number(value) -> Optional[float]:
+    if isinstance(value, bool) or not isinstance(value, (int, float, str)):
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        return None
+
+
+class ApiRateLimiter:
+    """Token bucket for one external API, shared by every session in the process.
+
+    Requests are paced at ``rate`` per second with bursts of up to ``burst``.
+    The bucket is corrected by what the server reports (remaining quota and
+    reset time, ``Retry-After``/``backoff``), so a quota spent by another
+    process or an unauthenticated client's lower limit are honoured too.
+    Waiters are served round-robin per session: one run issuing many calls
+    can't starve another that only needs one. ``clock`` (monotonic seconds)
+    paces the bucket and the wait deadlines; server reset times are epoch
+    timestamps and always use the wall clock.
+    """
+
+    def __init__(self, name: str, rate: Optional[float] = None, burst: Optional[int] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        self.name = name
+        self.rate = rate or settings.api_rate_limits.get(name, 1.0)
+        self.burst = max(1, burst or settings.api_rate_burst)
+        self._clock = clock
+        self._tokens = float(self.burst)
+        self._refilled_at = clock()
+        self._remaining: Optional[int] = None
+        self._reset_at: Optional[float] = None
+        self._blocked_until = 0.0
+        self._queues: "OrderedDict[str, Deque[object]]" = OrderedDict()
+        self._cond = threading.Condition()
+        self._flight = SingleFlight(name)
+        self.throttled = 0
+
+    def acquire(self, session_id: Optional[str] = None, timeout: Optional[float] = None):
+        """Block until this session may send one request.
+
+        Raises ``RateLimitExceeded`` when no slot is available within ``timeout``
+        (``API_RATE_WAIT_TIMEOUT`` by default); callers treat that like a 429
+        instead of waiting out a long server-side reset.
+        """
+        session = session_id or "_default"
+        timeout = settings.api_rate_wait_timeout if timeout is None else timeout
+        deadline = self._clock() + timeout
+        ticket = object()
+        with self._cond:
+            self._queues.setdefault(session, deque()).append(ticket)
+            try:
+                while True:
+                    delay = self._delay()
+                    my_turn = next(iter(self._queues)) == session and self._queues[session][0] is ticket
+                    if my_turn and delay <= 0:
+                        self._take()
+                        return
+                    left = deadline - self._clock()
+                    if left <= 0 or (my_turn and delay > left):
+                        raise RateLimitExceeded(f"{self.name}: no request slot within {timeout:.0f}s")
+                    self._cond.wait(min(delay, left) if my_turn else left)
+            except BaseException:
+                self._dequeue(session, ticket)
+                raise
+
+    def call(self, fn: Callable, *args, session_id: Optional[str] = None, key: Optional[str] = None, **kwargs) -> Any:
+        """Run ``fn`` under the limiter.
+
+        Calls sharing ``key`` while one is in flight are coalesced into a single
+        request. Throttling errors back the bucket off and are re-raised as
+        ``RateLimitExceeded``.
+        """
+        if key is not None:
+            return self._flight.do(key, self._call, fn, args, kwargs, session_id)
+        return self._call(fn, args, kwargs, session_id)
+
+    def update(self, remaining=None, reset_at=None, retry_after=None):
+        """Apply the quota reported by the server (reset is an epoch timestamp)."""
+        remaining, reset_at, retry_after = _number(remaining), _number(reset_at), _number(retry_after)
+        with self._cond:
+            now = time.time()
+            if remaining is not None and remaining >= 0:
+                self._remaining = int(remaining)
+                self._reset_at = reset_at if reset_at and reset_at > now else None
+                if self._remaining <= 0 and self._reset_at is None:
+                    # Quota gone and no reset announced (StackExchange's daily quota)
+                    self._blocked_until = max(self._blocked_until, now + settings.api_rate_backoff_s)
+            if retry_after and retry_after > 0:
+                self._blocked_until = max(self._blocked_until, now + retry_after)
+            self._cond.notify_all()
+
+    def update_from_headers(self, headers: Optional[Mapping[str, str]]):
+        """Read ``X-RateLimit-Remaining``/``X-RateLimit-Reset`` and ``Retry-After``."""
+        if not headers:
+            return
+        lowered = {str(k).lower(): v for k, v in headers.items()}
+        self.update(remaining=lowered.get("x-ratelimit-remaining"),
+                    reset_at=lowered.get("x-ratelimit-reset"),
+                    retry_after=lowered.get("retry-after"))
+
+    def penalize(self, retry_after: Optional[float] = None):
+        """Stop sending requests for ``retry_after`` seconds (``API_RATE_BACKOFF_S`` if unknown)."""
+        seconds = _number(retry_after) or settings.api_rate_backoff_s
+        with self._cond:
+            self.throttled += 1
+            self._blocked_until = max(self._blocked_until, time.time() + seconds)
+            self._cond.notify_all()
+        logger.warning(f"API '{self.name}' is throttling requests; backing off for {seconds:.0f}s")
+
+    def to_dict(self) -> dict:
+        with self._cond:
+            return {
+                "rate": self.rate,
+                "tokens": round(self._tokens, 2),
+                "remaining": self._remaining,
+                "wait_s": round(max(self._delay(), 0.0), 1),
+                "waiting": sum(len(q) for q in self._queues.values()),
+                "throttled": self.throttled,
+                **self._flight.stats(),
+            }
+
+    def _call(self, fn, args, kwargs, session_id):
+        self.acquire(session_id)
+        try:
+            return fn(*args, **kwargs)
+        except RateLimitExceeded:
+            raise
+        except Exception as e:
+            if not is_rate_limit_error(e):
+                raise
+            headers = getattr(e, "headers", None)
+            if headers is None:
+                headers = getattr(getattr(e, "response", None), "headers", None)
+            retry_after = None
+            if isinstance(headers, Mapping):
+                self.update_from_headers(headers)
+                retry_after = {str(k).lower(): v for k, v in headers.items()}.get("retry-after")
+            self.penalize(retry_after)
+            raise RateLimitExceeded(f"{self.name}: {e}") from e
+
+    # Callers hold the condition for the helpers below
+
+    def _refill(self):
+        now = self._clock()
+        self._tokens = min(float(self.burst), self._tokens + (now - self._refilled_at) * self.rate)
+        self._refilled_at = now
+
+    def _delay(self) -> float:
+        """Seconds until a request may be sent (<= 0 means now)."""
+        self._refill()
+        now = time.time()
+        delay = 0.0 if self._tokens >= 1 else (1 - self._tokens) / self.rate
+        if self._remaining is not None and self._remaining <= 0:
+            if self._reset_at and self._reset_at > now:
+                delay = max(delay, self._reset_at - now)
+            else:
+                self._remaining = None
+        return max(delay, self._blocked_until - now)
+
+    def _take(self):
+        self._tokens -= 1
+        if self._remaining is not None:
+            self._remaining -= 1
+        self._advance(next(iter(self._queues)))
+
+    def _advance(self, session: str):
+        queue = self._queues[session]
+        queue.popleft()
+        if queue:
+            self._queues.move_to_end(session)
+        else:
+            del self._queues[session]
+        self._cond.notify_all()
+
+    def _dequeue(self, session: str, ticket: object):
+        queue = self._queues.get(session)
+        if queue is None or ticket not in queue:
+            return
+        queue.remove(ticket)
+        if not queue:
+            del self._queues[session]
+        self._cond.notify_all()
+
+
+def sync_github_rate_limit(limiter: ApiRateLimiter, client) -> None:
+    """Feed PyGithub's last seen ``X-RateLimit-*`` values into ``limiter``.
+
+    Reads the requester rather than ``Github.rate_limiting``, which would spend
+    a request on ``/rate_limit`` when no response has been seen yet.
+    """
+    requester = getattr(client, "requester", None)
+    try:
+        remaining, limit = requester.rate_limiting
+        if _number(limit) is not None and limit >= 0:
+            limiter.update(remaining=remaining, reset_at=requester.rate_limiting_resettime)
+    except (AttributeError, TypeError, ValueError):
+        pass
+
+
+class RateLimiterRegistry:
+    """Process-wide limiters, one per external API."""
+
+    def __init__(self):
+        self._limiters: Dict[str, ApiRateLimiter] = {}
+        self._lock = threading.Lock()
+
+    def get(self, name: str) -> ApiRateLimiter:
+        with self._lock:
+            if name not in self._limiters:
+                self._limiters[name] = ApiRateLimiter(name)
+            return self._limiters[name]
+
+    def snapshot(self) -> Dict[str, dict]:
+        with self._lock:
+            limiters = dict(self._limiters)
+        return {name: limiter.to_dict() for name, limiter in limiters.items()}
+
+    def reset(self):
+        with self._lock:
+            self._limiters.clear()
+
+
+# Global limiter registry
+api_limiters = RateLimiterRegistry()
@@ -0,0 +1,189 @@
+import hashlib
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import List, Optional, Sequence
+
+from .compression import bm25_scores, query_terms
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+MAX_EMBED_CHARS = 1200  # MiniLM reads 256 word pieces; longer text is truncated by the model anyway
+
+
+class EmbeddingCache:
+    """Process-wide LRU of text embeddings keyed by content hash.
+
+    The same pages, abstracts and READMEs come back across sessions and
+    re-plan iterations; each is embedded once while it stays in the cache.
+    """
+
+    def __init__(self, max_entries: Optional[int] = None):
+        self.max_entries = max_entries or settings.rerank_cache_size
+        self._entries: "OrderedDict[str, object]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(text: str) -> str:
+        return hashlib.sha1(text.encode("utf-8", "ignore")).hexdigest()
+
+    def get(self, key: str):
+        with self._lock:
+            vector = self._entries.get(key)
+            if vector is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return vector
+
+    def put(self, key: str, vector):
+        with self._lock:
+            self._entries[key] = vector
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+class Reranker:
+    """Relevance scores of texts to a query, computed on CPU.
+
+    ``RERANK_BACKEND=embedding`` uses the all-MiniLM-L6-v2 ONNX bi-encoder the
+    RAG store already ships (cosine similarity, texts embedded in batches of
+    ``RERANK_BATCH_SIZE``); ``bm25`` scores lexically with no model. The model
+    (downloaded on first use) loads in the background: until it is ready, or
+    for the rest of the process if it can't be loaded, calls score with BM25
+    instead of waiting. ``stats()`` reports throughput per backend, counting
+    only the texts each backend actually scored (cache hits are not work).
+    """
+
+    def __init__(self, cache: Optional[EmbeddingCache] = None):
+        self.cache = cache or EmbeddingCache()
+        self._model = None
+        self._model_failed = False
+        self._loader: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._totals = {"embedding": [0, 0.0], "bm25": [0, 0.0]}  # texts scored, seconds spent
+
+    def backend(self) -> str:
+        """The backend calls use right now (BM25 while the model is loading or unavailable)."""
+        backend = settings.rerank_backend
+        if backend == "embedding" and self._model is None:
+            return "bm25"
+        return backend
+
+    def model_status(self) -> str:
+        if self._model is not None:
+            return "ready"
+        if self._model_failed:
+            return "unavailable"
+        return "loading" if self._loader is not None else "not loaded"
+
+    def _load_model(self):
+        from chromadb.utils import embedding_functions
+        model = embedding_functions.DefaultEmbeddingFunction()
+        model(["warm-up"])  # the ONNX weights are only downloaded on the first call
+        return model
+
+    def _load(self):
+        started = time.perf_counter()
+        try:
+            self._model = self._load_model()
+            logger.info(f"Rerank model ready in {time.perf_counter() - started:.1f}s")
+        except Exception as e:
+            logger.warning(f"Rerank model unavailable, using BM25: {e}")
+            self._model_failed = True
+
+    def preload(self, timeout: Optional[float] = None) -> bool:
+        """Start loading the embedding model in the background; True once it is ready.
+
+        With ``timeout`` waits up to that many seconds for the load to finish.
+        """
+        if settings.rerank_backend != "embedding":
+            return False
+        with self._lock:
+            if self._loader is None and self._model is None and not self._model_failed:
+                self._loader = threading.Thread(target=self._load, name="rerank-model", daemon=True)
+                self._loader.start()
+            loader = self._loader
+        if timeout and loader is not None:
+            loader.join(timeout)
+        return self._model is not None
+
+    def _record(self, backend: str, items: int, seconds: float):
+        with self._lock:
+            totals = self._totals[backend]
+            totals[0] += items
+            totals[1] += seconds
+
+    def embed(self, texts: Sequence[str]):
+        """L2-normalized embeddings (one row per text), served from the cache where possible."""
+        import numpy as np
+
+        texts = [t[:MAX_EMBED_CHARS] for t in texts]
+        keys = [self.cache.key(t) for t in texts]
+        vectors = [self.cache.get(k) for k in keys]
+        missing = [i for i, v in enumerate(vectors) if v is None]
+        if missing:
+            model = self._model
+            if model is None:
+                raise RuntimeError("rerank model not loaded")
+            started = time.perf_counter()
+            batch = settings.rerank_batch_size
+            for start in range(0, len(missing), batch):
+                chunk = missing[start:start + batch]
+                for i, vector in zip(chunk, model([texts[i] for i in chunk])):
+                    vector = np.asarray(vector, dtype=np.float32)
+                    vector /= max(float(np.linalg.norm(vector)), 1e-9)
+                    vectors[i] = vector
+                    self.cache.put(keys[i], vector)
+            self._record("embedding", len(missing), time.perf_counter() - started)
+        return np.vstack(vectors) if vectors else np.zeros((0, 0), dtype=np.float32)
+
+    def scores(self, query: str, texts: Sequence[str], queries: Optional[dict] = None):
+        """Relevance of each text to ``query`` as a numpy vector (higher is better)."""
+        import numpy as np
+
+        if not texts:
+            return np.zeros(0)
+        if self.preload():
+            try:
+                matrix = self.embed([query, *texts])
+                return matrix[1:] @ matrix[0]
+            except Exception as e:
+                logger.warning(f"Embedding rerank failed, using BM25 from now on: {e}")
+                self._model, self._model_failed = None, True
+        started = time.perf_counter()
+        result = bm25_scores(query_terms(query, queries), list(texts))
+        self._record("bm25", len(texts), time.perf_counter() - started)
+        return result
+
+    def rank(self, query: str, texts: Sequence[str], queries: Optional[dict] = None) -> List[int]:
+        """Indices of ``texts`` from most to least relevant (stable for ties)."""
+        scores = self.scores(query, texts, queries)
+        return sorted(range(len(texts)), key=lambda i: -scores[i])
+
+    def stats(self) -> dict:
+        """Current backend, model state and, per backend, texts scored and items/sec since start."""
+        with self._lock:
+            backends = {name: {"items": items, "seconds": round(seconds, 3),
+                               "items_per_sec": round(items / seconds, 1) if seconds else 0.0}
+                        for name, (items, seconds) in self._totals.items()}
+        return {"backend": self.backend(), "model": self.model_status(), "backends": backends,
+                "cache": self.cache.stats()}
+
+
+# Global reranker (and its embedding cache), shared by all sessions
+reranker = Reranker()
@@ -0,0 +1,237 @@
+import logging
+import os
+import threading
+import time
+import uuid
+from collections import deque
+from typing import Deque, Dict, List, Optional
+
+from .config import settings
+from .events import progress_bus
+
+logger = logging.getLogger(__name__)
+
+# Terminal job states
+FINISHED_STATUSES = ("done", "error")
+
+
+class QueueFullError(RuntimeError):
+    """Raised when the scheduler cannot accept more work without unbounded waits."""
+
+
+class ResearchJob:
+    """One queued or running research request."""
+
+    def __init__(self, job_id: str, inputs: dict):
+        self.job_id = job_id
+        self.inputs = inputs
+        self.status = "queued"
+        self.submitted_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.result: Optional[dict] = None
+        self.error: Optional[str] = None
+        self._finished = threading.Event()
+
+    @property
+    def is_finished(self) -> bool:
+        return self._finished.is_set()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until the job finishes. Returns False on timeout."""
+        return self._finished.wait(timeout)
+
+    def to_dict(self) -> dict:
+        return {
+            "job_id": self.job_id,
+            "topic": self.inputs.get("topic", ""),
+            "status": self.status,
+            "submitted_at": self.submitted_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "error": self.error,
+        }
+
+
+def llm_capacity() -> int:
+    """How many research runs the configured LLM endpoint can serve at once."""
+    from .llm import _is_cloud_endpoint
+
+    base_url = os.environ.get("OLLAMA_BASE_URL") or settings.ollama_base_url
+    api_key = os.environ.get("OPENAI_API_KEY") or settings.openai_api_key
+    if api_key or _is_cloud_endpoint(base_url):
+        return max(1, settings.llm_cloud_max_concurrency)
+    return max(1, settings.llm_max_concurrency)
+
+
+class ResearchScheduler:
+    """Bounded FIFO scheduler for research runs.
+
+    At most ``slots`` runs execute at once, where ``slots`` is capped by the
+    capacity of the LLM endpoint; further requests wait in a bounded queue
+    (and are rejected beyond it) so overload degrades into queueing instead of
+    every run timing out against a saturated model server.
+    """
+
+    def __init__(self, max_concurrent: Optional[int] = None, max_queued: Optional[int] = None, runner=None):
+        requested = max_concurrent or settings.max_concurrent_jobs
+        self.slots = max(1, min(requested, llm_capacity()))
+        self.max_queued = max_queued if max_queued is not None else settings.max_queued_jobs
+        self._runner = runner or _run_graph
+        self._queue: Deque[ResearchJob] = deque()
+        self._jobs: Dict[str, ResearchJob] = {}
+        self._running: Dict[str, ResearchJob] = {}
+        self._durations: Deque[float] = deque(maxlen=20)
+        self._finished_ids: Deque[str] = deque()
+        self._cond = threading.Condition()
+        self._workers: List[threading.Thread] = []
+        logger.info(f"Research scheduler ready with {self.slots} slot(s), queue limit {self.max_queued}")
+
+    # ---------------------------------------------------------------- public API
+
+    def submit(self, inputs: dict) -> ResearchJob:
+        """Queue a research request. The job id doubles as its progress session id."""
+        with self._cond:
+            if len(self._queue) >= self.max_queued:
+                raise QueueFullError(f"Research queue is full ({self.max_queued} waiting)")
+
+            job_id = inputs.get("session_id") or uuid.uuid4().hex
+            job = ResearchJob(job_id, {**inputs, "session_id": job_id})
+            self._jobs[job_id] = job
+            self._queue.append(job)
+            self._ensure_workers()
+            self._cond.notify()
+            self._announce_queue()
+        logger.info(f"Job {job_id} queued (position {self.position(job_id)})")
+        return job
+
+    def get(self, job_id: str) -> Optional[ResearchJob]:
+        return self._jobs.get(job_id)
+
+    def position(self, job_id: str) -> int:
+        """1-based queue position; 0 once the job is running or finished."""
+        with self._cond:
+            for i, job in enumerate(self._queue):
+                if job.job_id == job_id:
+                    return i + 1
+        return 0
+
+    def average_duration(self) -> float:
+        if not self._durations:
+            return float(settings.job_default_duration_s)
+        return sum(self._durations) / len(self._durations)
+
+    def eta(self, job_id: str) -> Optional[float]:
+        """Estimated seconds until the job finishes, from recent run durations."""
+        job = self._jobs.get(job_id)
+        if not job or job.is_finished:
+            return 0.0 if job else None
+
+        avg = self.average_duration()
+        if job.status == "running":
+            return max(avg - (time.time() - job.started_at), 0.0)
+
+        # One slot frees up roughly every avg/slots seconds
+        position = self.position(job_id)
+        return position * avg / self.slots + avg
+
+    def status(self, job_id: str) -> Optional[dict]:
+        job = self._jobs.get(job_id)
+        if not job:
+            return None
+        info = job.to_dict()
+        info["position"] = self.position(job_id)
+        info["eta_seconds"] = self.eta(job_id)
+        return info
+
+    def stats(self) -> dict:
+        with self._cond:
+            return {
+                "slots": self.slots,
+                "running": len(self._running),
+                "queued": len(self._queue),
+                "max_queued": self.max_queued,
+                "avg_duration": self.average_duration(),
+            }
+
+    def forget(self, job_id: str):
+        """Drop a finished job from the registry, along with its progress channel."""
+        job = self._jobs.get(job_id)
+        if job and job.is_finished:
+            self._jobs.pop(job_id, None)
+            progress_bus.close(job_id)
+
+    # ------------------------------------------------------------------ internals
+
+    def _ensure_workers(self):
+        while len(self._workers) < self.slots:
+            worker = threading.Thread(target=self._worker_loop, name=f"research-worker-{len(self._workers)}", daemon=True)
+            self._workers.append(worker)
+            worker.start()
+
+    def _announce_queue(self):
+        """Tell every waiting session where it stands (caller holds the lock)."""
+        avg = self.average_duration()
+        for i, job in enumerate(self._queue):
+            position = i + 1
+            progress_bus.publish(job.job_id, "queue", position=position, eta_seconds=position * avg / self.slots + avg)
+
+    def _worker_loop(self):
+        while True:
+            with self._cond:
+                while not self._queue:
+                    self._cond.wait()
+                job = self._queue.popleft()
+                job.status = "running"
+                job.started_at = time.time()
+                self._running[job.job_id] = job
+                self._announce_queue()
+
+            progress_bus.publish(job.job_id, "started", waited_seconds=job.started_at - job.submitted_at)
+            try:
+                job.result = self._runner(job)
+                job.status = "done"
+            except Exception as e:
+                logger.error(f"Job {job.job_id} failed: {e}")
+                job.error = str(e)
+                job.status = "error"
+                progress_bus.publish(job.job_id, "error", error=str(e))
+            finally:
+                job.finished_at = time.time()
+                with self._cond:
+                    self._running.pop(job.job_id, None)
+                    if job.status == "done":
+                        self._durations.append(job.finished_at - job.started_at)
+                    # Keep finished jobs around for result/artifact lookups, but not forever
+                    self._finished_ids.append(job.job_id)
+                    while len(self._finished_ids) > settings.max_finished_jobs:
+                        # A session id can be resubmitted; never evict its newer, unfinished job
+                        self.forget(self._finished_ids.popleft())
+                job._finished.set()
+                progress_bus.publish(job.job_id, "done", status=job.status)
+
+
+def _run_graph(job: ResearchJob) -> dict:
+    """Default runner: stream the compiled graph, forwarding chunks to the job channel."""
+    from .agent import app
+
+    final_state = dict(job.inputs)
+    for chunk in app.stream(job.inputs, config={"recursion_limit": 100}):
+        for state_update in chunk.values():
+            if isinstance(state_update, dict):
+                final_state.update(state_update)
+        progress_bus.publish(job.job_id, "node", chunk=chunk)
+    return final_state
+
+
+_scheduler: Optional[ResearchScheduler] = None
+_scheduler_lock = threading.Lock()
+
+
+def get_scheduler() -> ResearchScheduler:
+    """Process-wide scheduler shared by every dashboard session."""
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = ResearchScheduler()
+        return _scheduler
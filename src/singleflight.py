@@ -0,0 +1,104 @@
+import copy
+import logging
+import threading
+from functools import wraps
+from typing import Any, Callable, Dict, Optional
+
+from .cache import get_source_cache_key
+
+logger = logging.getLogger(__name__)
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        self.followers = 0
+
+
+class SingleFlight:
+    """Collapse concurrent calls that share a key into a single execution.
+
+    The first caller (the leader) runs the function; callers arriving with the
+    same key while it is in flight wait and receive the same result or
+    exception. Nothing is cached: once the call finishes the key is free again.
+    """
+
+    def __init__(self, name: str = ""):
+        self.name = name
+        self._calls: Dict[str, _Call] = {}
+        self._lock = threading.Lock()
+        self.executions = 0
+        self.coalesced = 0
+
+    def do(self, key: str, fn: Callable, *args, copy_result: bool = False, **kwargs):
+        """Run ``fn(*args, **kwargs)`` once per concurrent ``key``.
+
+        With ``copy_result`` followers get a deep copy, so sessions sharing a
+        result can't mutate each other's state.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self._calls[key] = call
+                self.executions += 1
+            else:
+                call.followers += 1
+                self.coalesced += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return copy.deepcopy(call.result) if copy_result else call.result
+
+        try:
+            call.result = fn(*args, **kwargs)
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            if call.followers:
+                logger.debug(f"singleflight{'[' + self.name + ']' if self.name else ''}: "
+                             f"{call.followers} caller(s) shared '{key[:60]}'")
+            call.done.set()
+
+    @property
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._calls)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"executions": self.executions, "coalesced": self.coalesced, "in_flight": len(self._calls)}
+
+
+# Shared by every source node in the process
+source_flights = SingleFlight("sources")
+
+
+def single_flight(source: str, key_fn: Optional[Callable[[dict], str]] = None):
+    """Decorator for source nodes: concurrent runs issuing the same query share one call.
+
+    The key defaults to ``get_source_cache_key`` (queries, depth, persona, time
+    range), so it matches what the source cache would store. Each caller gets
+    its own copy of the result with ``next_node`` recomputed from its own plan.
+    """
+    def decorator(func):
+        @wraps(func)
+        def wrapper(state):
+            from .tools.router_tools import update_next_node
+
+            key = f"{func.__name__}:{key_fn(state) if key_fn else get_source_cache_key(source, state)}"
+            result = source_flights.do(key, func, state, copy_result=True)
+            if isinstance(result, dict) and "next_node" in result:
+                result = {**result, "next_node": update_next_node(state, source)}
+            return result
+        return wrapper
+    return decorator
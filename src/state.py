@@ -21,6 +21,9 @@ class AgentState(TypedDict):
     consolidated_summary: str
     bibliography: List[str]
     pdf_path: str
+    html_path: str
+    md_path: str
+    docx_path: str
     report: str
     messages: List[BaseMessage]
     research_plan: List[str]
@@ -33,3 +36,10 @@ class AgentState(TypedDict):
     queries: Dict[str, str]
     source_metadata: Dict[str, dict]
     use_rag: bool  # User-controlled flag: whether to include local RAG as a source
+    session_id: str  # Scopes progress events (and per-run artifacts) to one research session
+    search_budget: float  # Optional per-run cap (seconds) for the parallel search fan-out
+    context_chunks: Dict[str, str]  # Synthesis context sections pre-formatted per source as results arrive
+    partial_summaries: Dict[str, str]  # Per-source map-summaries produced during search (progressive synthesis)
+    chat_summary: str  # Rolling summary of the chat turns older than the last CHAT_HISTORY_TURNS
+    chat_summary_upto: int  # Number of leading messages folded into chat_summary
+    llm_model: str  # Model selected for this run; get_llm falls back to OLLAMA_MODEL without it
@@ -1,25 +1,106 @@
 import logging
+import re
+import uuid
+from functools import partial
+from typing import Optional
 from ..llm import get_llm
-from langchain_core.messages import SystemMessage, AIMessage
+from langchain_core.messages import SystemMessage, AIMessage, HumanMessage
+from ..chat_memory import chat_compactor
+from ..compression import estimate_tokens
+from ..config import settings
+from ..evidence_index import evidence_indexes
 from ..state import AgentState
 
 logger = logging.getLogger(__name__)
 
 
+def _last_question(messages) -> str:
+    for msg in reversed(messages):
+        if isinstance(msg, HumanMessage):
+            return msg.content
+    return ""
+
+
+def retrieve_chat_context(state: AgentState, question: str) -> str:
+    """Summary and source passages relevant to ``question``, within ``CHAT_CONTEXT_TOKENS``.
+
+    Both the consolidated summary and the session's evidence index are
+    searched, so answers can reach details the summary left out. When the
+    question matches nothing (e.g. "explain this"), the opening of the summary
+    is used instead. The prompt size is bounded no matter how long the
+    summary or how many sources the run collected.
+    """
+    summary_index = evidence_indexes.for_summary(state)
+    summary_hits = summary_index.search(question, k=settings.chat_summary_passages)
+    source_hits = evidence_indexes.for_state(state).search(question, k=settings.chat_source_passages)
+    if not summary_hits and not source_hits:
+        summary_hits = summary_index.passages[:settings.chat_summary_passages]
+
+    budget = settings.chat_context_tokens
+    parts = {"summary": [], "sources": []}
+    for kind, hit in [("summary", h) for h in summary_hits] + [("sources", h) for h in source_hits]:
+        if kind == "summary":
+            text = f"{hit['text']}\n"
+        else:
+            text = f"- [{hit.get('title') or hit['source']}]({hit.get('url') or 'sin URL'}): {hit['text']}\n"
+        if estimate_tokens(text) > budget:
+            continue
+        budget -= estimate_tokens(text)
+        parts[kind].append(text)
+
+    context = ""
+    if parts["summary"]:
+        context += "FRAGMENTOS RELEVANTES DE LA SÍNTESIS:\n" + "".join(parts["summary"]) + "\n"
+    if parts["sources"]:
+        context += "FRAGMENTOS DE LAS FUENTES (cita la URL si los usas):\n" + "".join(parts["sources"])
+    return context
+
+
+def _strip_think(content: str) -> str:
+    # Blindaje: Eliminar etiquetas <think>...</think> y su contenido
+    content = re.sub(r'<think>.*?</think>', '', content, flags=re.DOTALL).strip()
+    # Eliminar etiquetas huérfanas o incompletas (defensivo)
+    return content.replace("<think>", "").replace("</think>", "").strip()
+
+
+def summarize_chat_history(previous: str, messages, model: Optional[str] = None) -> str:
+    """Fold ``messages`` into the running conversation summary (runs in the background)."""
+    transcript = "\n".join(
+        f"{'Usuario' if isinstance(m, HumanMessage) else 'Asistente'}: {m.content}" for m in messages
+    )
+    prompt = f"""Actualiza el resumen de una conversación entre un usuario y un asistente de investigación.
+Integra los nuevos mensajes en el resumen anterior. Conserva las preguntas del usuario, las conclusiones,
+los datos concretos y las URLs citadas; elimina saludos y repeticiones. Máximo {settings.chat_summary_words} palabras.
+Responde solo con el resumen.
+
+RESUMEN ANTERIOR:
+{previous or "(vacío)"}
+
+NUEVOS MENSAJES:
+{transcript}"""
+    llm = get_llm(temperature=0, timeout=settings.chat_summary_timeout, model=model)
+    return _strip_think(llm.invoke([HumanMessage(content=prompt)]).content)
+
+
 def chat_node(state: AgentState) -> dict:
     """Conversational node that answers user questions based on research."""
     logger.info("Processing user chat message...")
 
     topic = state.get("topic", "")
-    summary = state.get("consolidated_summary", "")
     messages = state.get("messages", [])
+    # Chat memory is kept per session; a chat started outside a research run gets its own id
+    session_id = state.get("session_id") or uuid.uuid4().hex
 
-    # Build context for the LLM
+    # Older turns arrive as a rolling summary, the recent ones verbatim
+    history_summary, summary_upto, recent = chat_compactor.compacted(
+        session_id, messages, state.get("chat_summary", ""), state.get("chat_summary_upto", 0))
+
+    # Only the passages relevant to this question go into the prompt
     context = f"TEMA DE INVESTIGACIÓN: {topic}\n\n"
-    if summary:
-        context += f"SÍNTESIS DE INVESTIGACIÓN:\n{summary}\n"
-    else:
-        context += "Aún no se ha completado la investigación detallada."
+    retrieved = retrieve_chat_context(state, _last_question(messages))
+    context += retrieved or "Aún no se ha completado la investigación detallada."
+    if history_summary:
+        context += f"\n\nRESUMEN DE LA CONVERSACIÓN ANTERIOR:\n{history_summary}"
 
     system_prompt = f"""
     Eres un Asistente de Investigación experto. Tu objetivo es ayudar al usuario a entender los resultados de su investigación.
@@ -40,23 +121,15 @@ def chat_node(state: AgentState) -> dict:
     from ..utils import bypass_proxy_for_ollama
     bypass_proxy_for_ollama()
 
-    llm = get_llm(temperature=0.7, timeout=90)
+    llm = get_llm(temperature=0.7, timeout=90, model=state.get("llm_model"))
 
-    # Convert state messages to LangChain format if they aren't already
     chat_history = [SystemMessage(content=system_prompt)]
-    for msg in messages:
+    for msg in recent:
         chat_history.append(msg)
 
     try:
         response = llm.invoke(chat_history)
-        content = response.content.strip()
-
-        # Blindaje: Eliminar etiquetas <think>...</think> y su contenido
-        import re
-        content = re.sub(r'<think>.*?</think>', '', content, flags=re.DOTALL).strip()
-
-        # Eliminar etiquetas huérfanas o incompletas (defensivo)
-        content = content.replace("<think>", "").replace("</think>", "").strip()
+        content = _strip_think(response.content.strip())
 
         # Actualizar el contenido del mensaje de respuesta
         response.content = content
@@ -65,7 +138,13 @@ def chat_node(state: AgentState) -> dict:
         if "INVESTIGACIÓN:" in content:
             logger.info("Chat suggested more research. Updating next_node triggers.")
 
-        return {"messages": [response]}
+        # Fold old turns into the summary after answering; the next turn uses it if it's ready
+        chat_compactor.schedule(session_id, list(messages) + [response],
+                                partial(summarize_chat_history, model=state.get("llm_model")),
+                                history_summary, summary_upto)
+
+        return {"messages": [response], "session_id": session_id,
+                "chat_summary": history_summary, "chat_summary_upto": summary_upto}
     except Exception as e:
         logger.error(f"Error in chat_node: {e}")
         return {"messages": [AIMessage(content="Lo siento, ocurrió un error al procesar tu pregunta.")]}
@@ -0,0 +1,164 @@
+# src/tools/evidence_tools.py
+
+import logging
+import time
+from typing import Dict, List, Tuple
+
+from ..compression import tokenize
+from ..config import settings
+from ..dedup import canonical_url, duplicate_groups, paper_ids, simhash
+from ..evidence_index import evidence_indexes
+from ..quality import item_content, score_content_quality_batch
+from ..rerank import reranker
+from ..state import AgentState
+from .synthesis_tools import CONTENT_FIELDS, SOURCE_SECTIONS, format_source_section, synthesis_terms
+
+logger = logging.getLogger(__name__)
+
+# Sources whose items are dicts in a ``*_research`` list (YouTube summaries are plain strings)
+EVIDENCE_SOURCES = [source for source in SOURCE_SECTIONS if source != "youtube"]
+PAPER_SOURCES = {"arxiv", "scholar"}
+
+
+def item_text(source: str, item: dict) -> str:
+    field = CONTENT_FIELDS.get(source)
+    text = item.get(field) if field else None
+    return text if isinstance(text, str) else ""
+
+
+def collect_evidence(state: dict) -> List[Tuple[str, dict]]:
+    """Every research item in the state as ``(source, item)``, in synthesis section order."""
+    entries = []
+    for source in EVIDENCE_SOURCES:
+        key = SOURCE_SECTIONS[source][0]
+        entries.extend((source, item) for item in state.get(key) or [] if isinstance(item, dict))
+    return entries
+
+
+def _identity_keys(source: str, item: dict) -> List[str]:
+    keys = list(paper_ids(item))
+    # Local RAG excerpts of one file share its URL; only their content can make them duplicates
+    url = canonical_url(item.get("url")) if source != "local_rag" else None
+    if url:
+        keys.append(f"url:{url}")
+    if source in PAPER_SOURCES:
+        title = tokenize(item.get("title") or "")
+        if len(title) >= 4:
+            keys.append("title:" + " ".join(title))
+    return keys
+
+
+def merge_duplicates(entries: List[Tuple[str, dict]]) -> List[Tuple[str, dict]]:
+    """Collapse items that are the same document across (or within) sources.
+
+    Items match on canonical URL, DOI / arXiv id, normalized paper title or a
+    near-identical SimHash of their text. Each group keeps its longest item, in
+    its own source, with the other copies' titles and URLs under ``also_cited``
+    so no citation is lost.
+    """
+    keys = [_identity_keys(source, item) for source, item in entries]
+    fingerprints = [simhash(item_text(source, item)) for source, item in entries]
+    groups = duplicate_groups(keys, fingerprints, settings.dedup_simhash_distance)
+
+    merged = []
+    for group in sorted(groups, key=min):
+        if len(group) == 1:
+            merged.append(entries[group[0]])
+            continue
+        keep = max(group, key=lambda i: (len(item_text(*entries[i])), -i))
+        source, item = entries[keep]
+        seen = {canonical_url(item.get("url"))}
+        also_cited = list(item.get("also_cited") or [])
+        for i in sorted(group):
+            other_source, other = entries[i]
+            url = canonical_url(other.get("url"))
+            if i == keep or url in seen:
+                continue
+            seen.add(url)
+            also_cited.append({"source": other_source, "title": other.get("title"), "url": other.get("url")})
+        merged.append((source, {**item, "also_cited": also_cited} if also_cited else item))
+    return merged
+
+
+def rerank_items(source: str, items: List[dict], topic: str, queries: dict) -> List[dict]:
+    """``items`` ordered by relevance to ``topic`` (title plus item text)."""
+    texts = [f"{item.get('title') or ''}\n{item_text(source, item)}".strip() for item in items]
+    return [items[i] for i in reranker.rank(topic, texts, queries)]
+
+
+def refine_evidence_node(state: AgentState) -> dict:
+    """Clean the collected evidence between parallel_search and synthesis.
+
+    Duplicate items are merged, items of ``QUALITY_FILTER_SOURCES`` scoring
+    under ``QUALITY_MIN_SCORE`` are dropped, and each source's items are
+    reranked by relevance to the original topic so the strongest evidence
+    comes first in its section (and survives context truncation). Every
+    ``*_research`` list that changed is rewritten and the synthesis sections
+    parallel_search pre-formatted for those sources are rebuilt. Partial
+    summaries of sources that lost or merged items are dropped, so synthesis
+    uses the rebuilt section instead of a summary of the unrefined items
+    (reordering alone leaves a summary valid). Finally the session's evidence
+    index is built over the refined items.
+    """
+    started = time.monotonic()
+    entries = collect_evidence(state)
+    if not entries:
+        evidence_indexes.build(state)
+        return {}
+
+    refined = merge_duplicates(entries) if settings.evidence_dedup else entries
+
+    by_source: Dict[str, List[dict]] = {source: [] for source in EVIDENCE_SOURCES}
+    for source, item in refined:
+        by_source[source].append(item)
+
+    dropped = 0
+    for source in settings.quality_filter_sources:
+        if by_source.get(source):
+            # Keep the item objects themselves: unchanged sources are detected by identity below
+            items = by_source[source]
+            scores = score_content_quality_batch([item_content(item) for item in items])
+            kept = [item for item, score in zip(items, scores) if score >= settings.quality_min_score]
+            dropped += len(items) - len(kept)
+            by_source[source] = kept
+
+    reranked, rerank_started, rerank_backend = 0, time.perf_counter(), reranker.backend()
+    if settings.rerank_backend != "off":
+        topic = state.get("original_topic", state.get("topic", ""))
+        for source, items in by_source.items():
+            if len(items) > 1:
+                by_source[source] = rerank_items(source, items, topic, state.get("queries"))
+                reranked += len(items)
+    rerank_ms = (time.perf_counter() - rerank_started) * 1000
+
+    original = {source: [id(item) for s, item in entries if s == source] for source in EVIDENCE_SOURCES}
+    changed = [source for source in EVIDENCE_SOURCES
+               if [id(item) for item in by_source[source]] != original[source]]
+
+    update = {SOURCE_SECTIONS[source][0]: by_source[source] for source in changed}
+    chunks = state.get("context_chunks")
+    if chunks and changed:
+        terms = synthesis_terms(state)
+        chunks = dict(chunks)
+        for source in changed:
+            if source in chunks:
+                chunk = format_source_section(source, {SOURCE_SECTIONS[source][0]: by_source[source]}, terms)
+                if chunk:
+                    chunks[source] = chunk
+                else:
+                    chunks.pop(source)
+        update["context_chunks"] = chunks
+
+    partials = state.get("partial_summaries")
+    if partials:
+        stale = [source for source in changed if source in partials
+                 and sorted(id(item) for item in by_source[source]) != sorted(original[source])]
+        if stale:
+            update["partial_summaries"] = {s: summary for s, summary in partials.items() if s not in stale}
+
+    evidence_indexes.build({**state, **update})
+    logger.info(f"refine_evidence: {len(entries)} -> {len(refined) - dropped} items "
+                f"({len(entries) - len(refined)} merged, {dropped} below quality) "
+                f"in {(time.monotonic() - started) * 1000:.0f} ms (changed: {changed}); "
+                f"reranked {reranked} items in {rerank_ms:.0f} ms ({rerank_backend})")
+    return update
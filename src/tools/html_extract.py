@@ -0,0 +1,182 @@
+# src/tools/html_extract.py
+
+import codecs
+import logging
+import re
+import threading
+from html.parser import HTMLParser
+from typing import List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Subtrees that never hold article text
+SKIP_TAGS = {"script", "style", "noscript", "template", "svg", "iframe", "form", "button", "select",
+             "nav", "header", "footer", "aside", "menu"}
+# Elements that close a text block
+BLOCK_TAGS = {"p", "div", "section", "article", "main", "li", "pre", "blockquote", "td", "th", "dd", "dt",
+              "h1", "h2", "h3", "h4", "h5", "h6", "br", "tr", "figcaption", "summary"}
+HEADING_TAGS = {"h1", "h2", "h3", "h4", "h5", "h6"}
+# Page-level containers: class hints on these describe the layout, not boilerplate
+CONTAINER_TAGS = {"html", "body", "main", "article"}
+VOID_TAGS = {"br", "img", "hr", "meta", "link", "input", "source", "wbr", "area", "col", "embed", "base"}
+# Boilerplate class/id words (cookie banners, share bars, comment sections...); matched as whole
+# words of the class/id so "shared-content" or "commentary" are not mistaken for them
+BOILERPLATE_HINT = re.compile(r"\b(cookies?|consent|banners?|share|sharing|social|comments?|related|sidebar|promo|"
+                              r"newsletter|subscribe|breadcrumbs?|popup|modal|adverts?|advertisement|ads?)\b", re.I)
+
+MIN_BLOCK_CHARS = 40  # shorter non-heading blocks are usually navigation or captions
+MAX_LINK_DENSITY = 0.5  # blocks that are mostly link text are menus and link lists
+
+
+class MainTextParser(HTMLParser):
+    """Streaming boilerplate-removing HTML-to-text parser.
+
+    Text is grouped into blocks; a block is kept when it is a heading or long
+    enough and not mostly links, and nothing inside navigation, scripts or
+    elements whose class/id looks like boilerplate is read at all. Feed chunks
+    as they arrive and stop once ``done`` is set: parsing ends as soon as
+    ``limit`` characters of main text are collected.
+    """
+
+    def __init__(self, limit: int):
+        super().__init__(convert_charrefs=True)
+        self.limit = limit
+        self.blocks: List[str] = []
+        self.chars = 0
+        self.done = False
+        self._skip_depth = 0
+        self._stack: List[tuple] = []  # open elements as (tag, starts a skipped subtree, counted as a link)
+        self._text: List[str] = []
+        self._link_chars = 0
+        self._in_link = 0
+        self._heading = False
+
+    def handle_starttag(self, tag, attrs):
+        if tag in VOID_TAGS:
+            if tag == "br":
+                self._text.append(" ")
+            return
+        attrs = dict(attrs)
+        hint = f"{attrs.get('class') or ''} {attrs.get('id') or ''}".replace("_", " ")
+        skip = tag in SKIP_TAGS or attrs.get("aria-hidden") == "true" or "hidden" in attrs \
+            or (tag not in CONTAINER_TAGS and bool(BOILERPLATE_HINT.search(hint)))
+        if skip:
+            self._skip_depth += 1
+        link = tag == "a" and not self._skip_depth
+        self._stack.append((tag, skip, link))
+        if self._skip_depth:
+            return
+        if tag in BLOCK_TAGS:
+            self._flush()
+            self._heading = tag in HEADING_TAGS
+        elif link:
+            self._in_link += 1
+
+    def handle_endtag(self, tag):
+        if tag in VOID_TAGS or not any(open_tag == tag for open_tag, _, _ in self._stack):
+            return
+        # Real-world HTML leaves elements unclosed: close everything up to the matching tag,
+        # including links a parent closes implicitly
+        while True:
+            open_tag, skip, link = self._stack.pop()
+            if skip:
+                self._skip_depth -= 1
+            if link:
+                self._in_link -= 1
+            if open_tag == tag:
+                break
+        if not self._skip_depth and tag in BLOCK_TAGS:
+            self._flush()
+
+    def handle_data(self, data):
+        if self._skip_depth or self.done:
+            return
+        self._text.append(data)
+        if self._in_link:
+            self._link_chars += len(data.strip())
+
+    def close(self):
+        super().close()
+        self._flush()
+
+    def text(self) -> str:
+        return "\n\n".join(self.blocks)[:self.limit]
+
+    def _flush(self):
+        text = re.sub(r"\s+", " ", "".join(self._text)).strip()
+        link_chars, heading = self._link_chars, self._heading
+        self._text, self._link_chars, self._heading = [], 0, False
+        if not text or self.done:
+            return
+        if not heading and (len(text) < MIN_BLOCK_CHARS or link_chars / len(text) > MAX_LINK_DENSITY):
+            return
+        self.blocks.append(f"## {text}" if heading else text)
+        self.chars += len(text) + 2
+        if self.chars >= self.limit:
+            self.done = True
+
+
+def extract_main_text(html: str, limit: int = 5000) -> str:
+    """Main text of an HTML document (non-streaming convenience wrapper)."""
+    parser = MainTextParser(limit)
+    parser.feed(html)
+    parser.close()
+    return parser.text()
+
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_http_session():
+    """Process-wide ``requests.Session`` so page fetches reuse pooled connections."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+            from ..config import settings
+
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=32, pool_maxsize=settings.page_prefetch_workers + 5)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            session.headers["User-Agent"] = "Mozilla/5.0 (compatible; ResearchAgent/1.0)"
+            _session = session
+        return _session
+
+
+def fetch_main_text(url: str, limit: int, timeout: float, headers: Optional[dict] = None,
+                    max_bytes: int = 2_000_000):
+    """Fetch ``url`` directly and stream it through ``MainTextParser``.
+
+    Returns ``(status, text, response_headers)``; reading stops once ``limit``
+    characters of main text are collected (or after ``max_bytes``), and the
+    connection is released without downloading the rest of the page.
+    """
+    response = get_http_session().get(url, headers=headers or {}, timeout=timeout, stream=True)
+    try:
+        if response.status_code != 200:
+            return response.status_code, "", response.headers
+        content_type = response.headers.get("Content-Type", "")
+        if content_type and "html" not in content_type:
+            logger.debug(f"Local extractor skipped {url}: {content_type}")
+            return response.status_code, "", response.headers
+
+        parser = MainTextParser(limit)
+        received = 0
+        # Without an explicit charset requests assumes ISO-8859-1; the web is overwhelmingly UTF-8
+        encoding = response.encoding if "charset" in content_type.lower() else "utf-8"
+        try:
+            decoder = codecs.getincrementaldecoder(encoding or "utf-8")(errors="replace")
+        except LookupError:
+            decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        for chunk in response.iter_content(chunk_size=16384):
+            received += len(chunk)
+            parser.feed(decoder.decode(chunk))
+            if parser.done or received >= max_bytes:
+                break
+        parser.close()
+        return response.status_code, parser.text(), response.headers
+    finally:
+        response.close()
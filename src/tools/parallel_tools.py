@@ -1,27 +1,17 @@
 # src/tools/parallel_tools.py
 
-import json
 import logging
-import os
-import tempfile
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from ..state import AgentState
+from ..config import settings
+from ..events import publish_progress
+from ..cache import cached_source_call, get_cached_source_result
+from ..latency import latency_tracker, source_timeout
+from ..circuit_breaker import source_breakers
 
 logger = logging.getLogger(__name__)
 
-PARALLEL_STATUS_FILE = "/tmp/parallel_search_status.json"
-
-
-def _write_status(done: list, running: list, total: int):
-    try:
-        data = {"done": done, "running": running, "total": total}
-        tmp = PARALLEL_STATUS_FILE + ".tmp"
-        with open(tmp, "w") as f:
-            json.dump(data, f)
-        os.replace(tmp, PARALLEL_STATUS_FILE)
-    except Exception:
-        pass
-
 
 def _youtube_combined_node(state: AgentState) -> dict:
     """Run YouTube search + summarize sequentially (summarize depends on search)."""
@@ -36,6 +26,32 @@ def _youtube_combined_node(state: AgentState) -> dict:
     return combined
 
 
+def _timed(source_name: str, fn):
+    """Wrap a source node so every real (uncached) call feeds the latency tracker and circuit breaker."""
+    breaker = source_breakers.get(source_name)
+
+    def timed(state):
+        start = time.monotonic()
+        try:
+            result = fn(state)
+        except Exception:
+            breaker.record_failure("error")
+            raise
+        finally:
+            duration = time.monotonic() - start
+            latency_tracker.record(source_name, duration)
+
+        # Source nodes swallow their own timeouts and return empty lists; an empty
+        # answer that took the whole hard cap is a timeout, not "no results".
+        empty = not any(isinstance(v, list) and v for v in result.values())
+        if empty and duration >= 0.9 * source_timeout(source_name):
+            breaker.record_failure("timeout")
+        else:
+            breaker.record_success()
+        return result
+    return timed
+
+
 def parallel_search_node(state: AgentState) -> dict:
     """Execute all planned research sources in parallel."""
     from .research_tools import (
@@ -44,6 +60,7 @@ def parallel_search_node(state: AgentState) -> dict:
     )
     from .reddit_tools import search_reddit_node
     from .rag_tools import local_rag_node
+    from .synthesis_tools import format_source_section, summarize_source_section, synthesis_terms
 
     plan = state.get("research_plan", [])
 
@@ -71,42 +88,128 @@ def parallel_search_node(state: AgentState) -> dict:
     combined = {}
     futures_map = {}
     done_sources = []
-
-    _write_status(done=[], running=list(plan), total=len(plan))
-
-    with ThreadPoolExecutor(max_workers=len(plan) or 1) as executor:
+    timed_out = []
+    short_circuited = []
+
+    publish_progress(state, "parallel_search", done=[], running=list(plan), total=len(plan))
+
+    # Each source gets a deadline from its recent latency (capped by SOURCE_TIMEOUTS),
+    # and the whole fan-out is bounded by the run's search budget.
+    started = time.monotonic()
+    budget = state.get("search_budget") or settings.search_time_budget
+    deadlines = {}
+
+    # Results are turned into synthesis context as they arrive; with progressive
+    # synthesis each section is also map-summarized while slower sources are in flight.
+    topic = state.get("original_topic", state.get("topic", ""))
+    terms = synthesis_terms(state)
+    context_chunks = {}
+    summary_futures = {}
+    summarizer = ThreadPoolExecutor(max_workers=settings.partial_summary_workers) if settings.progressive_synthesis else None
+
+    executor = ThreadPoolExecutor(max_workers=len(plan) or 1)
+    try:
         for source_name in plan:
             fn = source_functions.get(source_name)
-            if fn:
-                future = executor.submit(fn, state)
+            # A cache hit makes no call, so it must not claim (and then never report) a half-open trial
+            cache_hit = None
+            if fn and source_name != "local_rag" and settings.source_cache_enabled:
+                cache_hit = get_cached_source_result(source_name, state)
+            if cache_hit:
+                future = executor.submit(lambda result=cache_hit: result)
                 futures_map[future] = source_name
+                deadlines[future] = budget
+            elif fn and source_name != "local_rag" and not source_breakers.get(source_name).allow():
+                # Circuit open: answer from the cache (or not at all) instead of waiting on a sick source
+                cached = get_cached_source_result(source_name, state)
+                if cached:
+                    combined.update(cached)
+                    chunk = format_source_section(source_name, cached, terms)
+                    if chunk:
+                        context_chunks[source_name] = chunk
+                short_circuited.append(source_name)
+                done_sources.append(source_name)
+                logger.warning(f"Source '{source_name}' short-circuited (circuit open); "
+                               f"{'using cached results' if cached else 'skipping'}")
+            elif fn:
+                timed_fn = _timed(source_name, fn)
+                if source_name == "local_rag":
+                    future = executor.submit(timed_fn, state)  # local files change; never cached
+                else:
+                    future = executor.submit(cached_source_call, source_name, timed_fn, state)
+                futures_map[future] = source_name
+                deadlines[future] = min(latency_tracker.deadline(source_name), budget)
             else:
                 logger.warning(f"Unknown source in plan: {source_name}")
 
-        from concurrent.futures import TimeoutError as FutureTimeoutError
-        try:
-            for future in as_completed(futures_map, timeout=60):
+        if short_circuited:
+            publish_progress(state, "parallel_search", done=list(done_sources),
+                             running=[s for s in plan if s not in done_sources], total=len(plan),
+                             timed_out=list(timed_out), short_circuited=list(short_circuited))
+
+        pending = set(futures_map)
+        while pending:
+            elapsed = time.monotonic() - started
+            expired = [f for f in pending if elapsed >= deadlines[f]]
+            for future in expired:
+                source_name = futures_map[future]
+                pending.discard(future)
+                timed_out.append(source_name)
+                logger.warning(f"Source '{source_name}' missed its {deadlines[future]:.1f}s deadline, returning without it")
+            if expired:
+                done_sources.extend(futures_map[f] for f in expired)
+                running = [s for s in plan if s not in done_sources]
+                publish_progress(state, "parallel_search", done=list(done_sources), running=running,
+                                 total=len(plan), timed_out=list(timed_out))
+            if not pending:
+                break
+
+            next_deadline = min(deadlines[f] for f in pending)
+            finished, pending = wait(pending, timeout=max(next_deadline - elapsed, 0), return_when=FIRST_COMPLETED)
+            for future in finished:
                 source_name = futures_map[future]
                 try:
                     result = future.result()
                     combined.update(result)
                     logger.info(f"Source '{source_name}' completed successfully")
+                    chunk = format_source_section(source_name, result, terms)
+                    if chunk:
+                        context_chunks[source_name] = chunk
+                        if summarizer:
+                            summary_futures[source_name] = summarizer.submit(
+                                summarize_source_section, topic, chunk, state.get("llm_model"))
                 except Exception as e:
                     logger.error(f"Source '{source_name}' failed: {e}")
                 finally:
                     done_sources.append(source_name)
                     running = [s for s in plan if s not in done_sources]
-                    _write_status(done=done_sources, running=running, total=len(plan))
-        except FutureTimeoutError:
-            for future, source_name in futures_map.items():
-                if not future.done():
-                    logger.warning(f"Source '{source_name}' timed out after 60s, skipping")
-
-    # Cleanup status file
-    try:
-        os.remove(PARALLEL_STATUS_FILE)
-    except Exception:
-        pass
+                    publish_progress(state, "parallel_search", done=list(done_sources), running=running,
+                                     total=len(plan), timed_out=list(timed_out))
+    finally:
+        # Don't wait for stragglers: their threads finish in the background and are ignored
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    if timed_out:
+        logger.info(f"Parallel search returned partial results after {time.monotonic() - started:.1f}s; "
+                    f"missing: {timed_out}")
+
+    partial_summaries = {}
+    if summarizer:
+        # Summaries already running are worth waiting for; queued ones are dropped and
+        # their sources go to synthesis as raw chunks instead.
+        summarizer.shutdown(wait=True, cancel_futures=True)
+        for source_name, future in summary_futures.items():
+            if future.cancelled():
+                continue
+            try:
+                partial_summaries[source_name] = future.result()
+            except Exception as e:
+                logger.warning(f"Partial summary for '{source_name}' failed: {e}")
+        logger.info(f"Progressive synthesis summarized {len(partial_summaries)}/{len(context_chunks)} sources during search")
+
+    # Always returned (even empty) so sections from a previous iteration never leak into this one
+    combined["context_chunks"] = context_chunks
+    combined["partial_summaries"] = partial_summaries
 
     combined["next_node"] = "END"
     logger.info(f"Parallel search completed. Keys: {list(combined.keys())}")
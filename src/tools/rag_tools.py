@@ -2,8 +2,8 @@
 
 import os
 import logging
-import pypdf
 from ..state import AgentState
+from ..events import publish_progress
 from .router_tools import update_next_node
 
 logger = logging.getLogger(__name__)
@@ -78,6 +78,7 @@ def local_rag_node(state: AgentState) -> dict:
             # Cache Miss - Process File
             try:
                 if filename.lower().endswith(".pdf"):
+                    import pypdf
                     with open(file_path, "rb") as f:
                         reader = pypdf.PdfReader(f)
                         # Limit pages to avoid huge delays on massive books
@@ -121,16 +122,9 @@ def local_rag_node(state: AgentState) -> dict:
                 }
         return None
 
-    # Status Reporting
-    STATUS_FILE = "/app/data/rag_status.json"
+    # Status Reporting (in-process progress bus, scoped to this session)
     def update_status(current, total, filename):
-        try:
-            temp_file = STATUS_FILE + ".tmp"
-            with open(temp_file, "w") as f:
-                json.dump({"current": current, "total": total, "last_file": filename}, f)
-            os.replace(temp_file, STATUS_FILE)
-        except Exception as e: 
-            logger.warning(f"Status update failed: {e}")
+        publish_progress(state, "rag", current=current, total=total, last_file=filename)
 
     # Use ThreadPoolExecutor
     processed_count = 0
@@ -163,12 +157,6 @@ def local_rag_node(state: AgentState) -> dict:
             except Exception as e:
                 logger.error(f"Error processing {fname}: {e}")
                 
-    # Final cleanup of status
-    if os.path.exists(STATUS_FILE):
-        try:
-            os.remove(STATUS_FILE)
-        except: pass
-
     # Save Cache...
     if cache_dirty:
         try:
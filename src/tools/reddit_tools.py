@@ -2,10 +2,12 @@ import os
 import logging
 from ..state import AgentState
 from .router_tools import update_next_node
+from ..singleflight import single_flight
 
 logger = logging.getLogger(__name__)
 
 
+@single_flight("reddit")
 def search_reddit_node(state: AgentState) -> dict:
     """Search Reddit for community discussions and opinions."""
     logger.info("Starting Reddit search...")
@@ -35,27 +37,19 @@ def search_reddit_node(state: AgentState) -> dict:
         container = {"data": []}
         def run_reddit_search():
             if tavily_key:
-                from tavily import TavilyClient
-                tavily = TavilyClient(api_key=tavily_key)
+                from .web_content import tavily_search
 
                 # Phase 7: Support for temporal filtering in Reddit
                 time_range = state.get("time_range", None)
                 if state.get("persona") == "news_editor" and not time_range:
                     time_range = "d"
 
-                search_params = {
-                    "query": f"{search_topic} site:reddit.com",
-                    "search_depth": "advanced",
-                    "max_results": max_results
-                }
+                search_params = {"search_depth": "advanced"}
                 if time_range:
                     search_params["time_range"] = time_range
 
-                search_result = tavily.search(**search_params)
-                tavily_results = search_result.get("results", [])
-
-                # Re-format for the node
-                container["data"] = [{"content": r.get("content"), "url": r.get("url"), "title": r.get("title")} for r in tavily_results]
+                # Thread text comes back with the hits (shared client, one round-trip)
+                container["data"] = tavily_search(tavily_key, f"{search_topic} site:reddit.com", max_results, **search_params)
             else:
                 # Fallback to DuckDuckGo
                 from langchain_community.tools import DuckDuckGoSearchRun
@@ -65,7 +59,8 @@ def search_reddit_node(state: AgentState) -> dict:
 
         thread = threading.Thread(target=run_reddit_search)
         thread.start()
-        thread.join(timeout=15) # 15 seconds timeout
+        from ..latency import source_timeout
+        thread.join(timeout=source_timeout("reddit"))
         if thread.is_alive():
             logger.warning("Reddit search timed out.")
         else:
@@ -3,16 +3,11 @@
 import os
 import re
 import html as _html
-import smtplib
 import logging
-from email.mime.multipart import MIMEMultipart
-from email.mime.text import MIMEText
-from email.mime.base import MIMEBase
-from email import encoders
-import markdown
-from fpdf import FPDF
 import hashlib
-from docx import Document
+
+# Export backends (markdown, fpdf, docx, smtplib) are imported inside the
+# functions that use them, so importing the graph doesn't pay for them.
 
 logger = logging.getLogger(__name__)
 
@@ -26,6 +21,15 @@ def sanitize_text(text):
     return text.encode('utf-8', 'replace').decode('utf-8')
 
 
+def get_reports_dir(state: AgentState) -> str:
+    """Reports of a scheduled session go to their own folder so concurrent runs don't overwrite each other."""
+    from ..config import settings
+    session_id = state.get("session_id")
+    if session_id:
+        return os.path.join(settings.reports_dir, session_id)
+    return settings.reports_dir
+
+
 def html_to_markdown(text: str) -> str:
     """Convert common HTML tags to Markdown so PDF/DOCX generators don't show raw tags.
 
@@ -313,6 +317,7 @@ def generate_report_node(state: AgentState) -> dict:
             processed_lines.append(new_line)
 
         processed_summary = "\n".join(processed_lines)
+        import markdown
         synthesis_html = markdown.markdown(processed_summary)
 
         html_content += f"""
@@ -571,15 +576,7 @@ def generate_report_node(state: AgentState) -> dict:
     markdown_text = sanitize_text(markdown_text)
 
     # Ensure reports directory exists
-    reports_dir = "reports"
-    if not os.path.exists(reports_dir):
-        os.makedirs(reports_dir)
-
-    # Sanitize markdown
-    markdown_text = sanitize_text(markdown_text)
-
-    # Ensure reports directory exists
-    reports_dir = "reports"
+    reports_dir = get_reports_dir(state)
     if not os.path.exists(reports_dir):
         os.makedirs(reports_dir)
 
@@ -633,6 +630,7 @@ def generate_report_node(state: AgentState) -> dict:
         "report": html_content,
         "bibliography": bibliography,
         "pdf_path": pdf_path,
+        "html_path": report_path,
         "md_path": md_path,
         "docx_path": docx_path
     }
@@ -640,6 +638,8 @@ def generate_report_node(state: AgentState) -> dict:
 
 def generate_docx(state: AgentState, topic: str, output_path: str, bibliography: list):
     """Genera un archivo Word (.docx) profesional, parseando Markdown básico."""
+    from docx import Document
+
     doc = Document()
     doc.add_heading(f'Informe de Investigación: {topic}', 0)
 
@@ -698,6 +698,8 @@ def _strip_md_inline(text: str) -> str:
 
 def generate_pdf(state: AgentState, topic: str, output_path: str, bibliography_list: list = None):
     """Genera un archivo PDF profesional usando fpdf2 con todas las secciones."""
+    from fpdf import FPDF
+
     pdf = FPDF()
     pdf.set_auto_page_break(auto=True, margin=15)
     pdf.add_page()
@@ -823,6 +825,12 @@ def send_email_node(state: AgentState) -> dict:
         logger.error("email_credentials_missing")
         return {}
 
+    import smtplib
+    from email import encoders
+    from email.mime.base import MIMEBase
+    from email.mime.multipart import MIMEMultipart
+    from email.mime.text import MIMEText
+
     # Creación del objeto del mensaje de correo.
     msg = MIMEMultipart()
     msg['From'] = sender_email
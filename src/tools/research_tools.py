@@ -1,20 +1,21 @@
 # src/tools/research_tools.py
 
 import os
+import itertools
 import logging
-from github import Github  # noqa: F401 — needed for test mocking
-from langchain_community.document_loaders import WikipediaLoader
-import arxiv
-from semanticscholar import SemanticScholar
 import re
 import datetime
 from ..state import AgentState
 from ..utils import get_max_results
+from ..latency import source_timeout
+from ..rate_limit import RateLimitExceeded, api_limiters, sync_github_rate_limit
+from ..singleflight import single_flight
 from .router_tools import update_next_node
 
 logger = logging.getLogger(__name__)
 
 
+@single_flight("web")
 def search_web_node(state: AgentState) -> dict:
     """Search the web using Tavily (if API key available) or DuckDuckGo."""
     logger.info("Starting web search...")
@@ -49,52 +50,18 @@ def search_web_node(state: AgentState) -> dict:
     logger.info(f"Searching web (Tavily) for: {search_topic}")
     
     import threading
-    from concurrent.futures import ThreadPoolExecutor
-    import requests
 
     container = {"data": []}
     def run_web_search():
         try:
             if tavily_key:
                 logger.debug(f"Using Tavily for web search with query: {search_topic}")
-                from langchain_community.tools.tavily_search import TavilySearchResults
-                search = TavilySearchResults(k=max_results)
+                # One request: Tavily returns page content with the hits; only empty ones are fetched separately
+                from .web_content import tavily_search
                 try:
-                    raw_results = search.run(search_topic)
-                    # CRITICAL FIX: Ensure raw_results is a list. Tavily can return a string on error.
-                    if isinstance(raw_results, str):
-                        logger.warning(f"Tavily returned string instead of list: {raw_results}")
-                        # If it looks like a list string, try to parse it, otherwise handle as error/content
-                        import ast
-                        try:
-                            raw_results = ast.literal_eval(raw_results)
-                            if not isinstance(raw_results, list):
-                                raise ValueError
-                        except:
-                            raw_results = [{"url": "Unknown", "content": raw_results}]
+                    container["data"] = tavily_search(tavily_key, search_topic, max_results)
                 except Exception as e_tavily:
-                     logger.error(f"Tavily search execution failed: {e_tavily}")
-                     raw_results = []
-                
-                # Use ThreadPoolExecutor to parallelize Jina Reader calls
-                def enhance_result(res):
-                    if isinstance(res, str): # Defensive check for unexpected string results
-                         return {"url": "Unknown", "content": res}
-                    
-                    url = res.get("url")
-                    if url and url.startswith("http"):
-                        try:
-                            from ..config import settings
-                            jina_url = f"https://r.jina.ai/{url}"
-                            jina_res = requests.get(jina_url, timeout=settings.content_fetch_timeout)
-                            if jina_res.status_code == 200:
-                                res["content"] = jina_res.text[:settings.max_content_preview_chars]
-                        except Exception:
-                            pass
-                    return res
-
-                with ThreadPoolExecutor(max_workers=5) as executor:
-                    container["data"] = list(executor.map(enhance_result, raw_results))
+                    logger.error(f"Tavily search execution failed: {e_tavily}")
             else:
                 logger.debug(f"No TAVILY_API_KEY detected. Using DuckDuckGo with query: {search_topic}")
                 from langchain_community.tools import DuckDuckGoSearchRun
@@ -118,6 +85,7 @@ def search_web_node(state: AgentState) -> dict:
     return {"web_research": results, "next_node": update_next_node(state, "web"), "source_metadata": {"web": {"source_type": "web", "reliability": 3}}}
 
 
+@single_flight("wiki")
 def search_wiki_node(state: AgentState) -> dict:
     """Search Wikipedia for general context."""
     from ..progress import update_progress
@@ -141,6 +109,7 @@ def search_wiki_node(state: AgentState) -> dict:
 
         max_docs = 1 if state.get("research_depth") != "deep" else 3
         logger.info(f"Searching Wikipedia ({lang}) with query: {search_topic}...")
+        from langchain_community.document_loaders import WikipediaLoader
         loader = WikipediaLoader(query=search_topic, load_max_docs=max_docs, lang=lang)
         # WikipediaLoader doesn't have a direct timeout, but we can wrap the load
         import threading
@@ -156,7 +125,7 @@ def search_wiki_node(state: AgentState) -> dict:
 
         thread = threading.Thread(target=load_with_timeout)
         thread.start()
-        thread.join(timeout=10) # 10 seconds timeout
+        thread.join(timeout=source_timeout("wiki"))
         if thread.is_alive():
             logger.warning("Wikipedia search timed out.")
         else:
@@ -186,6 +155,7 @@ def translate_to_english(text: str) -> str:
         return text
 
 
+@single_flight("arxiv")
 def search_arxiv_node(state: AgentState) -> dict:
     """Busca artículos científicos en arXiv usando la librería arxiv directamente."""
     logger.info("arxiv_search_started")
@@ -196,6 +166,7 @@ def search_arxiv_node(state: AgentState) -> dict:
     results = []
 
     import threading
+    import arxiv
     container = {"data": []}
     def run_arxiv_search():
         max_results = get_max_results(state)
@@ -223,7 +194,7 @@ def search_arxiv_node(state: AgentState) -> dict:
 
     thread = threading.Thread(target=run_arxiv_search)
     thread.start()
-    thread.join(timeout=12) # 12s timeout
+    thread.join(timeout=source_timeout("arxiv"))
 
     if thread.is_alive():
         logger.warning("ArXiv search timed out. Moving on with partial or empty results.")
@@ -235,44 +206,62 @@ def search_arxiv_node(state: AgentState) -> dict:
     return {"arxiv_research": results, "next_node": update_next_node(state, "arxiv"), "source_metadata": {"arxiv": {"source_type": "scientific", "reliability": 5}}}
 
 
+@single_flight("scholar")
 def search_scholar_node(state: AgentState) -> dict:
     """Busca artículos académicos en Semantic Scholar usando la librería directamente."""
     logger.info("scholar_search_started")
     topic = state["topic"]
     results = []
 
-    sch = SemanticScholar()
+    from semanticscholar import SemanticScholar
+    # No library retries: it would sleep through 429s for minutes instead of letting the limiter back off
+    sch = SemanticScholar(retry=False)
+    limiter = api_limiters.get("scholar")
     max_results = get_max_results(state)
     queries = state.get("queries", {})
     search_topic = queries.get("en", topic)
 
     import threading
-    container = {"data": []}
+    container = {"data": [], "error": None}
     def run_scholar_search():
         try:
-            search_results = sch.search_paper(search_topic, limit=max_results, fields=['title', 'abstract', 'url', 'year', 'authors'])
+            def first_page():
+                # islice stops before the paginator would request another page
+                papers = sch.search_paper(search_topic, limit=max_results, fields=['title', 'abstract', 'url', 'year', 'authors', 'externalIds'])
+                return list(itertools.islice(papers, max_results))
+
+            search_results = limiter.call(first_page, session_id=state.get("session_id"), key=f"{search_topic}|{max_results}")
             count = 0
             for paper in search_results:
                 if count >= max_results:
                     break
                 authors_list = [author['name'] for author in paper.authors] if paper.authors else []
+                # DOI / arXiv id let refine_evidence match the paper against arXiv and web hits
+                external_ids = paper.externalIds if isinstance(paper.externalIds, dict) else {}
                 container["data"].append({
                     "title": paper.title,
                     "content": paper.abstract if paper.abstract else "Sin resumen disponible.",
                     "url": paper.url,
                     "authors": ", ".join(authors_list) if authors_list else "Autor desconocido",
-                    "year": paper.year
+                    "year": paper.year,
+                    "doi": external_ids.get("DOI"),
+                    "arxiv_id": external_ids.get("ArXiv"),
                 })
                 count += 1
+        except RateLimitExceeded as e_rate:
+            container["error"] = e_rate
         except Exception as e_sch:
             logger.error(f"SemanticScholar API error: {e_sch}")
 
     thread = threading.Thread(target=run_scholar_search)
     thread.start()
-    thread.join(timeout=25) # 25 seconds hard timeout for Scholar
+    thread.join(timeout=source_timeout("scholar"))
 
     if thread.is_alive():
         logger.warning("Semantic Scholar search timed out. Proceeding with collected results so far.")
+    elif container["error"]:
+        # Throttled is a failure, not "no papers": keep it out of the cache and visible to the breaker
+        raise container["error"]
     else:
         results = container["data"]
 
@@ -280,85 +269,193 @@ def search_scholar_node(state: AgentState) -> dict:
     return {"scholar_research": results, "next_node": update_next_node(state, "scholar"), "source_metadata": {"scholar": {"source_type": "scientific", "reliability": 5}}}
 
 
+GITHUB_GRAPHQL_URL = "https://api.github.com/graphql"
+README_PERSONAS = ("tech", "pm", "arquitecto", "architect")
+
+# Search hits plus description, stars and README in one round-trip. The README
+# is looked up under its usual names; @include skips it for personas that don't need it.
+_GITHUB_SEARCH_QUERY = """
+query($q: String!, $n: Int!, $readme: Boolean!) {
+  search(query: $q, type: REPOSITORY, first: $n) {
+    nodes {
+      ... on Repository {
+        nameWithOwner
+        description
+        url
+        stargazerCount
+        readmeMd: object(expression: "HEAD:README.md") @include(if: $readme) { ... on Blob { text } }
+        readmeLower: object(expression: "HEAD:readme.md") @include(if: $readme) { ... on Blob { text } }
+        readmeRst: object(expression: "HEAD:README.rst") @include(if: $readme) { ... on Blob { text } }
+        readmePlain: object(expression: "HEAD:README") @include(if: $readme) { ... on Blob { text } }
+      }
+    }
+  }
+  rateLimit { remaining resetAt }
+}
+"""
+
+
+def _github_graphql_repos(topic: str, max_results: int, with_readme: bool, token: str, session_id=None) -> list:
+    """Search repositories (and their READMEs) with one GraphQL request per query."""
+    import requests
+    limiter = api_limiters.get("github_graphql")
+
+    def post(query):
+        response = requests.post(
+            GITHUB_GRAPHQL_URL,
+            json={"query": _GITHUB_SEARCH_QUERY, "variables": {"q": query, "n": max_results, "readme": with_readme}},
+            headers={"Authorization": f"bearer {token}"},
+            timeout=source_timeout("github"),
+        )
+        if response.status_code in (403, 429):
+            # Secondary rate limits come back as 403 with the reason in the body
+            raise requests.HTTPError(f"{response.status_code} {response.text[:200]}", response=response)
+        response.raise_for_status()
+        payload = response.json()
+        errors = payload.get("errors") or []
+        if any(err.get("type") == "RATE_LIMITED" for err in errors):
+            raise RuntimeError("GitHub GraphQL: too many requests (RATE_LIMITED)")
+        if not (payload.get("data") or {}).get("search"):
+            raise RuntimeError(f"GitHub GraphQL error: {errors}")
+        return payload["data"]
+
+    def search(query):
+        data = limiter.call(post, query, session_id=session_id)
+        rate = data.get("rateLimit") or {}
+        if rate.get("resetAt"):
+            reset_at = datetime.datetime.fromisoformat(rate["resetAt"].replace("Z", "+00:00")).timestamp()
+            limiter.update(remaining=rate.get("remaining"), reset_at=reset_at)
+        return [node for node in data["search"]["nodes"] if node]
+
+    logger.info(f"github_python_search topic={topic} backend=graphql")
+    nodes = search(f"{topic} language:python sort:stars")
+    if not nodes:
+        logger.info("github_fallback_to_global_search")
+        nodes = search(f"{topic} sort:stars")
+
+    results = []
+    for node in nodes[:max_results]:
+        repo_data = {
+            "name": node["nameWithOwner"],
+            "description": node.get("description"),
+            "url": node["url"],
+            "stars": node.get("stargazerCount"),
+        }
+        if with_readme:
+            readme = next((blob["text"] for alias in ("readmeMd", "readmeLower", "readmeRst", "readmePlain")
+                           if (blob := node.get(alias)) and blob.get("text")), None)
+            repo_data["content"] = readme[:1500] if readme else "README no disponible."
+        else:
+            repo_data["content"] = node.get("description") or "No description."
+        results.append(repo_data)
+    return results
+
+
+def _github_rest_repos(topic: str, max_results: int, with_readme: bool, token=None, session_id=None) -> list:
+    """REST fallback: one search request, then one README request per repository."""
+    from github import Github
+    from concurrent.futures import ThreadPoolExecutor
+
+    g = Github(token) if token else Github()  # Public access without a token
+    search_limiter = api_limiters.get("github_search")
+    core_limiter = api_limiters.get("github_core")
+
+    def limited(limiter, fn, key=None):
+        # PyGithub pages lazily: whatever triggers the HTTP request goes through the limiter
+        def run():
+            try:
+                return fn()
+            finally:
+                sync_github_rate_limit(limiter, g)
+        return limiter.call(run, session_id=session_id, key=key)
+
+    def first_page(query):
+        # Reading the first page directly avoids the extra request totalCount costs
+        repositories = g.search_repositories(query=query, sort="stars", order="desc")
+        return limited(search_limiter, lambda: list(itertools.islice(repositories, max_results)))
+
+    # Intento 1: Búsqueda específica en Python
+    logger.info(f"github_python_search topic={topic} backend=rest")
+    repo_list = first_page(f"{topic} language:python")
+    if not repo_list:
+        logger.info("github_fallback_to_global_search")
+        repo_list = first_page(topic)
+
+    def fetch_repo_content(repo):
+        repo_data = {
+            "name": repo.full_name,
+            "description": repo.description,
+            "url": repo.html_url,
+            "stars": repo.stargazers_count
+        }
+        if with_readme:
+            try:
+                readme = limited(core_limiter, lambda: repo.get_readme().decoded_content.decode('utf-8'),
+                                 key=f"readme:{repo.full_name}")
+                repo_data["content"] = readme[:1500]
+            except Exception as e:
+                logger.debug(f"README not available for {repo.full_name}: {e}")
+                repo_data["content"] = "README no disponible."
+        else:
+            repo_data["content"] = repo.description or "No description."
+        return repo_data
+
+    # Parallel fetch READMEs
+    with ThreadPoolExecutor(max_workers=5) as executor:
+        return list(executor.map(fetch_repo_content, repo_list))
+
+
+@single_flight("github")
 def search_github_node(state: AgentState) -> dict:
-    """Busca repositorios relevantes en GitHub. Intenta búsqueda amplia si la específica falla."""
+    """Busca repositorios relevantes en GitHub. Intenta búsqueda amplia si la específica falla.
+
+    Con GITHUB_TOKEN usa GraphQL (búsqueda + READMEs en una sola petición); sin token,
+    o si GraphQL falla, recurre a la API REST.
+    """
     logger.info("github_search_started")
     queries = state.get("queries", {})
     topic = queries.get("en", state["topic"])
     results = []
 
     token = os.getenv("GITHUB_TOKEN")
-    try:
-        from github import Github
-        if token:
-            g = Github(token)
-        else:
-            g = Github() # Public access
-            
-        max_results = get_max_results(state) # Get it here to be safe in closure
-        import threading
-        container = {"data": []}
-        def run_github_search():
-            try:
-                # Intento 1: Búsqueda específica en Python
-                logger.info(f"github_python_search topic={topic}")
-                repositories = g.search_repositories(query=f"{topic} language:python", sort="stars", order="desc")
-
-                # Comprobar si hay resultados usando totalCount
-                if repositories.totalCount == 0:
-                    logger.info("github_fallback_to_global_search")
-                    repositories = g.search_repositories(query=topic, sort="stars", order="desc")
-
-                from concurrent.futures import ThreadPoolExecutor
-
-                def fetch_repo_content(repo):
-                    repo_data = {
-                        "name": repo.full_name,
-                        "description": repo.description,
-                        "url": repo.html_url,
-                        "stars": repo.stargazers_count
-                    }
-                    persona = state.get("persona", "general")
-                    if persona in ["tech", "pm", "arquitecto", "architect"]:
-                        try:
-                            readme = repo.get_readme().decoded_content.decode('utf-8')
-                            repo_data["content"] = readme[:1500]
-                        except Exception as e:
-                            logger.debug(f"README not available for {repo.full_name}: {e}")
-                            repo_data["content"] = "README no disponible."
-                    else:
-                        repo_data["content"] = repo.description or "No description."
-                    return repo_data
-
-                # Fetch repositories list
-                repo_list = []
-                for i, repo in enumerate(repositories):
-                    if i >= max_results:
-                        break
-                    repo_list.append(repo)
-
-                # Parallel fetch READMEs
-                with ThreadPoolExecutor(max_workers=5) as executor:
-                    container["data"] = list(executor.map(fetch_repo_content, repo_list))
-
-            except Exception as e_inner:
-                logger.error(f"GitHub inner search failed: {e_inner}")
+    max_results = get_max_results(state)
+    with_readme = state.get("persona", "general") in README_PERSONAS
+    session_id = state.get("session_id")
 
-        thread = threading.Thread(target=run_github_search)
-        thread.start()
-        thread.join(timeout=20) # 20 seconds for GitHub
-        if thread.is_alive():
-            logger.warning("GitHub search timed out.")
-        else:
-            results = container["data"]
+    import threading
+    container = {"data": [], "error": None}
+    def run_github_search():
+        try:
+            if token:
+                # GraphQL requires authentication
+                try:
+                    container["data"] = _github_graphql_repos(topic, max_results, with_readme, token, session_id)
+                    return
+                except RateLimitExceeded:
+                    raise
+                except Exception as e_gql:
+                    logger.warning(f"GitHub GraphQL search failed, falling back to REST: {e_gql}")
+            container["data"] = _github_rest_repos(topic, max_results, with_readme, token, session_id)
+        except RateLimitExceeded as e_rate:
+            container["error"] = e_rate
+        except Exception as e_inner:
+            logger.error(f"GitHub inner search failed: {e_inner}")
 
-        logger.info(f"github_search_completed results_count={len(results)}")
-    except Exception as e:
-        logger.warning("github_search_failed", exc_info=e)
+    thread = threading.Thread(target=run_github_search)
+    thread.start()
+    thread.join(timeout=source_timeout("github"))
+    if thread.is_alive():
+        logger.warning("GitHub search timed out.")
+    elif container["error"]:
+        raise container["error"]
+    else:
+        results = container["data"]
 
+    logger.info(f"github_search_completed results_count={len(results)}")
     return {"github_research": results, "next_node": update_next_node(state, "github"), "source_metadata": {"github": {"source_type": "tech", "reliability": 4}}}
 
 
+@single_flight("hn")
 def search_hn_node(state: AgentState) -> dict:
     """Busca discusiones relevantes en Hacker News."""
     logger.info("hn_search_started")
@@ -377,7 +474,7 @@ def search_hn_node(state: AgentState) -> dict:
         # usaremos una búsqueda vía API de Algolia rápida.
         import requests
         search_api = f"https://hn.algolia.com/api/v1/search?query={query}&tags=story"
-        response = requests.get(search_api, timeout=10)
+        response = requests.get(search_api, timeout=source_timeout("hn"))
         data = response.json()
 
         max_results = get_max_results(state)
@@ -399,6 +496,7 @@ def search_hn_node(state: AgentState) -> dict:
     return {"hn_research": results, "next_node": update_next_node(state, "hn"), "source_metadata": {"hn": {"source_type": "tech_community", "reliability": 4}}}
 
 
+@single_flight("so")
 def search_so_node(state: AgentState) -> dict:
     """Busca preguntas técnicas en Stack Overflow."""
     logger.info("stackoverflow_search_started")
@@ -409,13 +507,19 @@ def search_so_node(state: AgentState) -> dict:
     try:
         from stackapi import StackAPI
         SITE = StackAPI('stackoverflow')
+        limiter = api_limiters.get("stackexchange")
 
         import threading
-        container = {"data": []}
+        container = {"data": [], "error": None}
         def run_so_search():
             try:
                 # Buscamos preguntas relacionadas con el tema
-                questions = SITE.fetch('search/advanced', q=search_topic, sort='relevance', order='desc', filter='withbody')
+                questions = limiter.call(
+                    SITE.fetch, 'search/advanced', q=search_topic, sort='relevance', order='desc', filter='withbody',
+                    session_id=state.get("session_id"), key=search_topic,
+                )
+                # StackExchange reports quota and back-off in the body, not in headers
+                limiter.update(remaining=questions.get('quota_remaining'), retry_after=questions.get('backoff'))
 
                 max_results = get_max_results(state)
                 for i, item in enumerate(questions.get('items', [])):
@@ -438,18 +542,24 @@ def search_so_node(state: AgentState) -> dict:
                         "tags": ", ".join(item.get('tags', [])),
                         "content": content
                     })
+            except RateLimitExceeded as e_rate:
+                container["error"] = e_rate
             except Exception as e_inner:
                 logger.error(f"StackOverflow inner search failed: {e_inner}")
 
         thread = threading.Thread(target=run_so_search)
         thread.start()
-        thread.join(timeout=15) # 15 seconds for SO
+        thread.join(timeout=source_timeout("so"))
         if thread.is_alive():
             logger.warning("Stack Overflow search timed out.")
+        elif container["error"]:
+            raise container["error"]
         else:
             results = container["data"]
 
         logger.info(f"stackoverflow_search_completed results_count={len(results)}")
+    except RateLimitExceeded:
+        raise
     except Exception as e:
         logger.warning("stackoverflow_search_failed", exc_info=e)
 
@@ -26,13 +26,25 @@ def plan_research_node(state: AgentState) -> dict:
     logger.info("Planning research strategy...")
     topic = state["topic"]
 
+    # Sources whose circuit breaker is open are skipped entirely until their cooldown ends
+    from ..circuit_breaker import source_breakers
+    unavailable = source_breakers.unavailable()
+    if unavailable:
+        logger.warning(f"Sources currently unavailable, excluded from the plan: {unavailable}")
+
+    def available(sources):
+        kept = [s for s in sources if s not in unavailable]
+        # Never plan nothing: if every source is down, let parallel_search serve what the cache has
+        return kept or list(sources)
+
     # If a research plan is already provided (e.g., from the GUI), keep it
     # BUT if we are in a re-planning loop (iteration > 0), we want the LLM to DECIDE new sources
     if state.get("research_plan") and state.get("iteration_count", 0) == 0:
         logger.info("Using existing research plan provided in state.")
+        plan = available(state["research_plan"])
         return {
-            "research_plan": state["research_plan"],
-            "next_node": state.get("next_node", state["research_plan"][0]),
+            "research_plan": plan,
+            "next_node": state.get("next_node", plan[0]),
             "iteration_count": 0
         }
 
@@ -71,6 +83,9 @@ def plan_research_node(state: AgentState) -> dict:
         if os.path.exists(kb_path) and any(f for f in os.listdir(kb_path) if not f.startswith('.')):
             has_local_files = True
             prompt += "\n    - local_rag: Para consultar la base de conocimientos local y archivos proporcionados por el usuario."
+
+    if unavailable:
+        prompt += f"\n\n    FUENTES NO DISPONIBLES AHORA (no las selecciones): {', '.join(unavailable)}"
     
     prompt += """
     
@@ -86,7 +101,7 @@ def plan_research_node(state: AgentState) -> dict:
     LISTA DE FUENTES SELECCIONADAS:
     """
     
-    llm = get_llm(temperature=0.1)
+    llm = get_llm(temperature=0.1, model=state.get("llm_model"))
     
     try:
         response = llm.invoke([HumanMessage(content=prompt)])
@@ -104,10 +119,12 @@ def plan_research_node(state: AgentState) -> dict:
             if len(selected_sources) != before:
                 logger.warning("Filtered local_rag from plan: user did not enable RAG")
 
+        selected_sources = available(selected_sources)
+
         logger.info(f"Sources selected: {selected_sources}")
 
         # Multilingual expansion
-        expanded_queries = expand_queries_multilingual(topic)
+        expanded_queries = expand_queries_multilingual(topic, model=state.get("llm_model"))
 
         return {
             "research_plan": selected_sources,
@@ -118,12 +135,40 @@ def plan_research_node(state: AgentState) -> dict:
     except Exception as e:
         logger.error(f"Error in planning: {e}")
         return {
-            "research_plan": ["wiki", "web"],
+            "research_plan": available(["wiki", "web"]),
             "next_node": "parallel_search",
             "iteration_count": state.get("iteration_count", 0)
         }
 
 
+def _claim_evidence(state: AgentState, summary: str) -> str:
+    """Source passages for the claims listed under "## Verificación de Datos".
+
+    Each claim is looked up in the session's evidence index, so the evaluator
+    can check it against what the sources actually say.
+    """
+    import re
+    from ..config import settings
+    from ..evidence_index import evidence_indexes
+
+    match = re.search(r"##\s*Verificaci[oó]n de Datos(.*?)(?=\n##\s|\Z)", summary, re.DOTALL | re.IGNORECASE)
+    claims = [re.sub(r"^[\s*\-\d.]+", "", line).strip() for line in match.group(1).splitlines()] if match else []
+    claims = [c for c in claims if len(c) > 15][:settings.eval_max_claims]
+    if not claims:
+        return ""
+
+    index = evidence_indexes.for_state(state)
+    block = ""
+    for claim in claims:
+        hits = index.search(claim, k=settings.eval_evidence_per_claim)
+        block += f"AFIRMACIÓN: {claim}\n"
+        for hit in hits:
+            block += f"  - [{hit.get('title') or hit['source']}]({hit.get('url') or 'sin URL'}): {hit['text'][:600]}\n"
+        if not hits:
+            block += "  - (ninguna fuente recopilada menciona estos términos)\n"
+    return block
+
+
 def evaluate_research_node(state: AgentState) -> dict:
     """Evaluate if the gathered research is sufficient or if more is needed."""
     logger.info("Evaluating research sufficiency with LLM...")
@@ -156,9 +201,12 @@ def evaluate_research_node(state: AgentState) -> dict:
     SÍNTESIS ACTUAL:
     {summary}
 
+    EVIDENCIA DE LAS FUENTES PARA LAS AFIRMACIONES CLAVE:
+    {_claim_evidence(state, summary) or "(no disponible)"}
+
     INSTRUCCIONES DE EVALUACIÓN (PHASE 5):
     1. Revisa la sección "## Verificación de Datos" de la síntesis (si existe).
-    2. Identifica si hay afirmaciones de ALTO IMPACTO que parezcan dudosas o solo tengan una fuente informal.
+    2. Identifica si hay afirmaciones de ALTO IMPACTO que parezcan dudosas o solo tengan una fuente informal. Contrástalas con la evidencia de las fuentes: una afirmación que ningún fragmento respalda necesita verificación.
     3. EVALUACIÓN DE PROFUNDIDAD: Revisa si los puntos principales del informe tienen análisis suficientemente profundo para el nivel "{research_depth}". Un informe superficial que solo lista datos sin analizarlos NO es suficiente para niveles "standard" o "deep".
     4. Responde en formato JSON:
        - "sufficient": booleano (true si es sólido Y tiene profundidad adecuada, false si falta verificación o profundidad).
@@ -174,7 +222,7 @@ def evaluate_research_node(state: AgentState) -> dict:
     """
     
     ollama_base_url = os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
-    ollama_model = os.getenv("OLLAMA_MODEL", "qwen3:14b")
+    ollama_model = state.get("llm_model") or os.getenv("OLLAMA_MODEL", "qwen3:14b")
     
     from langchain_ollama import ChatOllama
     from ..config import settings
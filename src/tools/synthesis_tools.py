@@ -1,100 +1,247 @@
 import logging
+from typing import List, Optional
+
+from ..compression import compress_text, query_terms
+from ..evidence_index import evidence_indexes
 from ..state import AgentState
 from ..llm import get_llm
 
 logger = logging.getLogger(__name__)
 
 
-def consolidate_research_node(state: AgentState) -> dict:
-    """Synthesize all collected information into a consolidated report."""
-    logger.info("Starting research synthesis...")
+def _format_wiki(item: dict) -> str:
+    return f"Título: {item.get('title')}\nContenido: {item.get('summary')}\n\n"
 
-    topic = state.get("original_topic", state.get("topic", ""))
-    wiki = state.get("wiki_research", [])
-    web = state.get("web_research", [])
-    arxiv = state.get("arxiv_research", [])
-    scholar = state.get("scholar_research", [])
-    github = state.get("github_research", [])
-    hn = state.get("hn_research", [])
-    so = state.get("so_research", [])
-    reddit = state.get("reddit_research", [])
-    local = state.get("local_research", [])
-    yt_summaries = state.get("summaries", [])
-    persona = state.get("persona", "general")
 
-    # Build context for LLM
-    source_meta = state.get("source_metadata", {})
-    context = f"RESEARCH TOPIC: {topic}\n\n"
-    context += "--- METADATOS DE FIABILIDAD POR FUENTE ---\n"
-    for src, meta in source_meta.items():
-        context += f"Fuente: {src} | Confianza: {meta.get('reliability', 'N/A')}/5 | Tipo: {meta.get('source_type', 'N/A')}\n"
-    context += "\n"
-
-    if wiki:
-        context += "--- INFORMACIÓN DE WIKIPEDIA ---\n"
-        for item in wiki:
-            context += f"Título: {item.get('title')}\nContenido: {item.get('summary')}\n\n"
-
-    if web:
-        context += "--- RESULTADOS DE BÚSQUEDA WEB ---\n"
-        for item in web:
-            context += f"Fuente: {item.get('title', 'Web Result')}\nURL: {item.get('url', 'N/A')}\nContenido: {item.get('content', item.get('snippet', ''))}\n\n"
-            
-    if arxiv:
-        context += "--- ARTÍCULOS CIENTÍFICOS (ARXIV) ---\n"
-        for item in arxiv:
-            context += f"Título: {item.get('title')}\nResumen: {item.get('summary')}\nURL: {item.get('url')}\n\n"
-
-    if scholar:
-        context += "--- ARTÍCULOS ACADÉMICOS DESTACADOS (SEMANTIC SCHOLAR) ---\n"
-        for item in scholar:
-            context += f"Título: {item.get('title')} ({item.get('year', 'N/A')})\n"
-            context += f"Autores: {item.get('authors')}\n"
-            context += f"Resumen: {item.get('content')}\n"
-            context += f"URL: {item.get('url')}\n\n"
-
-    if github:
-        context += "--- REPOSITORIOS Y CÓDIGO (GITHUB) ---\n"
-        for item in github:
-            context += f"Repo: {item.get('name')}\nDescripción: {item.get('description')}\nEstrellas: {item.get('stars')}\nURL: {item.get('url')}\n\n"
-
-    if hn:
-        context += "--- DISCUSIONES EN HACKER NEWS ---\n"
-        for item in hn:
-            context += f"Título: {item.get('title')}\nAutor: {item.get('author')}\nPuntos: {item.get('points')}\nURL: {item.get('url')}\n\n"
-
-    if so:
-        context += "--- PREGUNTAS TÉCNICAS (STACK OVERFLOW) ---\n"
-        for item in so:
-            context += f"Título: {item.get('title')}\nScore: {item.get('score')}\nResuelta: {item.get('is_answered')}\nURL: {item.get('url')}\n\n"
-
-    if reddit:
-        context += "--- DISCUSIONES Y OPINIONES (REDDIT) ---\n"
-        for item in reddit:
-            context += f"Contenido: {item.get('content', item.get('snippet', ''))}\nURL: {item.get('url')}\n\n"
-
-    if local:
-        context += "--- CONOCIMIENTO LOCAL (RAG) ---\n"
-        for item in local:
-            context += f"Fuente: {item.get('title')}\nUbicación: {item.get('url')}\nContenido: {item.get('content')}\n\n"
-
-    if yt_summaries:
-        context += "--- RESÚMENES DE YOUTUBE ---\n"
-        video_meta = state.get("video_metadata", [])
-        for i, summary in enumerate(yt_summaries):
+def _format_web(item: dict) -> str:
+    return f"Fuente: {item.get('title', 'Web Result')}\nURL: {item.get('url', 'N/A')}\nContenido: {item.get('content', item.get('snippet', ''))}\n\n"
+
+
+def _format_arxiv(item: dict) -> str:
+    return f"Título: {item.get('title')}\nResumen: {item.get('summary')}\nURL: {item.get('url')}\n\n"
+
+
+def _format_scholar(item: dict) -> str:
+    return (
+        f"Título: {item.get('title')} ({item.get('year', 'N/A')})\n"
+        f"Autores: {item.get('authors')}\n"
+        f"Resumen: {item.get('content')}\n"
+        f"URL: {item.get('url')}\n\n"
+    )
+
+
+def _format_github(item: dict) -> str:
+    section = f"Repo: {item.get('name')}\nDescripción: {item.get('description')}\nEstrellas: {item.get('stars')}\nURL: {item.get('url')}\n"
+    if item.get("content"):
+        section += f"README: {item['content']}\n"
+    return section + "\n"
+
+
+def _format_hn(item: dict) -> str:
+    return f"Título: {item.get('title')}\nAutor: {item.get('author')}\nPuntos: {item.get('points')}\nURL: {item.get('url')}\n\n"
+
+
+def _format_so(item: dict) -> str:
+    section = f"Título: {item.get('title')}\nScore: {item.get('score')}\nResuelta: {item.get('is_answered')}\nURL: {item.get('url')}\n"
+    if item.get("content"):
+        section += f"Pregunta: {item['content']}\n"
+    return section + "\n"
+
+
+def _format_reddit(item: dict) -> str:
+    return f"Contenido: {item.get('content', item.get('snippet', ''))}\nURL: {item.get('url')}\n\n"
+
+
+def _format_local(item: dict) -> str:
+    return f"Fuente: {item.get('title')}\nUbicación: {item.get('url')}\nContenido: {item.get('content')}\n\n"
+
+
+# Source -> (state key, section header, item formatter), in the order sections appear in the prompt
+SOURCE_SECTIONS = {
+    "wiki": ("wiki_research", "--- INFORMACIÓN DE WIKIPEDIA ---", _format_wiki),
+    "web": ("web_research", "--- RESULTADOS DE BÚSQUEDA WEB ---", _format_web),
+    "arxiv": ("arxiv_research", "--- ARTÍCULOS CIENTÍFICOS (ARXIV) ---", _format_arxiv),
+    "scholar": ("scholar_research", "--- ARTÍCULOS ACADÉMICOS DESTACADOS (SEMANTIC SCHOLAR) ---", _format_scholar),
+    "github": ("github_research", "--- REPOSITORIOS Y CÓDIGO (GITHUB) ---", _format_github),
+    "hn": ("hn_research", "--- DISCUSIONES EN HACKER NEWS ---", _format_hn),
+    "so": ("so_research", "--- PREGUNTAS TÉCNICAS (STACK OVERFLOW) ---", _format_so),
+    "reddit": ("reddit_research", "--- DISCUSIONES Y OPINIONES (REDDIT) ---", _format_reddit),
+    "local_rag": ("local_research", "--- CONOCIMIENTO LOCAL (RAG) ---", _format_local),
+    "youtube": ("summaries", "--- RESÚMENES DE YOUTUBE ---", None),
+}
+
+# Source -> item field holding free text (page, abstract, README, question body, excerpt)
+CONTENT_FIELDS = {
+    "wiki": "summary",
+    "web": "content",
+    "arxiv": "summary",
+    "scholar": "content",
+    "github": "content",
+    "so": "content",
+    "reddit": "content",
+    "local_rag": "content",
+}
+
+
+def synthesis_terms(state: dict) -> List[str]:
+    """Terms item text is scored against: the original topic plus the expanded queries."""
+    return query_terms(state.get("original_topic", state.get("topic", "")), state.get("queries"))
+
+
+def _compress_item(source: str, item: dict, terms: List[str]) -> dict:
+    """Copy of ``item`` with its free-text field cut to ``SYNTHESIS_ITEM_TOKEN_BUDGET``.
+
+    Only the most query-relevant sentences are kept, in their original order and
+    joined with an ellipsis; titles, URLs and the other fields stay verbatim so
+    citations are unaffected.
+    """
+    from ..config import settings
+
+    field = CONTENT_FIELDS.get(source)
+    text = item.get(field) if field else None
+    if not settings.synthesis_item_token_budget or not isinstance(text, str):
+        return item
+    return {**item, field: compress_text(text, terms, settings.synthesis_item_token_budget, separator=" … ")}
+
+
+def _format_item(source: str, formatter, item: dict, terms: List[str]) -> str:
+    text = formatter(_compress_item(source, item, terms))
+    # Copies merged away by refine_evidence still get cited
+    also_cited = [c for c in item.get("also_cited") or [] if c.get("url")]
+    if also_cited:
+        refs = "; ".join(f"{c.get('title') or c['source']} ({c['url']})" for c in also_cited)
+        text = f"{text.rstrip()}\nTambién en: {refs}\n\n"
+    return text
+
+
+def format_source_section(source: str, data: dict, terms: Optional[List[str]] = None) -> str:
+    """Render one source's results as a synthesis context section.
+
+    ``data`` is either the full state or a single source node's result, so
+    parallel_search can pre-format sections as soon as each source returns.
+    Long item text is compressed against ``terms`` (taken from ``data`` when
+    omitted, which only works for the full state).
+    """
+    if source not in SOURCE_SECTIONS:
+        return ""
+    key, header, formatter = SOURCE_SECTIONS[source]
+    items = data.get(key, [])
+    if not items:
+        return ""
+
+    section = header + "\n"
+    if source == "youtube":
+        video_meta = data.get("video_metadata", [])
+        for i, summary in enumerate(items):
             title = "Video desconocido"
             url = "URL desconocida"
             if i < len(video_meta):
                 title = video_meta[i].get("title", title)
                 url = video_meta[i].get("url", url)
-            
-            context += f"Fuente: {title}\nURL: {url}\nContenido: {summary}\n\n"
+            section += f"Fuente: {title}\nURL: {url}\nContenido: {summary}\n\n"
+        return section
+
+    if terms is None:
+        terms = synthesis_terms(data)
+    for item in items:
+        section += _format_item(source, formatter, item, terms)
+    return section
+
+
+def _context_header(state: AgentState) -> str:
+    topic = state.get("original_topic", state.get("topic", ""))
+    header = f"RESEARCH TOPIC: {topic}\n\n"
+    header += "--- METADATOS DE FIABILIDAD POR FUENTE ---\n"
+    for src, meta in state.get("source_metadata", {}).items():
+        header += f"Fuente: {src} | Confianza: {meta.get('reliability', 'N/A')}/5 | Tipo: {meta.get('source_type', 'N/A')}\n"
+    return header + "\n"
+
+
+def select_evidence_context(state: AgentState, max_chars: int) -> str:
+    """Synthesis context for runs whose full context doesn't fit in ``max_chars``.
+
+    Partial summaries are kept whole (they are already condensed); the rest of
+    the budget goes to the passages of the other sources that the session's
+    evidence index ranks highest for the topic and its expanded queries,
+    instead of cutting the context off wherever the limit falls.
+    """
+    from ..config import settings
+
+    partials = state.get("partial_summaries") or {}
+    context = _context_header(state) + "".join(partials[s] for s in SOURCE_SECTIONS if partials.get(s))
+
+    index = evidence_indexes.for_state(state)
+    topic = state.get("original_topic", state.get("topic", ""))
+    hits = index.search(topic, k=settings.synthesis_evidence_passages, queries=state.get("queries"))
+    section = "--- EVIDENCIA MÁS RELEVANTE (SELECCIONADA DE TODAS LAS FUENTES) ---\n"
+    selected = 0
+    for hit in hits:
+        if hit["source"] in partials:
+            continue
+        entry = f"Fuente: {hit.get('title') or hit['source']} ({hit['source']})\nURL: {hit.get('url') or 'N/A'}\nContenido: {hit['text']}\n\n"
+        if len(context) + len(section) + len(entry) > max_chars:
+            continue
+        section += entry
+        selected += 1
+    logger.info(f"Synthesis context: selected {selected} of {len(index)} evidence passages")
+    return context + section if selected else context
+
+
+def build_synthesis_context(state: AgentState) -> str:
+    """Assemble the synthesis context, reusing sections parallel_search already prepared.
+
+    For each source the partial map-summary is preferred, then the pre-formatted
+    chunk, and the section is only formatted here when neither exists.
+    """
+    terms = synthesis_terms(state)
+    chunks = state.get("context_chunks") or {}
+    partials = state.get("partial_summaries") or {}
+
+    context = _context_header(state)
+    for source in SOURCE_SECTIONS:
+        if partials.get(source):
+            context += partials[source]
+        elif chunks.get(source):
+            context += chunks[source]
+        else:
+            context += format_source_section(source, state, terms)
+    return context
+
+
+def summarize_source_section(topic: str, section: str, model: Optional[str] = None) -> str:
+    """Map step of progressive synthesis: condense one source section, keeping citations verbatim."""
+    from langchain_core.messages import HumanMessage
+    from ..config import settings
+
+    header, _, body = section.partition("\n")
+    prompt = f"""Resume la siguiente información sobre "{topic}" en los hechos, datos y argumentos más relevantes.
+Conserva para cada hecho su fuente con la URL EXACTA tal como aparece en el campo `URL:`; no inventes enlaces.
+Responde solo con viñetas en Markdown, sin introducción.
+
+{body[:settings.max_synthesis_context_chars]}"""
+
+    llm = get_llm(temperature=0, timeout=settings.partial_summary_timeout, model=model)
+    response = llm.invoke([HumanMessage(content=prompt)])
+    summary = response.content.strip()
+    return f"{header} (resumen parcial)\n{summary}\n\n"
+
+
+def consolidate_research_node(state: AgentState) -> dict:
+    """Synthesize all collected information into a consolidated report."""
+    logger.info("Starting research synthesis...")
+
+    persona = state.get("persona", "general")
+
+    # Build context for LLM
+    context = build_synthesis_context(state)
 
     # Context safety truncation for local LLMs
     from ..config import settings
     MAX_CHARS = settings.max_synthesis_context_chars
     if len(context) > MAX_CHARS:
-        logger.warning(f"Context too large ({len(context)} chars). Pruning...")
+        logger.warning(f"Context too large ({len(context)} chars). Selecting the most relevant evidence...")
+        context = select_evidence_context(state, MAX_CHARS)
+    if len(context) > MAX_CHARS:
         context = context[:MAX_CHARS] + "\n\n[... CONTENIDO TRUNCADO POR EXCESO DE VOLUMEN ...]"
 
     # Persona-based context for synthesis
@@ -168,7 +315,8 @@ FORMATO DE SALIDA: Solo Markdown puro envuelto en etiquetas `<report>`.
 
     llm = get_llm(
         temperature=0.4,
-        timeout=360  # 6 minutes timeout for synthesis
+        timeout=360,  # 6 minutes timeout for synthesis
+        model=state.get("llm_model"),
     )
 
     try:
@@ -6,7 +6,7 @@ from ..utils import bypass_proxy_for_ollama
 logger = logging.getLogger(__name__)
 
 
-def expand_queries_multilingual(topic: str, target_languages: List[str] = ["en", "es"]) -> Dict[str, str]:
+def expand_queries_multilingual(topic: str, target_languages: List[str] = ["en", "es"], model: str = None) -> Dict[str, str]:
     """
     Expand a research topic into multiple languages for broader coverage.
     Returns a mapping of language code to query.
@@ -45,7 +45,7 @@ def expand_queries_multilingual(topic: str, target_languages: List[str] = ["en",
 
     from ..llm import get_llm
     bypass_proxy_for_ollama()
-    llm = get_llm(temperature=0.1, timeout=45)
+    llm = get_llm(temperature=0.1, timeout=45, model=model)
 
     expanded = {lang: topic for lang in target_languages} # Fallback to original
 
@@ -0,0 +1,192 @@
+# src/tools/web_content.py
+
+import logging
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Dict, Iterable, List, Optional
+
+from ..config import settings
+from ..page_cache import page_cache
+
+logger = logging.getLogger(__name__)
+
+JINA_READER_URL = "https://r.jina.ai/"
+# Metadata lines the Jina reader puts in front of the page content
+_JINA_HEADER = re.compile(r"^(Title|URL Source|Published Time|Warning|Markdown Content):.*\n?", re.MULTILINE)
+
+_prefetch_pool: Optional[ThreadPoolExecutor] = None
+_prefetch_lock = threading.Lock()
+_tavily_clients: Dict[str, object] = {}
+_tavily_lock = threading.Lock()
+
+
+def clean_text(text: str) -> str:
+    text = _JINA_HEADER.sub("", text)
+    text = re.sub(r"\n{3,}", "\n\n", text)
+    return text.strip()
+
+
+def _header(headers, name: str) -> Optional[str]:
+    value = headers.get(name)
+    return value if isinstance(value, str) else None
+
+
+def _fetch_jina(url: str, headers: dict, timeout: float):
+    """Page text rendered by the Jina reader proxy (one extra network hop)."""
+    import requests
+    response = requests.get(f"{JINA_READER_URL}{url}", headers=headers, timeout=timeout)
+    text = clean_text(response.text) if response.status_code == 200 else ""
+    return response.status_code, text, response.headers
+
+
+def _fetch_local(url: str, headers: dict, timeout: float):
+    """Page fetched directly and reduced to its main text in-process.
+
+    Parsing stops at ``PAGE_CACHE_MAX_CHARS``, the same bound as the cached
+    text, so any preview length can later be sliced from the cache entry.
+    """
+    from .html_extract import fetch_main_text
+    return fetch_main_text(url, settings.page_cache_max_chars, timeout, headers)
+
+
+# PAGE_EXTRACTOR -> fetcher returning (status, cleaned text, response headers)
+EXTRACTORS = {"jina": _fetch_jina, "local": _fetch_local}
+
+
+def fetch_page_text(url: str, timeout: Optional[float] = None, extractor: Optional[str] = None,
+                    use_cache: bool = True) -> Optional[str]:
+    """Cleaned text of ``url`` through the page cache.
+
+    Fresh entries are served without a request; stale ones are revalidated with
+    ``If-None-Match`` / ``If-Modified-Since``. When the fetch fails a stale entry
+    is still better than nothing. ``extractor`` defaults to ``PAGE_EXTRACTOR``.
+    """
+    extractor = extractor or settings.page_extractor
+    fetch = EXTRACTORS.get(extractor)
+    if fetch is None:
+        logger.warning(f"Unknown PAGE_EXTRACTOR '{extractor}', using jina")
+        extractor, fetch = "jina", _fetch_jina
+
+    entry = page_cache.get(url, extractor) if use_cache else None
+    if entry and page_cache.is_fresh(entry):
+        return entry["text"]
+
+    headers = {}
+    if entry and entry.get("etag"):
+        headers["If-None-Match"] = entry["etag"]
+    if entry and entry.get("last_modified"):
+        headers["If-Modified-Since"] = entry["last_modified"]
+
+    try:
+        status, text, response_headers = fetch(url, headers, timeout or settings.content_fetch_timeout)
+    except Exception as e:
+        logger.debug(f"Page fetch failed for {url} ({extractor}): {e}")
+        return entry["text"] if entry else None
+
+    if status == 304 and entry:
+        return page_cache.touch(url, entry, extractor)["text"]
+    if status != 200:
+        return entry["text"] if entry else None
+    if not text:
+        return None
+    if use_cache:
+        page_cache.put(url, text, extractor, etag=_header(response_headers, "ETag"),
+                       last_modified=_header(response_headers, "Last-Modified"))
+    return text[:settings.page_cache_max_chars]
+
+
+def _get_prefetch_pool() -> ThreadPoolExecutor:
+    global _prefetch_pool
+    with _prefetch_lock:
+        if _prefetch_pool is None:
+            _prefetch_pool = ThreadPoolExecutor(max_workers=settings.page_prefetch_workers,
+                                                thread_name_prefix="page-prefetch")
+        return _prefetch_pool
+
+
+def page_previews(urls: Iterable[str], timeout: Optional[float] = None) -> Dict[str, str]:
+    """Preview text (``MAX_CONTENT_PREVIEW_CHARS``) for every URL that is ready within ``timeout``.
+
+    Pages come from ``PAGE_EXTRACTOR``: the Jina reader proxy or the in-process
+    ``local`` extractor, which streams the page and stops once a preview's
+    worth of main text is parsed.
+
+    With ``PAGE_PREFETCH`` the downloads use the longer ``PAGE_PREFETCH_TIMEOUT``:
+    pages that miss this run's deadline keep downloading and are cached for the
+    next run instead of being dropped. This run's pages get threads of their
+    own, so they never queue behind other runs' leftover downloads; only pages
+    that never started before the deadline go to the shared background pool.
+    """
+    urls = list(dict.fromkeys(u for u in urls if isinstance(u, str) and u.startswith("http")))
+    if not urls:
+        return {}
+    timeout = timeout or settings.content_fetch_timeout
+
+    if settings.page_prefetch:
+        fetch_timeout = max(settings.page_prefetch_timeout, timeout)
+        executor = ThreadPoolExecutor(max_workers=min(len(urls), settings.page_prefetch_workers),
+                                      thread_name_prefix="page-fetch")
+        futures = {executor.submit(fetch_page_text, url, fetch_timeout): url for url in urls}
+        done, not_done = wait(futures, timeout=timeout)
+        leftover = [futures[f] for f in not_done if f.cancel()]
+        executor.shutdown(wait=False)
+        if leftover:
+            pool = _get_prefetch_pool()
+            for url in leftover:
+                pool.submit(fetch_page_text, url, fetch_timeout)
+    else:
+        executor = ThreadPoolExecutor(max_workers=5)
+        futures = {executor.submit(fetch_page_text, url, timeout): url for url in urls}
+        done, _ = wait(futures)
+        executor.shutdown(wait=False)
+
+    previews = {}
+    for future in done:
+        text = future.result()
+        if text:
+            previews[futures[future]] = text[:settings.max_content_preview_chars]
+    if len(previews) < len(urls):
+        logger.debug(f"page_previews: {len(previews)}/{len(urls)} pages ready within {timeout}s")
+    return previews
+
+
+def get_tavily_client(api_key: str):
+    """One ``TavilyClient`` per API key for the whole process, so its HTTP session is reused."""
+    with _tavily_lock:
+        client = _tavily_clients.get(api_key)
+        if client is None:
+            from tavily import TavilyClient
+            client = TavilyClient(api_key=api_key)
+            _tavily_clients[api_key] = client
+        return client
+
+
+def tavily_search(api_key: str, query: str, max_results: int, **params) -> List[dict]:
+    """Tavily hits with page text from the same response.
+
+    Page content is requested in the search call (``include_raw_content``);
+    only hits that come back without it go through ``page_previews``, and if
+    that fails too they keep Tavily's snippet.
+    """
+    response = get_tavily_client(api_key).search(query, max_results=max_results,
+                                                 include_raw_content="markdown", **params)
+    hits = []
+    for result in response.get("results", []):
+        raw = clean_text(result.get("raw_content") or "")
+        hits.append({
+            "title": result.get("title"),
+            "url": result.get("url"),
+            "content": raw[:settings.max_content_preview_chars] if raw else result.get("content"),
+            "_has_page": bool(raw),
+        })
+
+    missing = [hit["url"] for hit in hits if not hit["_has_page"]]
+    previews = page_previews(missing) if missing else {}
+    if missing:
+        logger.info(f"Tavily returned page content for {len(hits) - len(missing)}/{len(hits)} hits; "
+                    f"extracted {len(previews)} more")
+    for hit in hits:
+        if not hit.pop("_has_page") and previews.get(hit["url"]):
+            hit["content"] = previews[hit["url"]]
+    return hits
@@ -1,14 +1,16 @@
 # src/tools/youtube_tools.py
 
 import logging
-from langchain_ollama import ChatOllama
 import os
-from youtube_search import YoutubeSearch
-from langchain_classic.chains.summarize import load_summarize_chain
-from langchain_community.document_loaders import YoutubeLoader
+import re
+from typing import List, Optional
 
+from ..config import settings
+from ..compression import chunk_text, compress_text, estimate_tokens, query_terms
 from ..state import AgentState
 from ..llm import get_llm
+from ..cache import get_source_cache_key
+from ..singleflight import single_flight
 
 logger = logging.getLogger(__name__)
 
@@ -17,9 +19,99 @@ logger = logging.getLogger(__name__)
 # --------------------------------------------------------------------------
 
 
+YOUTUBE_API_URL = "https://www.googleapis.com/youtube/v3"
+YOUTUBE_SEARCH_TIMEOUT = 15  # seconds for the whole search step
+_ISO_DURATION = re.compile(r"P(?:(\d+)D)?T?(?:(\d+)H)?(?:(\d+)M)?(?:(\d+)S)?")
+
+
+def _duration_seconds(iso_duration: str) -> Optional[int]:
+    match = _ISO_DURATION.fullmatch(iso_duration or "")
+    if not match or not any(match.groups()):
+        return None
+    days, hours, minutes, seconds = (int(g or 0) for g in match.groups())
+    return ((days * 24 + hours) * 60 + minutes) * 60 + seconds
+
+
+def _search_youtube_api(search_topic: str, max_results: int, api_key: str) -> List[dict]:
+    """YouTube Data API v3: one ``search.list`` plus one batched ``videos.list`` for every hit.
+
+    With ``YOUTUBE_REQUIRE_CAPTIONS`` videos without captions are dropped here
+    (we over-fetch to compensate) instead of costing a transcript timeout and a
+    fallback LLM call each in ``summarize_videos_node``. Off by default:
+    ``contentDetails.caption`` only reports uploaded captions, and most videos
+    only have the auto-generated ones YoutubeLoader can still fetch.
+    """
+    import requests
+
+    require_captions = settings.youtube_require_captions
+    candidates = min(50, max_results * 2 if require_captions else max_results)
+    # The key goes in a header: HTTP errors quote the request URL, and those get logged
+    headers = {"X-Goog-Api-Key": api_key}
+    search = requests.get(f"{YOUTUBE_API_URL}/search", timeout=YOUTUBE_SEARCH_TIMEOUT, headers=headers, params={
+        "part": "snippet", "type": "video", "q": search_topic, "maxResults": candidates,
+    })
+    search.raise_for_status()
+    ids = [item["id"]["videoId"] for item in search.json().get("items", []) if item.get("id", {}).get("videoId")]
+    if not ids:
+        return []
+
+    details = requests.get(f"{YOUTUBE_API_URL}/videos", timeout=YOUTUBE_SEARCH_TIMEOUT, headers=headers, params={
+        "part": "snippet,contentDetails,statistics", "id": ",".join(ids),
+    })
+    details.raise_for_status()
+    by_id = {item["id"]: item for item in details.json().get("items", [])}
+
+    videos = []
+    for video_id in ids:  # keep search relevance order
+        item = by_id.get(video_id)
+        if not item:
+            continue
+        snippet = item.get("snippet", {})
+        content = item.get("contentDetails", {})
+        stats = item.get("statistics", {})
+        has_captions = content.get("caption") == "true"
+        if require_captions and not has_captions:
+            continue
+        url = f"https://www.youtube.com/watch?v={video_id}"
+        videos.append({
+            "title": snippet.get("title", "Título no disponible"),
+            "author": snippet.get("channelTitle", "Autor no disponible"),
+            "url": url,
+            "published": snippet.get("publishedAt"),
+            "duration_s": _duration_seconds(content.get("duration")),
+            "views": int(stats["viewCount"]) if stats.get("viewCount") else None,
+            "likes": int(stats["likeCount"]) if stats.get("likeCount") else None,
+            "has_captions": has_captions,
+        })
+        if len(videos) >= max_results:
+            break
+    logger.info(f"YouTube API: {len(ids)} hits, {len(videos)} kept"
+                f"{' (captioned only)' if require_captions else ''}")
+    return videos
+
+
+def _search_youtube_scrape(search_topic: str, max_results: int) -> List[dict]:
+    """Scrape the YouTube results page (no API key); only title and channel are known."""
+    from youtube_search import YoutubeSearch
+    videos = []
+    for res in YoutubeSearch(search_topic, max_results=max_results).to_dict():
+        url = f"https://www.youtube.com/watch?v={res['id']}"
+        videos.append({
+            "title": res.get('title', 'Título no disponible'),
+            "author": res.get('channel', 'Autor no disponible'),
+            "url": url
+        })
+    return videos
+
+
+@single_flight("youtube")
 def search_videos_node(state: AgentState) -> dict:
     """
     Busca vídeos en YouTube y extrae sus metadatos (título, autor, URL).
+
+    Con YOUTUBE_API_KEY usa la YouTube Data API v3 (duración, subtítulos y
+    estadísticas en una sola llamada por lote); sin clave, o si la API falla,
+    recurre al scraping con youtube_search.
     """
     logger.info("Searching YouTube videos...")
     queries = state.get("queries", {})
@@ -29,36 +121,30 @@ def search_videos_node(state: AgentState) -> dict:
     try:
         from ..utils import get_max_results
         max_results = get_max_results(state)
+        api_key = settings.youtube_api_key
         import threading
-        results = []
         container = {"data": []}
         def run_search():
+            if api_key:
+                try:
+                    container["data"] = _search_youtube_api(search_topic, max_results, api_key)
+                    return
+                except Exception as e_api:
+                    logger.warning(f"YouTube Data API search failed, falling back to scraping: {e_api}")
             try:
-                container["data"] = YoutubeSearch(search_topic, max_results=max_results).to_dict()
+                container["data"] = _search_youtube_scrape(search_topic, max_results)
             except Exception as e_inner:
                 logger.error(f"YouTubeSearch error: {e_inner}")
 
         thread = threading.Thread(target=run_search)
         thread.start()
-        thread.join(timeout=15) # 15 seconds for search
+        thread.join(timeout=YOUTUBE_SEARCH_TIMEOUT)
         if thread.is_alive():
             logger.warning("YouTube search timed out.")
             return {"video_urls": [], "video_metadata": []}
-        results = container["data"]
-
-        video_urls = []
-        video_metadata = []
-
-        for res in results:
-            video_id = res['id']
-            url = f"https://www.youtube.com/watch?v={video_id}"
-            video_urls.append(url)
 
-            video_metadata.append({
-                "title": res.get('title', 'Título no disponible'),
-                "author": res.get('channel', 'Autor no disponible'),
-                "url": url
-            })
+        video_metadata = container["data"]
+        video_urls = [video["url"] for video in video_metadata]
 
         logger.info(f"Found {len(video_urls)} videos with metadata.")
         return {"video_urls": video_urls, "video_metadata": video_metadata}
@@ -71,6 +157,46 @@ def search_videos_node(state: AgentState) -> dict:
 # --------------------------------------------------------------------------
 # NODO 2: EXTRACCIÓN Y RESUMEN DE TRANSCRIPCIONES
 # --------------------------------------------------------------------------
+def _summarize_transcript(llm, docs, terms: List[str], topic: str) -> str:
+    """Extractive pre-compression, then a bounded-parallel map and a single reduce.
+
+    Only the transcript sentences that score best against the topic and its
+    expanded queries (BM25, CPU only) are kept, up to TRANSCRIPT_TOKEN_BUDGET,
+    so a long video costs a couple of map calls instead of dozens.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    transcript = " ".join(doc.page_content for doc in docs)
+    compressed = compress_text(transcript, terms, settings.transcript_token_budget)
+    chunks = chunk_text(compressed, settings.transcript_chunk_tokens)
+    logger.info(f"transcript_compressed tokens={estimate_tokens(transcript)}->{estimate_tokens(compressed)} "
+                f"chunks={len(chunks)}")
+    if not chunks:
+        return ""
+
+    if len(chunks) == 1:
+        prompt = (f"Escribe un resumen conciso (un párrafo) de esta transcripción de un vídeo, centrado en lo "
+                  f"relevante para una investigación sobre '{topic}'.\n\n{chunks[0]}")
+        return llm.invoke(prompt).content
+
+    def map_chunk(chunk):
+        prompt = (f"Extrae en viñetas concisas los puntos clave de este fragmento de la transcripción de un vídeo "
+                  f"relevantes para una investigación sobre '{topic}'.\n\n{chunk}")
+        return llm.invoke(prompt).content
+
+    with ThreadPoolExecutor(max_workers=settings.video_map_workers) as executor:
+        partials = list(executor.map(map_chunk, chunks))
+    prompt = (f"Combina estos puntos clave de un mismo vídeo en un resumen conciso (un párrafo) para una "
+              f"investigación sobre '{topic}'.\n\n" + "\n\n".join(partials))
+    return llm.invoke(prompt).content
+
+
+def _summary_flight_key(state: AgentState) -> str:
+    # Summaries depend on the videos found, not just on the query
+    return get_source_cache_key("youtube", state) + "|" + ",".join(state.get("video_urls") or [])
+
+
+@single_flight("youtube", key_fn=_summary_flight_key)
 def summarize_videos_node(state: AgentState) -> dict:
     """
     Genera resúmenes para los vídeos usando las transcripciones.
@@ -88,9 +214,10 @@ def summarize_videos_node(state: AgentState) -> dict:
     from ..utils import bypass_proxy_for_ollama
     bypass_proxy_for_ollama()
 
-    llm = get_llm(temperature=0)
+    from langchain_community.document_loaders import YoutubeLoader
 
-    summarize_chain = load_summarize_chain(llm, chain_type="map_reduce")
+    llm = get_llm(temperature=0, model=state.get("llm_model"))
+    terms = query_terms(state.get("topic", ""), state.get("queries"))
 
     for i, url in enumerate(video_urls):
         logger.info(f"processing_video index={i+1} total={len(video_urls)} url={url}")
@@ -129,7 +256,7 @@ def summarize_videos_node(state: AgentState) -> dict:
             summary_container = {"data": ""}
             def run_summarize():
                 try:
-                    summary_container["data"] = summarize_chain.run(docs)
+                    summary_container["data"] = _summarize_transcript(llm, docs, terms, state.get("topic", ""))
                 except Exception as e_sum:
                     logger.warning("summarization_error", exc_info=e_sum)
 
@@ -2,6 +2,26 @@ import pytest
 from typing import List, Dict
 from langchain_core.messages import BaseMessage
 
+@pytest.fixture(autouse=True)
+def isolated_page_cache(tmp_path, monkeypatch):
+    """Keep fetched web pages out of the working tree's cache/ directory."""
+    from src.page_cache import page_cache
+    monkeypatch.setattr(page_cache, "directory", str(tmp_path / "pages"))
+    return page_cache
+
+@pytest.fixture(autouse=True)
+def lexical_reranker(monkeypatch):
+    """Rerank with BM25 so no test downloads the embedding model."""
+    monkeypatch.setattr("src.config.settings.rerank_backend", "bm25")
+
+@pytest.fixture(autouse=True)
+def fresh_tavily_clients():
+    """TavilyClient instances are shared per API key; don't let one test's mock leak into the next."""
+    from src.tools import web_content
+    web_content._tavily_clients.clear()
+    yield
+    web_content._tavily_clients.clear()
+
 @pytest.fixture
 def mock_agent_state():
     """
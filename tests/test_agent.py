@@ -58,3 +58,17 @@ def test_route_chat_triggers_research():
     
     state = {"messages": [HumanMessage(content="INVESTIGACIÓN: more about Y")]}
     assert route_chat(state) == "re_plan"
+
+
+def test_agent_import_is_lazy():
+    """Importing the agent module must not compile the graph or load source/export backends."""
+    import subprocess
+    import sys
+
+    code = (
+        "import sys, src.agent; "
+        "heavy = ['langgraph', 'fpdf', 'docx', 'github', 'arxiv', 'semanticscholar', 'youtube_search']; "
+        "print(','.join(m for m in heavy if m in sys.modules))"
+    )
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert out.stdout.strip() == ""
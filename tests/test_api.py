@@ -0,0 +1,168 @@
+import asyncio
+from unittest.mock import patch
+
+from aiohttp.test_utils import TestClient, TestServer
+
+from src.api import create_app
+from src.health import ReadinessProbe
+from src.scheduler import ResearchScheduler
+
+
+def _run(coro):
+    return asyncio.run(coro)
+
+
+def _probe(ready=True):
+    probe = ReadinessProbe(checker=lambda: {"ollama": ready, "llm_model": ready, "disk_space": True})
+    probe.refresh()
+    return probe
+
+
+async def _with_client(scheduler, fn, probe=None):
+    client = TestClient(TestServer(create_app(scheduler, probe or _probe())))
+    await client.start_server()
+    try:
+        return await fn(client)
+    finally:
+        await client.close()
+
+
+def _scheduler(runner, **kwargs):
+    with patch("src.scheduler.llm_capacity", return_value=4):
+        return ResearchScheduler(max_concurrent=2, runner=runner, **kwargs)
+
+
+def test_submit_then_fetch_result(tmp_path):
+    """A submitted job is accepted with 202 and its result/artifacts are served once done."""
+    md_file = tmp_path / "report.md"
+    md_file.write_text("# Report", encoding="utf-8")
+
+    def runner(job):
+        return {**job.inputs, "consolidated_summary": "summary", "md_path": str(md_file), "messages": ["x"]}
+
+    scheduler = _scheduler(runner)
+
+    async def scenario(client):
+        resp = await client.post("/jobs", json={"topic": "quantum computing", "sources": ["wiki", "bogus"]})
+        assert resp.status == 202
+        job_id = (await resp.json())["job_id"]
+        assert scheduler.get(job_id).inputs["research_plan"] == ["wiki"]
+
+        await asyncio.get_running_loop().run_in_executor(None, scheduler.get(job_id).wait, 5)
+
+        resp = await client.get(f"/jobs/{job_id}/result")
+        assert resp.status == 200
+        result = (await resp.json())["result"]
+        assert result["consolidated_summary"] == "summary"
+        assert "messages" not in result
+
+        resp = await client.get(f"/jobs/{job_id}/artifacts/md")
+        assert resp.status == 200
+        assert await resp.text() == "# Report"
+
+        assert (await client.get(f"/jobs/{job_id}/artifacts/pdf")).status == 404
+        assert (await client.get("/jobs/missing")).status == 404
+
+    _run(_with_client(scheduler, scenario))
+
+
+def test_invalid_request_and_full_queue():
+    """Malformed bodies get 400, bad fields 422; a saturated queue answers 503 with Retry-After."""
+    import threading
+
+    release = threading.Event()
+    scheduler = _scheduler(lambda job: release.wait(5) and {}, max_queued=0)
+
+    async def scenario(client):
+        resp = await client.post("/jobs", json={"topic": "ab"})
+        assert resp.status == 422
+        assert (await client.post("/jobs", data="not json")).status == 400
+        assert (await client.post("/jobs", json=["valid topic"])).status == 400
+        resp = await client.post("/jobs", json={"topic": "valid topic", "sources": "wiki"})
+        assert resp.status == 422
+        assert (await client.post("/jobs", json={"topic": "valid topic", "sources": ["wiki", 3]})).status == 422
+
+        resp = await client.post("/jobs", json={"topic": "valid topic"})
+        assert resp.status == 503
+        assert "Retry-After" in resp.headers
+
+    try:
+        _run(_with_client(scheduler, scenario))
+    finally:
+        release.set()
+
+
+def test_events_stream_until_done():
+    """The SSE endpoint relays bus events for the job and closes after 'done'."""
+    import threading
+
+    release = threading.Event()
+
+    def runner(job):
+        release.wait(5)
+        return {}
+
+    scheduler = _scheduler(runner)
+
+    async def scenario(client):
+        job_id = (await (await client.post("/jobs", json={"topic": "streaming topic"})).json())["job_id"]
+        resp = await client.get(f"/jobs/{job_id}/events")
+        assert resp.headers["Content-Type"].startswith("text/event-stream")
+        release.set()
+        body = await asyncio.wait_for(resp.text(), timeout=5)
+        assert body.startswith("event: status")
+        assert "event: done" in body
+
+    _run(_with_client(scheduler, scenario))
+
+
+def test_cancelled_event_stream_unsubscribes_and_propagates():
+    """Cancelling the SSE handler (e.g. on shutdown) drops its subscription and lets the cancellation through."""
+    import threading
+    from aiohttp.test_utils import make_mocked_request
+    from src.api import SCHEDULER_KEY, job_events
+    from src.events import progress_bus
+
+    release = threading.Event()
+    scheduler = _scheduler(lambda job: release.wait(5) and {})
+
+    async def scenario():
+        job = scheduler.submit({"topic": "cancelled stream"})
+        app = create_app(scheduler, _probe())
+        request = make_mocked_request("GET", f"/jobs/{job.job_id}/events",
+                                      match_info={"job_id": job.job_id}, app=app)
+        task = asyncio.create_task(job_events(request))
+        channel = progress_bus.channel(job.job_id)
+        for _ in range(100):
+            if channel.subscriber_count:
+                break
+            await asyncio.sleep(0.01)
+        assert channel.subscriber_count == 1
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+        else:
+            raise AssertionError("job_events swallowed the cancellation")
+        assert channel.subscriber_count == 0
+
+    try:
+        _run(scenario())
+    finally:
+        release.set()
+
+
+def test_submissions_gated_on_readiness():
+    """While the LLM is unavailable, /ready and POST /jobs answer 503 instead of queueing doomed runs."""
+    scheduler = _scheduler(lambda job: {})
+
+    async def scenario(client):
+        assert (await client.get("/ready")).status == 503
+        resp = await client.post("/jobs", json={"topic": "valid topic"})
+        assert resp.status == 503
+        assert scheduler.stats()["queued"] == 0
+        health = await (await client.get("/health")).json()
+        assert health["readiness"]["ready"] is False
+
+    _run(_with_client(scheduler, scenario, probe=_probe(ready=False)))
@@ -0,0 +1,82 @@
+import functools
+import pytest
+from unittest.mock import patch
+from src import db_manager
+from src.batch import read_topics, run_batch, default_batch_id
+
+
+@pytest.fixture
+def batch_db(tmp_path):
+    db_path = str(tmp_path / "batch.db")
+    with patch("src.batch.init_db", functools.partial(db_manager.init_db, db_path=db_path)), \
+         patch("src.batch.mark_batch_topic", functools.partial(db_manager.mark_batch_topic, db_path=db_path)), \
+         patch("src.batch.get_batch_status", functools.partial(db_manager.get_batch_status, db_path=db_path)):
+        yield db_path
+
+
+def test_read_topics_skips_comments_blanks_and_duplicates(tmp_path):
+    path = tmp_path / "topics.txt"
+    path.write_text("# overnight batch\nQuantum computing\n\nRust async\nQuantum computing\n", encoding="utf-8")
+    assert read_topics(str(path)) == ["Quantum computing", "Rust async"]
+
+
+def test_run_batch_reports_timings_and_resumes(batch_db):
+    calls = []
+
+    def flaky_runner(inputs, config=None):
+        calls.append(inputs["topic"])
+        if inputs["topic"] == "Broken topic":
+            raise RuntimeError("LLM timeout")
+        return {}
+
+    topics = ["Topic A", "Topic B", "Broken topic"]
+    report = run_batch(topics, workers=2, runner=flaky_runner, use_caches=False)
+
+    assert report["batch_id"] == default_batch_id(topics)
+    assert report["completed"] == 2
+    assert report["failed"] == 1
+    assert report["throughput_per_hour"] > 0
+    assert {r["topic"] for r in report["topics"]} == set(topics)
+
+    # A second run of the same list only retries what did not finish
+    calls.clear()
+    report = run_batch(topics, workers=2, runner=flaky_runner, use_caches=False)
+    assert calls == ["Broken topic"]
+    assert report["skipped"] == 2
+
+
+def test_run_batch_restores_the_source_cache_setting(batch_db):
+    """Enabling the shared source cache for a batch must not leak into later runs in the process."""
+    from src.config import settings
+
+    seen = []
+
+    def runner(inputs, config=None):
+        seen.append(settings.source_cache_enabled)
+        return {}
+
+    with patch("src.config.settings.source_cache_enabled", False), \
+         patch("src.llm.enable_llm_cache"):
+        run_batch(["Topic A"], runner=runner)
+        assert seen == [True]
+        assert settings.source_cache_enabled is False
+
+
+def test_cached_source_call_dedups_identical_queries(tmp_path):
+    """Topics expanding to the same queries share one source call."""
+    from src.cache import cached_source_call
+
+    calls = []
+
+    def source(state):
+        calls.append(state["topic"])
+        return {"web_research": [{"url": "http://a.com", "content": "x"}]}
+
+    queries = {"en": "AI in education", "es": "IA en educación"}
+    with patch("src.cache.CACHE_DIR", str(tmp_path)), \
+         patch("src.cache.settings.source_cache_enabled", True):
+        first = cached_source_call("web", source, {"topic": "AI in education", "queries": queries})
+        second = cached_source_call("web", source, {"topic": "IA en educación", "queries": queries})
+
+    assert calls == ["AI in education"]
+    assert first == second
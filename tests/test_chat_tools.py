@@ -1,7 +1,7 @@
 import pytest
 from unittest.mock import MagicMock, patch
 from src.tools.chat_tools import chat_node
-from langchain_core.messages import HumanMessage, AIMessage
+from langchain_core.messages import HumanMessage, AIMessage, SystemMessage
 
 def test_chat_node_basic_response(mock_agent_state):
     """Test that chat_node returns a response from the LLM."""
@@ -31,3 +31,95 @@ def test_chat_node_suggests_research(mock_agent_state):
         result = chat_node(mock_agent_state)
         
         assert "INVESTIGACIÓN:" in result["messages"][0].content
+
+
+def test_chat_node_retrieves_relevant_passages_within_budget(mock_agent_state):
+    """Each turn sends the summary/source passages matching the question, not the whole summary."""
+    mock_agent_state["session_id"] = "chat-1"
+    mock_agent_state["topic"] = "Rust async"
+    filler = "\n".join(f"## Section {i}\nGeneral remarks about ecosystem maturity number {i}." for i in range(400))
+    mock_agent_state["consolidated_summary"] = f"{filler}\n## Runtimes\nTokio dominates production async Rust."
+    mock_agent_state["web_research"] = [{"title": "Tokio scheduler", "url": "https://example.org/tokio",
+                                          "content": "The Tokio scheduler steals work from other worker queues."}]
+    mock_agent_state["messages"] = [HumanMessage(content="How does the Tokio scheduler handle work?")]
+
+    with patch("src.tools.chat_tools.get_llm") as mock_llm, \
+            patch("src.config.settings.chat_context_tokens", 300):
+        mock_llm.return_value.invoke.return_value = AIMessage(content="It steals work.")
+        chat_node(mock_agent_state)
+
+    system_prompt = mock_llm.return_value.invoke.call_args[0][0][0].content
+    assert "Tokio dominates production async Rust." in system_prompt
+    assert "https://example.org/tokio" in system_prompt
+    assert "Section 7\n" not in system_prompt
+    assert len(system_prompt) < len(mock_agent_state["consolidated_summary"]) // 10
+
+
+def test_chat_history_is_compacted_in_the_background(mock_agent_state):
+    """Old turns are folded into a summary after a turn returns; the next turn sends summary + recent turns."""
+    import threading
+    from src.chat_memory import chat_compactor
+
+    release = threading.Event()
+    chat_calls = []
+
+    def invoke(messages):
+        if isinstance(messages[0], SystemMessage):
+            chat_calls.append(messages)
+            return AIMessage(content="answer")
+        release.wait(5)  # the summarizer is still running when the turn returns
+        return AIMessage(content="User asked about Tokio and smol.")
+
+    history = []
+    for i in range(5):
+        history += [HumanMessage(content=f"question {i}"), AIMessage(content=f"answer {i}")]
+    mock_agent_state["session_id"] = "compact-1"
+    mock_agent_state["messages"] = history + [HumanMessage(content="question 5")]
+
+    with patch("src.tools.chat_tools.get_llm") as mock_llm:
+        mock_llm.return_value.invoke.side_effect = invoke
+        first = chat_node(mock_agent_state)
+        assert len(chat_calls[0]) == 1 + 11
+        assert first["chat_summary_upto"] == 0
+
+        release.set()
+        chat_compactor.pending("compact-1").result(timeout=5)
+
+        mock_agent_state["messages"] += first["messages"] + [HumanMessage(content="question 6")]
+        second = chat_node(mock_agent_state)
+
+    assert second["chat_summary_upto"] == 4
+    assert "User asked about Tokio and smol." in chat_calls[1][0].content
+    assert len(chat_calls[1]) == 1 + 13 - 4
+
+
+def test_compaction_extends_the_persisted_summary():
+    """After a restart only the messages past the persisted summary are folded."""
+    from src.chat_memory import ChatHistoryCompactor
+
+    calls = []
+
+    def summarize(previous, messages):
+        calls.append((previous, len(messages)))
+        return previous + " +more"
+
+    history = [HumanMessage(content=str(i)) for i in range(20)]
+    future = ChatHistoryCompactor().schedule("reloaded", history, summarize, "persisted summary", 8)
+
+    assert future.result(timeout=5) is None
+    assert calls == [("persisted summary", 20 - 8 - 8)]
+
+
+def test_chat_uses_the_model_selected_for_the_run(mock_agent_state):
+    """The run's model comes from its state, not from whatever OLLAMA_MODEL is now."""
+    mock_agent_state["llm_model"] = "model-of-this-run"
+    mock_agent_state["messages"] = [HumanMessage(content="question")]
+
+    env = {"OLLAMA_MODEL": "another-session-model", "OLLAMA_BASE_URL": "http://localhost:11434", "OPENAI_API_KEY": ""}
+    with patch.dict("os.environ", env), \
+         patch("src.llm.settings.openai_api_key", None), \
+         patch("langchain_ollama.ChatOllama") as mock_chat:
+        mock_chat.return_value.invoke.return_value = AIMessage(content="answer")
+        chat_node(mock_agent_state)
+
+    assert mock_chat.call_args.kwargs["model"] == "model-of-this-run"
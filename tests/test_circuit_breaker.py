@@ -0,0 +1,113 @@
+from unittest.mock import MagicMock, patch
+
+from src.circuit_breaker import CircuitBreaker, source_breakers, CLOSED, OPEN, HALF_OPEN
+
+
+def test_breaker_opens_then_recovers_through_half_open_trial():
+    breaker = CircuitBreaker("arxiv", window=5, min_calls=3, failure_rate=0.5, cooldown=0.05)
+    breaker.record_success()
+    breaker.record_failure("timeout")
+    assert breaker.state == CLOSED  # not enough calls yet
+    breaker.record_failure("error")
+    assert breaker.state == OPEN
+    assert not breaker.allow()
+    assert breaker.health_score() == 0.0
+
+    import time
+    time.sleep(0.06)
+    assert breaker.allow()          # the single trial request
+    assert breaker.state == HALF_OPEN
+    assert not breaker.allow()      # no second trial while the first is in flight
+    breaker.record_success()
+    assert breaker.state == CLOSED
+    assert breaker.allow()
+
+
+def test_failed_trial_reopens():
+    breaker = CircuitBreaker("scholar", window=4, min_calls=2, failure_rate=0.5, cooldown=0)
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    assert breaker.allow()
+    breaker.record_failure("timeout")
+    assert breaker.state == OPEN
+
+
+def test_parallel_search_short_circuits_open_source(mock_agent_state):
+    """An open source is not called; its cached result is used when there is one."""
+    from src.tools.parallel_tools import parallel_search_node
+
+    mock_agent_state["research_plan"] = ["hn", "so"]
+    source_breakers.reset()
+    try:
+        so_breaker = source_breakers.get("so")
+        so_breaker.cooldown = 60
+        for _ in range(so_breaker.min_calls):
+            so_breaker.record_failure("timeout")
+
+        so_node = MagicMock()
+        with patch("src.tools.research_tools.search_hn_node", return_value={"hn_research": [{"title": "hn"}]}), \
+             patch("src.tools.research_tools.search_so_node", so_node), \
+             patch("src.tools.parallel_tools.get_cached_source_result", return_value={"so_research": [{"title": "cached"}]}):
+            result = parallel_search_node(mock_agent_state)
+
+        so_node.assert_not_called()
+        assert result["so_research"] == [{"title": "cached"}]
+        assert result["hn_research"] == [{"title": "hn"}]
+        assert source_breakers.get("hn").state == CLOSED
+    finally:
+        source_breakers.reset()
+
+
+def test_cache_hit_does_not_claim_the_half_open_trial(mock_agent_state):
+    """A source answered from the cache leaves a half-open breaker's trial for a real call."""
+    from src.tools.parallel_tools import parallel_search_node
+
+    mock_agent_state["research_plan"] = ["so"]
+    source_breakers.reset()
+    try:
+        so_breaker = source_breakers.get("so")
+        so_breaker.cooldown = 0
+        for _ in range(so_breaker.min_calls):
+            so_breaker.record_failure("timeout")
+
+        so_node = MagicMock()
+        with patch("src.tools.research_tools.search_so_node", so_node), \
+             patch("src.config.settings.source_cache_enabled", True), \
+             patch("src.cache.get_from_cache", return_value={"data": {"so_research": [{"title": "cached"}]}}):
+            result = parallel_search_node(mock_agent_state)
+
+        so_node.assert_not_called()
+        assert result["so_research"] == [{"title": "cached"}]
+        assert so_breaker.state == OPEN
+        assert so_breaker.allow()  # the trial is still available to the next real call
+    finally:
+        source_breakers.reset()
+
+
+@patch("src.llm.get_llm")
+@patch("src.tools.router_tools.get_llm")
+def test_plan_skips_unavailable_sources(mock_router_llm, mock_global_llm, mock_agent_state):
+    from src.tools.router_tools import plan_research_node
+
+    source_breakers.reset()
+    try:
+        github = source_breakers.get("github")
+        github.cooldown = 60
+        for _ in range(github.min_calls):
+            github.record_failure()
+
+        # Plan provided by the UI
+        mock_agent_state["research_plan"] = ["wiki", "github"]
+        assert plan_research_node(mock_agent_state)["research_plan"] == ["wiki"]
+
+        # Plan chosen by the LLM
+        mock_agent_state["research_plan"] = []
+        mock_llm = mock_router_llm.return_value
+        mock_global_llm.return_value = mock_llm
+        mock_llm.invoke.side_effect = [MagicMock(content='["github", "so"]'), MagicMock(content='{"en": "t"}')]
+        result = plan_research_node(mock_agent_state)
+        assert result["research_plan"] == ["so"]
+        assert "NO DISPONIBLES" in mock_llm.invoke.call_args_list[0][0][0][0].content
+    finally:
+        source_breakers.reset()
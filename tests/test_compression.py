@@ -0,0 +1,24 @@
+from src.compression import compress_text, estimate_tokens, query_terms, split_sentences
+
+
+def test_compress_text_keeps_relevant_sentences_in_order_within_budget():
+    text = " ".join([
+        "The weather was nice during the conference.",
+        "Rust's borrow checker prevents data races at compile time.",
+        "Lunch was served at noon in the main hall.",
+        "Async Rust uses futures that are polled by an executor such as Tokio.",
+        "Several attendees asked about parking.",
+    ] * 20)
+    terms = query_terms("Rust async", {"es": "Rust asíncrono", "en": "async Rust executors"})
+
+    compressed = compress_text(text, terms, budget_tokens=60)
+
+    assert estimate_tokens(compressed) <= 60
+    assert "Tokio" in compressed and "borrow checker" in compressed
+    assert "parking" not in compressed and "Lunch" not in compressed
+    assert compress_text("short text", terms, budget_tokens=60) == "short text"
+
+
+def test_unpunctuated_transcripts_are_windowed():
+    words = ["word"] * 100
+    assert [len(s.split()) for s in split_sentences(" ".join(words), max_words=40)] == [40, 40, 20]
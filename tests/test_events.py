@@ -0,0 +1,89 @@
+import queue
+from unittest.mock import patch
+from src.events import ProgressBus, publish_progress, progress_bus
+
+
+def test_publish_reaches_only_own_session():
+    """Events are scoped per session: subscribers never see other sessions."""
+    bus = ProgressBus()
+    q_a = bus.subscribe("a")
+    q_b = bus.subscribe("b")
+
+    bus.publish("a", "rag", current=1, total=3, last_file="doc.pdf")
+
+    event = q_a.get_nowait()
+    assert event["type"] == "rag"
+    assert event["session_id"] == "a"
+    assert event["current"] == 1
+    assert q_b.empty()
+
+
+def test_publish_without_session_is_noop():
+    bus = ProgressBus()
+    assert bus.publish("", "rag", current=1) is None
+    assert bus.publish(None, "rag", current=1) is None
+
+
+def test_unsubscribe_and_close():
+    bus = ProgressBus()
+    q = bus.subscribe("s1")
+    bus.channel("s1").unsubscribe(q)
+    bus.publish("s1", "parallel_search", done=[], running=["web"], total=1)
+    assert q.empty()
+
+    bus.close("s1")
+    assert bus.channel("s1").subscriber_count == 0
+
+
+def test_publish_never_opens_a_channel():
+    """Events for sessions nobody subscribed to (batch runs, closed channels) are dropped."""
+    bus = ProgressBus()
+    assert bus.publish("batch-topic", "rag", current=1) is None
+    bus.subscribe("s1")
+    bus.close("s1")
+    assert bus.publish("s1", "done", status="done") is None
+    assert bus._channels == {}
+
+
+def test_parallel_search_publishes_progress(mock_agent_state):
+    """parallel_search_node reports per-source progress on the session channel."""
+    from src.tools.parallel_tools import parallel_search_node
+
+    mock_agent_state["session_id"] = "test-parallel"
+    mock_agent_state["research_plan"] = ["hn"]
+    q = progress_bus.subscribe("test-parallel")
+
+    with patch("src.tools.research_tools.search_hn_node", return_value={"hn_research": []}):
+        parallel_search_node(mock_agent_state)
+
+    events = []
+    while True:
+        try:
+            events.append(q.get_nowait())
+        except queue.Empty:
+            break
+    progress_bus.close("test-parallel")
+
+    assert events[0]["running"] == ["hn"]
+    assert events[-1]["done"] == ["hn"]
+    assert all(e["type"] == "parallel_search" for e in events)
+
+
+def test_publish_progress_uses_state_session():
+    q = progress_bus.subscribe("state-session")
+    publish_progress({"session_id": "state-session"}, "rag", current=2, total=2)
+    assert q.get_nowait()["total"] == 2
+    progress_bus.close("state-session")
+
+
+def test_collect_events_blocks_then_batches():
+    """collect_events returns nothing on timeout and batches bursts into one call."""
+    from src.events import collect_events
+
+    q = queue.Queue()
+    assert collect_events(q, timeout=0.01, window=0.01) == []
+
+    for i in range(3):
+        q.put({"type": "rag", "current": i})
+    batch = collect_events(q, timeout=0.1, window=0.05)
+    assert [e["current"] for e in batch] == [0, 1, 2]
@@ -0,0 +1,88 @@
+import time
+from unittest.mock import patch
+
+from src.evidence_index import EvidenceIndex, EvidenceIndexRegistry, evidence_passages
+
+
+def _state(mock_agent_state):
+    mock_agent_state["session_id"] = "s1"
+    mock_agent_state["topic"] = "Rust async runtimes"
+    mock_agent_state["web_research"] = [
+        {"title": "Tokio internals", "url": "https://example.org/tokio",
+         "content": "Tokio, the most used async Rust runtime, has a work-stealing scheduler. Each worker thread owns a local run queue."},
+        {"title": "Pasta", "url": "https://example.org/pasta", "content": "Boil the pasta in salted water for nine minutes."},
+    ]
+    mock_agent_state["summaries"] = ["The talk compares the smol and Tokio executors."]
+    mock_agent_state["video_metadata"] = [{"title": "Async Rust talk", "url": "https://youtube.com/watch?v=1"}]
+    return mock_agent_state
+
+
+def test_search_returns_cited_passages_best_first(mock_agent_state):
+    index = EvidenceIndex(evidence_passages(_state(mock_agent_state)))
+
+    hits = index.search("work-stealing scheduler in Tokio", k=3)
+
+    assert hits[0]["url"] == "https://example.org/tokio"
+    assert [h["score"] for h in hits] == sorted((h["score"] for h in hits), reverse=True)
+    assert all("pasta" not in h["text"].lower() for h in hits)
+    assert index.search("executors", k=1)[0]["source"] == "youtube"
+
+
+def test_queries_stay_fast_on_a_large_run():
+    passages = [{"source": "web", "title": f"Doc {i}", "url": f"https://e.org/{i}",
+                 "text": f"passage {i} about topic{i % 50} with shared words runtime scheduler latency w{i}"}
+                for i in range(5000)]
+    index = EvidenceIndex(passages)
+    index.search("runtime latency topic7", k=10)
+
+    start = time.perf_counter()
+    for _ in range(100):
+        index.search("runtime latency topic7", k=10)
+    # Well under 1 ms on a quiet machine; the bound leaves room for loaded CI runners
+    # while still catching a fall back to scanning every passage
+    assert (time.perf_counter() - start) / 100 < 0.02
+
+
+def test_registry_reuses_the_session_index(mock_agent_state):
+    registry = EvidenceIndexRegistry(max_sessions=1)
+    state = _state(mock_agent_state)
+    built = registry.build(state)
+
+    assert registry.for_state(state) is built
+    registry.build({**state, "session_id": "s2"})
+    assert registry.get("s1") is None  # evicted
+
+
+def test_registry_reuses_an_empty_session_index():
+    """A run without evidence gets an empty index, built once rather than on every lookup."""
+    registry = EvidenceIndexRegistry()
+    built = registry.build({"session_id": "empty"})
+
+    assert len(built) == 0
+    assert registry.for_state({"session_id": "empty"}) is built
+
+
+def test_overflowing_synthesis_context_keeps_the_most_relevant_passages(mock_agent_state):
+    from src.tools.synthesis_tools import select_evidence_context
+
+    state = _state(mock_agent_state)
+    state["web_research"] += [{"title": f"Filler {i}", "url": f"https://example.org/{i}",
+                               "content": "Unrelated gardening advice about tomatoes. " * 20} for i in range(30)]
+
+    context = select_evidence_context(state, max_chars=900)
+
+    assert "https://example.org/tokio" in context
+    assert "tomatoes" not in context
+    assert len(context) <= 900
+
+
+def test_evaluation_prompt_gets_source_evidence_for_key_claims(mock_agent_state):
+    from src.tools.router_tools import _claim_evidence
+
+    summary = "## Análisis\nTexto.\n\n## Verificación de Datos\n* Tokio uses a work-stealing scheduler for its workers.\n"
+
+    with patch("src.evidence_index.evidence_indexes.get", return_value=None):
+        block = _claim_evidence(_state(mock_agent_state), summary)
+
+    assert "AFIRMACIÓN: Tokio uses a work-stealing scheduler" in block
+    assert "https://example.org/tokio" in block
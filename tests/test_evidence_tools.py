@@ -0,0 +1,210 @@
+import time
+
+from src.dedup import canonical_url, duplicate_groups, paper_ids, simhash
+
+ARTICLE = (
+    "Structured concurrency ties the lifetime of every task to a lexical scope, so a parent "
+    "cannot finish while its children are still running. Cancellation propagates down the tree "
+    "and errors propagate up, which removes a whole class of leaked background tasks. Python "
+    "adopted the idea with task groups in asyncio, Kotlin has coroutine scopes and Java ships "
+    "StructuredTaskScope as a preview API. The pattern also simplifies tracing because every "
+    "span has a well defined parent."
+)
+
+
+def test_canonical_url_and_paper_ids():
+    assert canonical_url("https://www.Example.com/post/?utm_source=x&id=3#top") == canonical_url("http://example.com/post?id=3")
+    assert paper_ids({"url": "http://arxiv.org/abs/1706.03762v5"}) == paper_ids({"arxiv_id": "1706.03762"})
+    assert paper_ids({"url": "https://doi.org/10.1145/3368089.3409741"}) == ["doi:10.1145/3368089.3409741"]
+    assert paper_ids({"doi": "10.1/ABC", "arxiv_id": "1706.03762", "url": "https://www.semanticscholar.org/paper/x"}) \
+        == ["doi:10.1/abc", "arxiv:1706.03762"]
+
+
+def test_papers_with_several_ids_merge_by_any_of_them():
+    from src.tools.evidence_tools import merge_duplicates
+
+    entries = [
+        ("arxiv", {"title": "A", "summary": "Long abstract " * 10, "url": "http://arxiv.org/abs/1706.03762v7"}),
+        ("scholar", {"title": "B", "content": "Short.", "doi": "10.1/abc", "arxiv_id": "1706.03762",
+                     "url": "https://www.semanticscholar.org/paper/x"}),
+    ]
+
+    merged = merge_duplicates(entries)
+
+    assert len(merged) == 1
+    assert merged[0][1]["also_cited"][0]["source"] == "scholar"
+
+
+def test_refine_evidence_merges_cross_source_duplicates_keeping_citations(mock_agent_state):
+    from src.tools.evidence_tools import refine_evidence_node
+
+    mock_agent_state["arxiv_research"] = [
+        {"title": "Attention Is All You Need", "summary": "Transformer abstract. " * 5, "url": "http://arxiv.org/abs/1706.03762v7"},
+    ]
+    mock_agent_state["scholar_research"] = [
+        {"title": "Attention is All you Need", "content": "Short abstract.", "url": "https://www.semanticscholar.org/paper/abc",
+         "arxiv_id": "1706.03762"},
+        {"title": "Unrelated paper on graph databases", "content": "Graphs.", "url": "https://www.semanticscholar.org/paper/def"},
+    ]
+    mock_agent_state["web_research"] = [
+        {"title": "Structured concurrency", "url": "https://blog.example.com/sc?utm_source=tavily", "content": ARTICLE},
+        {"title": "Mirror", "url": "https://mirror.example.net/sc", "content": ARTICLE.replace(" as a preview API", "")},
+    ]
+    mock_agent_state["reddit_research"] = [
+        {"url": "https://blog.example.com/sc", "content": "Discussion of the post"},
+    ]
+    mock_agent_state["context_chunks"] = {"scholar": "--- STALE ---\n", "hn": "--- HN ---\n"}
+
+    update = refine_evidence_node(mock_agent_state)
+
+    assert len(update["arxiv_research"]) == 1
+    assert update["arxiv_research"][0]["also_cited"][0]["url"] == "https://www.semanticscholar.org/paper/abc"
+    assert [p["title"] for p in update["scholar_research"]] == ["Unrelated paper on graph databases"]
+    assert len(update["web_research"]) == 1
+    assert {c["url"] for c in update["web_research"][0]["also_cited"]} == {"https://mirror.example.net/sc"}
+    assert update["reddit_research"] == []
+    # Pre-formatted sections of changed sources are rebuilt; untouched ones are kept
+    assert "graph databases" in update["context_chunks"]["scholar"]
+    assert update["context_chunks"]["hn"] == "--- HN ---\n"
+
+
+def test_refine_evidence_drops_partial_summaries_of_refined_sources(mock_agent_state):
+    from src.tools.evidence_tools import refine_evidence_node
+    from src.tools.synthesis_tools import build_synthesis_context
+
+    mock_agent_state["web_research"] = [
+        {"title": "Structured concurrency", "url": "https://blog.example.com/sc", "content": ARTICLE},
+    ]
+    mock_agent_state["reddit_research"] = [
+        {"url": "https://blog.example.com/sc", "content": "Discussion of the post"},
+        {"url": "https://reddit.com/r/x/1", "content": "lol"},
+    ]
+    mock_agent_state["hn_research"] = [{"title": "HN story", "url": "https://news.ycombinator.com/item?id=1"}]
+    mock_agent_state["context_chunks"] = {"web": "--- WEB ---\n", "reddit": "--- REDDIT ---\n", "hn": "--- HN ---\n"}
+    mock_agent_state["partial_summaries"] = {
+        "reddit": "--- REDDIT (resumen parcial)\n* lol (https://reddit.com/r/x/1)\n\n",
+        "hn": "--- HN (resumen parcial)\n* HN story\n\n",
+    }
+
+    update = refine_evidence_node(mock_agent_state)
+
+    assert update["reddit_research"] == []
+    assert update["partial_summaries"] == {"hn": mock_agent_state["partial_summaries"]["hn"]}
+    context = build_synthesis_context({**mock_agent_state, **update})
+    assert "reddit.com/r/x/1" not in context
+    assert "HN story" in context
+
+
+def test_duplicate_grouping_is_fast_for_hundreds_of_items():
+    texts = [f"{ARTICLE} Variant number {i} discusses topic {i * 7919} in depth with unique words w{i}a w{i}b w{i}c w{i}d w{i}e."
+             for i in range(300)]
+    start = time.perf_counter()
+    fingerprints = [simhash(t) for t in texts]
+    keys = [[f"url:example.com/{i}"] for i in range(300)]
+    duplicate_groups(keys, fingerprints)
+    assert time.perf_counter() - start < 2.0
+
+
+def test_batch_quality_scores_match_single_item_scoring():
+    from src.quality import score_content_quality, score_content_quality_batch
+
+    texts = ["", "short", ARTICLE, "## Results\n\n- data https://a.org https://b.org https://c.org\n" + ARTICLE * 3]
+    assert list(score_content_quality_batch(texts)) == [score_content_quality(t) for t in texts]
+
+
+def test_refine_evidence_drops_low_quality_web_hits(mock_agent_state):
+    from src.tools.evidence_tools import refine_evidence_node
+
+    mock_agent_state["web_research"] = [
+        {"title": "Snippet", "url": "https://a.example.com", "content": "Click here"},
+        {"title": "Article", "url": "https://b.example.com", "content": ARTICLE},
+    ]
+    mock_agent_state["hn_research"] = [{"title": "HN story without text", "url": "https://news.ycombinator.com/item?id=1"}]
+
+    update = refine_evidence_node(mock_agent_state)
+
+    assert [item["title"] for item in update["web_research"]] == ["Article"]
+    assert "hn_research" not in update
+
+
+def test_refine_evidence_keeps_partial_summaries_when_nothing_is_dropped(mock_agent_state):
+    from src.tools.evidence_tools import refine_evidence_node
+
+    mock_agent_state["web_research"] = [
+        {"title": "Structured concurrency", "url": "https://a.example.com", "content": ARTICLE},
+        {"title": "Task groups", "url": "https://b.example.com",
+         "content": ARTICLE.replace("Structured concurrency", "Nursery-based concurrency").replace("Python", "Trio")
+         + " Trio nurseries came first and inspired the later designs in other languages and runtimes."},
+    ]
+    mock_agent_state["context_chunks"] = {"web": "--- WEB ---\n"}
+    mock_agent_state["partial_summaries"] = {"web": "--- WEB (resumen parcial)\n* ...\n\n"}
+
+    update = refine_evidence_node(mock_agent_state)
+
+    assert "partial_summaries" not in update
+    for item in update.get("web_research", []):
+        assert any(item is original for original in mock_agent_state["web_research"])
+
+
+def test_reranker_embeds_in_batches_and_caches_by_content(monkeypatch):
+    from src.rerank import EmbeddingCache, Reranker
+
+    vocab = ["rust", "async", "tokio", "pasta"]
+    calls = []
+
+    def fake_model(texts):
+        calls.append(len(texts))
+        return [[t.lower().count(w) for w in vocab] for t in texts]
+
+    monkeypatch.setattr("src.config.settings.rerank_backend", "embedding")
+    monkeypatch.setattr("src.config.settings.rerank_batch_size", 2)
+    reranker = Reranker(EmbeddingCache(max_entries=10))
+    monkeypatch.setattr(reranker, "_load_model", lambda: fake_model)
+    assert reranker.preload(timeout=5)
+
+    texts = ["pasta recipes", "tokio is an async rust runtime", "rust ownership", "async pasta"]
+    assert reranker.rank("rust async", texts)[0] == 1
+    assert calls == [2, 2, 1]
+
+    reranker.rank("rust async", texts)
+    assert calls == [2, 2, 1]  # every text came from the cache
+    assert reranker.stats()["cache"]["hits"] == 5
+    stats = reranker.stats()
+    assert stats["backend"] == "embedding" and stats["model"] == "ready"
+    assert stats["backends"]["embedding"]["items"] == 5  # the query plus four texts, embedded once
+    assert stats["backends"]["embedding"]["items_per_sec"] > 0
+
+
+def test_reranker_uses_bm25_while_the_model_loads(monkeypatch):
+    import threading
+    from src.rerank import EmbeddingCache, Reranker
+
+    loading = threading.Event()
+
+    def slow_model():
+        loading.wait(5)
+        return lambda texts: [[1.0] for _ in texts]
+
+    monkeypatch.setattr("src.config.settings.rerank_backend", "embedding")
+    reranker = Reranker(EmbeddingCache(max_entries=10))
+    monkeypatch.setattr(reranker, "_load_model", slow_model)
+
+    assert reranker.rank("rust", ["pasta", "rust runtime"]) == [1, 0]  # no wait for the model
+    assert reranker.model_status() == "loading"
+    assert reranker.stats()["backends"]["bm25"]["items"] == 2
+    loading.set()
+    assert reranker.preload(timeout=5)
+
+
+def test_refine_evidence_orders_items_by_relevance(mock_agent_state):
+    from src.tools.evidence_tools import refine_evidence_node
+
+    mock_agent_state["topic"] = "Rust async runtimes"
+    mock_agent_state["wiki_research"] = [
+        {"title": "Cooking", "summary": "Pasta should be cooked in plenty of salted water.", "url": "https://w/1"},
+        {"title": "Tokio", "summary": "Tokio is an async runtime for Rust.", "url": "https://w/2"},
+    ]
+
+    update = refine_evidence_node(mock_agent_state)
+
+    assert [item["title"] for item in update["wiki_research"]] == ["Tokio", "Cooking"]
@@ -0,0 +1,62 @@
+import time
+from unittest.mock import patch
+
+from src import health
+from src.health import ReadinessProbe, run_checks
+
+
+def _slow_check(*args, **kwargs):
+    time.sleep(0.2)
+    return True
+
+
+def test_checks_run_concurrently_and_are_cached():
+    """A round costs about one check, not the sum of them, and is reused within the TTL."""
+    calls = []
+
+    def source_check(source):
+        calls.append(source)
+        return _slow_check()
+
+    with patch("src.health.check_ollama_connection", _slow_check), \
+         patch("src.health.check_llm_model", _slow_check), \
+         patch("src.health.check_internet_connection", _slow_check), \
+         patch("src.health.check_disk_space", _slow_check), \
+         patch("src.health.check_source_endpoint", source_check), \
+         patch.dict(health._cache, clear=True):
+        start = time.time()
+        checks = run_checks(["wiki", "arxiv", "github"])
+        elapsed = time.time() - start
+
+        assert elapsed < 0.6
+        assert checks["source:wiki"] and checks["llm_model"]
+        assert sorted(calls) == ["arxiv", "github", "wiki"]
+
+        run_checks(["wiki", "arxiv", "github"])
+        assert len(calls) == 3
+
+
+def test_readiness_probe_separates_critical_from_degraded():
+    probe = ReadinessProbe(checker=lambda: {
+        "ollama": True, "llm_model": True, "disk_space": True,
+        "internet": True, "source:github": False,
+    })
+    assert probe.ready is None
+
+    snapshot = probe.refresh()
+    assert snapshot["ready"] is True
+    assert snapshot["degraded"] == ["source:github"]
+
+    probe._checker = lambda: {"ollama": True, "llm_model": False, "disk_space": True}
+    assert probe.refresh()["ready"] is False
+
+
+def test_llm_connection_check_rejects_auth_failures(monkeypatch):
+    from unittest.mock import MagicMock
+    from src.health import check_ollama_connection
+
+    monkeypatch.setattr("src.health.settings.openai_api_key", "expired-key")
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+    for status, healthy in [(200, True), (401, False), (403, False), (429, False), (404, True)]:
+        with patch("requests.get", return_value=MagicMock(status_code=status)):
+            assert check_ollama_connection() is healthy, status
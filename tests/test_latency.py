@@ -0,0 +1,40 @@
+import time
+from unittest.mock import patch
+
+from src.latency import LatencyTracker, source_timeout
+
+
+def test_deadline_uses_cap_until_enough_samples():
+    tracker = LatencyTracker(window=20)
+    assert tracker.deadline("scholar") == source_timeout("scholar")
+
+    for _ in range(10):
+        tracker.record("scholar", 2.0)
+    # p95 2s * 1.5 = 3s, well under Scholar's 25s cap
+    assert tracker.deadline("scholar") == 3.0
+
+    for _ in range(20):
+        tracker.record("scholar", 100.0)
+    assert tracker.deadline("scholar") == source_timeout("scholar")
+
+
+def test_parallel_search_returns_partial_results_within_budget(mock_agent_state):
+    """A slow source is dropped once the run's search budget expires; finished sources are kept."""
+    from src.tools.parallel_tools import parallel_search_node
+
+    def slow_so(state):
+        time.sleep(2)
+        return {"so_research": [{"title": "late"}]}
+
+    mock_agent_state["research_plan"] = ["hn", "so"]
+    mock_agent_state["search_budget"] = 0.5
+
+    with patch("src.tools.research_tools.search_hn_node", return_value={"hn_research": [{"title": "fast"}]}), \
+         patch("src.tools.research_tools.search_so_node", side_effect=slow_so):
+        start = time.time()
+        result = parallel_search_node(mock_agent_state)
+        elapsed = time.time() - start
+
+    assert elapsed < 1.5
+    assert result["hn_research"] == [{"title": "fast"}]
+    assert "so_research" not in result
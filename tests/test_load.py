@@ -6,14 +6,14 @@ from src.tools.research_tools import search_web_node
 
 @patch('src.tools.research_tools.update_next_node')
 @patch('src.config.settings')
-@patch('langchain_community.tools.tavily_search.TavilySearchResults')
+@patch('src.tools.web_content.get_tavily_client')
 @patch('requests.get') # Patch globally as requests is imported locally
 def test_concurrent_web_searches(mock_requests_get, mock_tavily, mock_settings, mock_next_node):
     """Test running multiple web searches in parallel."""
     
-    # Setup Mocks
+    # Setup Mocks (no raw page content, so every hit falls back to the Jina reader)
     mock_tavily_instance = mock_tavily.return_value
-    mock_tavily_instance.run.return_value = [{"url": "http://example.com", "content": "Example content"}]
+    mock_tavily_instance.search.return_value = {"results": [{"url": "http://example.com", "content": "Example content"}]}
     
     # Configure requests mock for Jina reader
     mock_response = MagicMock()
@@ -61,3 +61,25 @@ def test_clear_history(clean_db):
     
     clear_history(db_path=db_path)
     assert len(get_recent_sessions(db_path=db_path)) == 0
+
+def test_cleanup_old_reports_removes_only_stale_session_folders(tmp_path):
+    import time
+    from src.db_manager import cleanup_old_reports
+
+    old = tmp_path / ("a" * 32)
+    old.mkdir()
+    (old / "reporte_final.html").write_text("old")
+    recent = tmp_path / ("b" * 32)
+    recent.mkdir()
+    (recent / "reporte_final.html").write_text("new")
+    unrelated = tmp_path / "archive"
+    unrelated.mkdir()
+    legacy = tmp_path / "reporte_final.html"
+    legacy.write_text("cli")
+    stale = time.time() - 40 * 86400
+    for path in (old / "reporte_final.html", old, unrelated, legacy):
+        os.utime(path, (stale, stale))
+
+    assert cleanup_old_reports(days=30, reports_dir=str(tmp_path)) == 1
+    assert not old.exists()
+    assert recent.exists() and unrelated.exists() and legacy.exists()
@@ -0,0 +1,102 @@
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.rate_limit import ApiRateLimiter, RateLimitExceeded, api_limiters
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _wait_until(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "condition not reached"
+        time.sleep(0.001)
+
+
+def test_limiter_serves_sessions_round_robin():
+    """A session with a backlog of calls doesn't starve one that arrives later."""
+    clock = FakeClock()
+    limiter = ApiRateLimiter("test", rate=50, burst=1, clock=clock)
+    limiter.acquire("warmup")  # empty the bucket so everyone queues
+    order = []
+
+    def worker(session):
+        limiter.acquire(session, timeout=5)
+        order.append(session)
+
+    threads = [threading.Thread(target=worker, args=("busy",)) for _ in range(3)]
+    for t in threads:
+        t.start()
+    _wait_until(lambda: limiter.to_dict()["waiting"] == 3)  # the clock is frozen: nobody gets a token
+    late = threading.Thread(target=worker, args=("late",))
+    late.start()
+    _wait_until(lambda: limiter.to_dict()["waiting"] == 4)
+
+    for served in range(1, 5):
+        clock.now += 0.05  # refills exactly one token (burst 1)
+        _wait_until(lambda: len(order) == served)
+    for t in threads + [late]:
+        t.join()
+
+    assert order.index("late") <= 1
+
+
+def test_limiter_honours_server_quota_and_throttling():
+    limiter = ApiRateLimiter("test", rate=100, burst=5)
+    limiter.update(remaining=0, reset_at=time.time() + 30)
+    with pytest.raises(RateLimitExceeded):
+        limiter.acquire(timeout=0.05)
+
+    limiter = ApiRateLimiter("test", rate=100, burst=5)
+    error = Exception("403 {'message': 'API rate limit exceeded'}")
+    error.status = 403
+    error.headers = {"Retry-After": "45"}
+    with pytest.raises(RateLimitExceeded):
+        limiter.call(MagicMock(side_effect=error))
+    assert limiter.to_dict()["wait_s"] > 40
+    assert limiter.throttled == 1
+
+
+def test_identical_in_flight_requests_are_coalesced():
+    limiter = ApiRateLimiter("test", rate=100, burst=5)
+    release = threading.Event()
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        release.wait(2)
+        return ["paper"]
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(limiter.call(fetch, key="q"))) for _ in range(3)]
+    for t in threads:
+        t.start()
+    _wait_until(lambda: limiter.to_dict()["coalesced"] == 2)
+    release.set()
+    for t in threads:
+        t.join()
+
+    assert len(calls) == 1
+    assert results == [["paper"]] * 3
+
+
+def test_throttled_source_fails_instead_of_returning_empty(mock_agent_state):
+    """A 429 must reach the breaker as an error rather than be cached as 'no results'."""
+    api_limiters.reset()
+    try:
+        with patch("stackapi.StackAPI") as mock_stackapi:
+            mock_stackapi.return_value.fetch.side_effect = Exception("throttle_violation: too many requests")
+            from src.tools.research_tools import search_so_node
+            with pytest.raises(RateLimitExceeded):
+                search_so_node(mock_agent_state)
+    finally:
+        api_limiters.reset()
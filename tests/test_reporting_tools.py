@@ -1,3 +1,4 @@
+import os
 import pytest
 from unittest.mock import MagicMock, patch
 from src.tools.reporting_tools import generate_report_node
@@ -44,7 +45,7 @@ def test_generate_report_node_full(mock_agent_state):
     assert "Video 1" in report_html
     assert "Wiki Title" in report_html
 
-@patch("src.tools.reporting_tools.FPDF")
+@patch("fpdf.FPDF")
 def test_generate_pdf(mock_fpdf, mock_agent_state):
     from src.tools.reporting_tools import generate_pdf
     
@@ -56,3 +57,9 @@ def test_generate_pdf(mock_fpdf, mock_agent_state):
     
     # Assert FPDF was called
     assert mock_fpdf.called
+
+
+def test_get_reports_dir_is_per_session():
+    from src.tools.reporting_tools import get_reports_dir
+    assert get_reports_dir({}) == "reports"
+    assert get_reports_dir({"session_id": "abc"}) == os.path.join("reports", "abc")
@@ -21,10 +21,13 @@ def test_translate_to_english():
 
 @patch("requests.get")
 def test_search_web_node_tavily(mock_get, mock_agent_state):
-    """Test web search node with Jina extraction."""
-    with patch("langchain_community.tools.tavily_search.TavilySearchResults") as mock_tavily:
-        mock_search = mock_tavily.return_value
-        mock_search.run.return_value = [{"url": "http://test.com", "content": "Raw content"}]
+    """Tavily page content is used directly; only hits without it go through Jina extraction."""
+    with patch("tavily.TavilyClient") as mock_tavily, \
+         patch("src.config.settings.tavily_api_key", "test-key"):
+        mock_tavily.return_value.search.return_value = {"results": [
+            {"url": "http://test.com/a", "title": "A", "content": "Snippet A", "raw_content": "Full page A"},
+            {"url": "http://test.com/b", "title": "B", "content": "Snippet B", "raw_content": None},
+        ]}
         
         # Mock Jina response
         mock_jina_res = MagicMock()
@@ -34,9 +37,9 @@ def test_search_web_node_tavily(mock_get, mock_agent_state):
         
         result = search_web_node(mock_agent_state)
         
-        assert "web_research" in result
-        assert len(result["web_research"]) > 0
-        assert result["web_research"][0]["content"] == "Markdown content from Jina"
+        assert [r["content"] for r in result["web_research"]] == ["Full page A", "Markdown content from Jina"]
+        assert mock_tavily.return_value.search.call_args.kwargs["include_raw_content"]
+        assert mock_get.call_count == 1
         assert "next_node" in result
 
 def test_search_web_node_ddg(mock_agent_state):
@@ -91,7 +94,7 @@ def test_search_arxiv_node(mock_search_class, mock_client_class, mock_agent_stat
     assert "next_node" in result
 
 def test_search_scholar_node(mock_agent_state):
-    with patch("src.tools.research_tools.SemanticScholar") as mock_scholar_class:
+    with patch("semanticscholar.SemanticScholar") as mock_scholar_class:
         mock_instance = mock_scholar_class.return_value
         mock_paper = MagicMock()
         mock_paper.title = "Scholar Title"
@@ -109,7 +112,7 @@ def test_search_scholar_node(mock_agent_state):
         assert "next_node" in result
 
 def test_search_github_node(mock_agent_state):
-    with patch("src.tools.research_tools.Github") as mock_github_class:
+    with patch("github.Github") as mock_github_class:
         mock_instance = mock_github_class.return_value
         mock_repo = MagicMock()
         mock_repo.full_name = "user/repo"
@@ -128,6 +131,30 @@ def test_search_github_node(mock_agent_state):
         assert "github_research" in result
         assert "next_node" in result
 
+def test_search_github_node_graphql_fetches_readmes_in_one_request(mock_agent_state, monkeypatch):
+    monkeypatch.setenv("GITHUB_TOKEN", "token")
+    mock_agent_state["persona"] = "tech"
+    response = MagicMock(status_code=200)
+    response.json.return_value = {"data": {
+        "search": {"nodes": [{
+            "nameWithOwner": "user/repo", "description": "Repo Desc", "url": "https://github.com/user/repo",
+            "stargazerCount": 100, "readmeMd": None, "readmeRst": {"text": "Repo README"},
+        }]},
+        "rateLimit": {"remaining": 4999, "resetAt": "2030-01-01T00:00:00Z"},
+    }}
+
+    with patch("requests.post", return_value=response) as mock_post, patch("github.Github") as mock_github_class:
+        from src.tools.research_tools import search_github_node
+        result = search_github_node(mock_agent_state)
+
+    assert mock_post.call_count == 1
+    assert mock_post.call_args.kwargs["json"]["variables"]["readme"] is True
+    mock_github_class.assert_not_called()
+    assert result["github_research"] == [{
+        "name": "user/repo", "description": "Repo Desc", "url": "https://github.com/user/repo",
+        "stars": 100, "content": "Repo README",
+    }]
+
 @patch("requests.get")
 def test_search_hn_node(mock_get, mock_agent_state):
     mock_response = MagicMock()
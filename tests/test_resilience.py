@@ -53,15 +53,15 @@ def test_search_web_node_timeout(mock_settings, mock_next_node):
     mock_settings.content_fetch_timeout = 0.1
     mock_settings.max_content_preview_chars = 100
     
-    # Mock TavilySearchResults to hang
-    with patch('langchain_community.tools.tavily_search.TavilySearchResults') as MockTavily:
+    # Mock the Tavily client to hang
+    with patch('src.tools.web_content.get_tavily_client') as MockTavily:
         mock_tavily_instance = MockTavily.return_value
         
         def slow_run(*args, **kwargs):
             time.sleep(0.5) # Sleep longer than timeout
-            return [{"url": "http://slow.com", "content": "Too slow"}]
+            return {"results": [{"url": "http://slow.com", "content": "Too slow"}]}
         
-        mock_tavily_instance.run.side_effect = slow_run
+        mock_tavily_instance.search.side_effect = slow_run
         
         # Configure logging to verify timeout warning
         with patch('src.tools.research_tools.logger') as mock_logger:
@@ -0,0 +1,94 @@
+import threading
+import pytest
+from unittest.mock import patch
+from src.events import progress_bus
+from src.scheduler import ResearchScheduler, QueueFullError
+
+
+def _blocking_runner(gate):
+    def runner(job):
+        gate.wait(timeout=5)
+        return {"topic": job.inputs["topic"], "consolidated_summary": "ok"}
+    return runner
+
+
+@patch("src.scheduler.llm_capacity", return_value=8)
+def test_scheduler_limits_concurrency_and_reports_position(mock_capacity):
+    gate = threading.Event()
+    scheduler = ResearchScheduler(max_concurrent=1, max_queued=5, runner=_blocking_runner(gate))
+
+    first = scheduler.submit({"topic": "A"})
+    second = scheduler.submit({"topic": "B"})
+
+    # Wait until the single slot picked up the first job
+    for _ in range(100):
+        if first.status == "running":
+            break
+        threading.Event().wait(0.01)
+
+    assert first.status == "running"
+    assert second.status == "queued"
+    assert scheduler.position(second.job_id) == 1
+    assert scheduler.eta(second.job_id) > 0
+
+    gate.set()
+    assert second.wait(timeout=5)
+    assert first.result["consolidated_summary"] == "ok"
+    assert second.status == "done"
+    assert scheduler.position(second.job_id) == 0
+
+
+@patch("src.scheduler.llm_capacity", return_value=1)
+def test_scheduler_slots_capped_by_llm_capacity(mock_capacity):
+    scheduler = ResearchScheduler(max_concurrent=10, max_queued=5, runner=lambda job: {})
+    assert scheduler.slots == 1
+
+
+@patch("src.scheduler.llm_capacity", return_value=1)
+def test_scheduler_rejects_when_queue_full(mock_capacity):
+    gate = threading.Event()
+    scheduler = ResearchScheduler(max_concurrent=1, max_queued=1, runner=_blocking_runner(gate))
+    scheduler.submit({"topic": "running"})
+    for _ in range(100):
+        if scheduler.stats()["running"] == 1:
+            break
+        threading.Event().wait(0.01)
+    scheduler.submit({"topic": "waiting"})
+
+    with pytest.raises(QueueFullError):
+        scheduler.submit({"topic": "rejected"})
+    gate.set()
+
+
+@patch("src.scheduler.llm_capacity", return_value=2)
+def test_scheduler_publishes_job_events(mock_capacity):
+    def failing_runner(job):
+        raise RuntimeError("LLM down")
+
+    scheduler = ResearchScheduler(max_concurrent=1, max_queued=5, runner=failing_runner)
+    q = progress_bus.subscribe("job-events")
+    job = scheduler.submit({"topic": "X", "session_id": "job-events"})
+    assert job.wait(timeout=5)
+
+    types = []
+    while not q.empty():
+        types.append(q.get_nowait()["type"])
+    progress_bus.close("job-events")
+
+    assert job.job_id == "job-events"
+    assert job.status == "error"
+    assert "error" in types and types[-1] == "done"
+
+
+@patch("src.scheduler.llm_capacity", return_value=2)
+def test_evicted_jobs_release_their_progress_channels(mock_capacity):
+    with patch("src.scheduler.settings.max_finished_jobs", 1):
+        scheduler = ResearchScheduler(max_concurrent=1, max_queued=5, runner=lambda job: {})
+        first = scheduler.submit({"topic": "X"})
+        assert first.wait(timeout=5)
+        second = scheduler.submit({"topic": "Y"})
+        assert second.wait(timeout=5)
+
+    assert scheduler.get(first.job_id) is None
+    assert first.job_id not in progress_bus._channels
+    assert scheduler.get(second.job_id) is second
@@ -0,0 +1,39 @@
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+
+def test_concurrent_identical_source_calls_share_one_request(mock_agent_state):
+    """Two sessions researching the same query hit Hacker News once; each keeps its own next_node."""
+    from src.singleflight import source_flights
+    from src.tools.research_tools import search_hn_node
+
+    response = MagicMock()
+    response.json.return_value = {"hits": [{"title": "HN Story", "objectID": "1"}]}
+    coalesced = source_flights.coalesced
+
+    def slow_get(*args, **kwargs):
+        # Hold the request open until the second session has joined the flight
+        deadline = time.monotonic() + 5
+        while source_flights.coalesced == coalesced and time.monotonic() < deadline:
+            time.sleep(0.01)
+        return response
+
+    states = [
+        {**mock_agent_state, "session_id": "a", "research_plan": ["hn", "wiki"]},
+        {**mock_agent_state, "session_id": "b", "research_plan": ["hn"]},
+    ]
+    results = {}
+    with patch("requests.get", side_effect=slow_get) as mock_get:
+        threads = [threading.Thread(target=lambda s=s: results.update({s["session_id"]: search_hn_node(s)}))
+                   for s in states]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+    assert mock_get.call_count == 1
+    assert results["a"]["hn_research"] == results["b"]["hn_research"]
+    assert results["a"]["hn_research"] is not results["b"]["hn_research"]
+    assert results["a"]["next_node"] == "wiki"
+    assert results["b"]["next_node"] == "END"
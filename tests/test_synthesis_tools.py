@@ -41,3 +41,59 @@ def test_consolidate_research_node_persona(mock_chat_ollama, mock_agent_state):
     prompt = mock_chat_ollama.return_value.invoke.call_args[0][0][0].content
     assert "Product Manager" in prompt
     assert "CONOCIMIENTO LOCAL" in prompt
+
+
+def test_build_synthesis_context_prefers_prepared_sections(mock_agent_state):
+    """Partial summaries beat pre-formatted chunks, which beat formatting from raw state."""
+    from src.tools.synthesis_tools import build_synthesis_context, format_source_section
+
+    mock_agent_state["wiki_research"] = [{"title": "Wiki", "summary": "Wiki content"}]
+    mock_agent_state["hn_research"] = [{"title": "HN story", "url": "https://news.ycombinator.com/item?id=1"}]
+    mock_agent_state["arxiv_research"] = [{"title": "Paper", "summary": "Abstract", "url": "http://arxiv.org/1"}]
+    mock_agent_state["context_chunks"] = {"hn": "--- HN CHUNK ---\n"}
+    mock_agent_state["partial_summaries"] = {"arxiv": "--- ARXIV SUMMARY ---\n"}
+
+    context = build_synthesis_context(mock_agent_state)
+
+    assert format_source_section("wiki", mock_agent_state) in context
+    assert "--- HN CHUNK ---" in context
+    assert "--- ARXIV SUMMARY ---" in context
+    assert "Abstract" not in context
+    # Sections keep their canonical order regardless of arrival order
+    assert context.index("WIKIPEDIA") < context.index("ARXIV SUMMARY") < context.index("HN CHUNK")
+
+
+def test_parallel_search_summarizes_sources_while_searching(mock_agent_state):
+    """With progressive synthesis on, finished sources are formatted and map-summarized during the search."""
+    from src.tools.parallel_tools import parallel_search_node
+
+    mock_agent_state["research_plan"] = ["hn"]
+    hn_result = {"hn_research": [{"title": "HN story", "url": "https://news.ycombinator.com/item?id=1"}]}
+
+    with patch("src.tools.research_tools.search_hn_node", return_value=hn_result), \
+         patch("src.tools.parallel_tools.settings.progressive_synthesis", True), \
+         patch("src.tools.synthesis_tools.get_llm") as mock_llm:
+        mock_llm.return_value.invoke.return_value = MagicMock(content="* HN says X ([HN](https://news.ycombinator.com/item?id=1))")
+        result = parallel_search_node(mock_agent_state)
+
+    assert "HN story" in result["context_chunks"]["hn"]
+    assert "HN says X" in result["partial_summaries"]["hn"]
+
+
+def test_format_source_section_compresses_item_text_keeping_urls(mock_agent_state):
+    """Long page text is cut to its query-relevant sentences; the citation fields stay verbatim."""
+    from src.tools.synthesis_tools import format_source_section
+
+    filler = " ".join(f"The office cafeteria menu changes on day {i} of the month." for i in range(60))
+    page = f"{filler} Tokio is the most widely used async runtime for Rust. {filler}"
+    mock_agent_state["topic"] = "Rust async runtime"
+    mock_agent_state["queries"] = {"en": "Rust async runtimes"}
+    mock_agent_state["web_research"] = [{"title": "Runtimes", "url": "https://example.org/rust-async", "content": page}]
+
+    with patch("src.config.settings.synthesis_item_token_budget", 100):
+        section = format_source_section("web", mock_agent_state)
+
+    assert "URL: https://example.org/rust-async" in section
+    assert "Tokio is the most widely used async runtime for Rust." in section
+    assert "cafeteria" not in section
+    assert len(section) < len(page) // 10
@@ -0,0 +1,126 @@
+from unittest.mock import MagicMock, patch
+
+from src.tools.web_content import fetch_page_text, page_previews
+
+
+def _response(status, text="", headers=None):
+    response = MagicMock(status_code=status, text=text)
+    response.headers = headers or {}
+    return response
+
+
+def test_pages_are_cached_and_revalidated(isolated_page_cache):
+    url = "https://example.com/post"
+    page = "Title: Post\nURL Source: https://example.com/post\nMarkdown Content:\nFull article text"
+
+    with patch("requests.get", return_value=_response(200, page, {"ETag": '"v1"'})) as mock_get:
+        assert fetch_page_text(url) == "Full article text"
+        assert fetch_page_text(url) == "Full article text"
+    assert mock_get.call_count == 1  # second read served from the cache
+
+    isolated_page_cache.ttl_hours = 0  # everything is stale now
+    with patch("requests.get", return_value=_response(304)) as mock_get:
+        assert fetch_page_text(url) == "Full article text"
+    assert mock_get.call_args.kwargs["headers"] == {"If-None-Match": '"v1"'}
+
+
+def test_page_cache_prunes_the_oldest_entries(isolated_page_cache):
+    import os
+
+    for i in range(10):
+        isolated_page_cache.put(f"https://example.com/{i}", "x" * 1000)
+        path = isolated_page_cache._path(f"https://example.com/{i}", "")
+        os.utime(path, (1000 + i, 1000 + i))
+
+    removed = isolated_page_cache.prune(max_bytes=5000)
+
+    assert removed > 0
+    assert isolated_page_cache.get("https://example.com/0") is None
+    assert isolated_page_cache.get("https://example.com/9")["text"] == "x" * 1000
+    sizes = sum(e.stat().st_size for e in os.scandir(isolated_page_cache.directory))
+    assert sizes <= 4500
+
+
+def test_previews_are_sliced_from_the_cached_full_text(isolated_page_cache):
+    with patch("requests.get", return_value=_response(200, "x" * 200)), \
+         patch("src.tools.web_content.settings.max_content_preview_chars", 50):
+        previews = page_previews(["https://example.com/a", "not-a-url"])
+
+    assert previews == {"https://example.com/a": "x" * 50}
+    assert len(isolated_page_cache.get("https://example.com/a", "jina")["text"]) == 200
+
+
+def test_local_extractor_caches_more_than_a_preview(isolated_page_cache):
+    article = "".join(f"<p>Paragraph {i} about structured concurrency and task lifetimes in runtimes.</p>"
+                      for i in range(40))
+    with patch("src.tools.html_extract.get_http_session") as mock_session, \
+         patch("src.tools.web_content.settings.page_extractor", "local"), \
+         patch("src.tools.web_content.settings.max_content_preview_chars", 100):
+        response = MagicMock(status_code=200, headers={"Content-Type": "text/html"}, encoding="utf-8")
+        response.iter_content.return_value = [f"<html><body>{article}</body></html>".encode()]
+        mock_session.return_value.get.return_value = response
+        previews = page_previews(["https://example.com/long"])
+
+    assert len(previews["https://example.com/long"]) == 100
+    assert len(isolated_page_cache.get("https://example.com/long", "local")["text"]) > 2000
+
+
+def test_run_fetches_do_not_queue_behind_background_prefetches(monkeypatch):
+    import threading
+    from concurrent.futures import ThreadPoolExecutor
+    from src.tools import web_content
+
+    release = threading.Event()
+    pool = ThreadPoolExecutor(max_workers=1)
+    pool.submit(release.wait, 5)  # another run's page still downloading
+    monkeypatch.setattr(web_content, "_prefetch_pool", pool)
+    try:
+        with patch("requests.get", return_value=_response(200, "Page text")):
+            previews = page_previews(["https://example.com/a"], timeout=2)
+    finally:
+        release.set()
+        pool.shutdown()
+
+    assert previews == {"https://example.com/a": "Page text"}
+
+
+def test_local_extractor_recovers_from_unclosed_links_and_keeps_lookalike_classes():
+    from src.tools.html_extract import extract_main_text
+
+    body = "Structured concurrency ties the lifetime of every task to a lexical scope in the program."
+    assert extract_main_text(f"<body><p>Menu <a href=x>home</p><p>{body}</p></body>") == body
+    assert extract_main_text(f"<body><div class='shared-content'><div id='commentary'><p>{body}</p></div></div></body>") == body
+    assert extract_main_text(f"<body><div class='post_share'><p>{body}</p></div><div class='comments-area'><p>{body}</p></div></body>") == ""
+
+
+def test_local_extractor_streams_main_text_and_stops_early():
+    from src.tools.html_extract import extract_main_text, fetch_main_text
+
+    page = ("<html><body><nav><a href='/'>Home</a> <a href='/blog'>Blog</a></nav>"
+            "<div class='cookie-banner'>We use cookies to give you the best experience on our site.</div>"
+            "<article><h1>Vector databases</h1>"
+            "<p>Vector databases store embeddings and answer nearest-neighbour queries at scale.</p>"
+            "<p>They differ in indexing (HNSW, IVF) &amp; filtering support for RAG pipelines.</p>"
+            "</article><footer>Copyright Example Inc. All rights reserved worldwide.</footer></body></html>")
+    text = extract_main_text(page)
+    assert text.startswith("## Vector databases\n\nVector databases store")
+    assert "& filtering" in text
+    assert "cookies" not in text and "Copyright" not in text and "Home" not in text
+
+    chunks = [b"<html><body>"] + [b"<p>" + b"word " * 20 + b"</p>" for _ in range(1000)]
+    consumed = []
+
+    def iter_content(chunk_size):
+        for chunk in chunks:
+            consumed.append(chunk)
+            yield chunk
+
+    response = MagicMock(status_code=200, headers={"Content-Type": "text/html; charset=utf-8"}, encoding="utf-8")
+    response.iter_content.side_effect = iter_content
+    with patch("src.tools.html_extract.get_http_session") as mock_session:
+        mock_session.return_value.get.return_value = response
+        status, text, _ = fetch_main_text("https://example.com", limit=500, timeout=3)
+
+    assert status == 200 and len(text) == 500
+    assert len(consumed) < 10  # the rest of the page was never downloaded
+    response.close.assert_called_once()
@@ -2,7 +2,7 @@ import pytest
 from unittest.mock import MagicMock, patch
 from src.tools.youtube_tools import search_videos_node, summarize_videos_node
 
-@patch("src.tools.youtube_tools.YoutubeSearch")
+@patch("youtube_search.YoutubeSearch")
 def test_search_videos_node(mock_yt_search, mock_agent_state):
     mock_instance = mock_yt_search.return_value
     mock_instance.to_dict.return_value = [
@@ -16,12 +16,55 @@ def test_search_videos_node(mock_yt_search, mock_agent_state):
     assert len(result["video_urls"]) == 1
     assert "video123" in result["video_urls"][0]
 
-@patch("src.tools.youtube_tools.load_summarize_chain")
-@patch("src.tools.youtube_tools.YoutubeLoader")
-def test_summarize_videos_node_with_transcript(mock_loader, mock_chain, mock_agent_state):
-    # Mock Chain
-    mock_chain_instance = mock_chain.return_value
-    mock_chain_instance.run.return_value = "Video Summary"
+def test_search_videos_node_data_api_skips_captionless_videos(mock_agent_state):
+    search = MagicMock()
+    search.json.return_value = {"items": [{"id": {"videoId": v}} for v in ("a", "b", "c")]}
+    details = MagicMock()
+    details.json.return_value = {"items": [
+        {"id": "a", "snippet": {"title": "A", "channelTitle": "Chan"},
+         "contentDetails": {"duration": "PT12M5S", "caption": "true"}, "statistics": {"viewCount": "1000"}},
+        {"id": "b", "snippet": {"title": "B", "channelTitle": "Chan"},
+         "contentDetails": {"duration": "PT3M", "caption": "false"}, "statistics": {}},
+        {"id": "c", "snippet": {"title": "C", "channelTitle": "Chan"},
+         "contentDetails": {"duration": "PT1H", "caption": "true"}, "statistics": {}},
+    ]}
+
+    with patch("src.tools.youtube_tools.settings.youtube_api_key", "key"), \
+         patch("src.tools.youtube_tools.settings.youtube_require_captions", True), \
+         patch("requests.get", side_effect=[search, details]) as mock_get, \
+         patch("youtube_search.YoutubeSearch") as mock_scrape:
+        result = search_videos_node(mock_agent_state)
+
+    assert mock_get.call_count == 2  # search.list + one batched videos.list
+    assert mock_get.call_args.kwargs["params"]["id"] == "a,b,c"
+    for call in mock_get.call_args_list:  # never in the URL, which error messages quote
+        assert call.kwargs["headers"] == {"X-Goog-Api-Key": "key"}
+        assert "key" not in call.kwargs["params"]
+    mock_scrape.assert_not_called()
+    assert result["video_urls"] == ["https://www.youtube.com/watch?v=a", "https://www.youtube.com/watch?v=c"]
+    assert result["video_metadata"][0]["duration_s"] == 725
+    assert result["video_metadata"][0]["views"] == 1000
+
+def test_search_videos_node_data_api_keeps_videos_with_auto_captions_by_default(mock_agent_state):
+    search = MagicMock()
+    search.json.return_value = {"items": [{"id": {"videoId": v}} for v in ("a", "b")]}
+    details = MagicMock()
+    details.json.return_value = {"items": [
+        {"id": v, "snippet": {"title": v}, "contentDetails": {"caption": "false"}, "statistics": {}} for v in ("a", "b")
+    ]}
+
+    with patch("src.tools.youtube_tools.settings.youtube_api_key", "key"), \
+         patch("requests.get", side_effect=[search, details]) as mock_get:
+        result = search_videos_node(mock_agent_state)
+
+    assert [v["has_captions"] for v in result["video_metadata"]] == [False, False]
+    assert len(result["video_urls"]) == 2
+
+@patch("src.tools.youtube_tools.get_llm")
+@patch("langchain_community.document_loaders.YoutubeLoader")
+def test_summarize_videos_node_with_transcript(mock_loader, mock_get_llm, mock_agent_state):
+    # Mock LLM
+    mock_get_llm.return_value.invoke.return_value = MagicMock(content="Video Summary")
     
     # Mock Loader
     mock_loader_instance = mock_loader.from_youtube_url.return_value
@@ -37,19 +80,15 @@ def test_summarize_videos_node_with_transcript(mock_loader, mock_chain, mock_age
     assert "summaries" in result
     assert result["summaries"][0] == "Video Summary"
 
-@patch("src.tools.youtube_tools.load_summarize_chain")
 @patch("src.tools.youtube_tools.get_llm")
-@patch("src.tools.youtube_tools.YoutubeLoader")
-def test_summarize_videos_node_fallback(mock_loader, mock_chat_ollama, mock_chain, mock_agent_state):
+@patch("langchain_community.document_loaders.YoutubeLoader")
+def test_summarize_videos_node_fallback(mock_loader, mock_chat_ollama, mock_agent_state):
     # Mock LLM (for the fallback call later)
     mock_llm = mock_chat_ollama.return_value
     mock_response = MagicMock()
     mock_response.content = "Metadata Summary"
     mock_llm.invoke.return_value = mock_response
     
-    # Mock Chain to load successfully (not used in fallback but loaded before)
-    mock_chain.return_value = MagicMock()
-    
     # Mock Loader to fail (transcript blocked)
     mock_loader.from_youtube_url.side_effect = Exception("Blocked")
     
@@ -60,3 +99,26 @@ def test_summarize_videos_node_fallback(mock_loader, mock_chat_ollama, mock_chai
     
     assert "summaries" in result
     assert result["summaries"][0] == "Metadata Summary"
+
+
+@patch("src.tools.youtube_tools.get_llm")
+@patch("langchain_community.document_loaders.YoutubeLoader")
+def test_long_transcript_is_compressed_before_map_reduce(mock_loader, mock_get_llm, mock_agent_state):
+    """An hour of mostly off-topic talk reaches the LLM as a few relevant chunks."""
+    filler = "so yeah today we are going to talk about a lot of different stuff and say hi to everyone. " * 800
+    relevant = "Vector databases index embeddings with HNSW graphs for fast similarity search. "
+    mock_doc = MagicMock()
+    mock_doc.page_content = filler + relevant + filler
+    mock_loader.from_youtube_url.return_value.load.return_value = [mock_doc]
+    mock_get_llm.return_value.invoke.return_value = MagicMock(content="Summary")
+
+    mock_agent_state["topic"] = "vector databases"
+    mock_agent_state["video_urls"] = ["https://youtube.com/watch?v=1"]
+    mock_agent_state["video_metadata"] = [{"title": "Video 1"}]
+    result = summarize_videos_node(mock_agent_state)
+
+    prompts = [c.args[0] for c in mock_get_llm.return_value.invoke.call_args_list]
+    sent = sum(len(p) for p in prompts)
+    assert result["summaries"] == ["Summary"]
+    assert sent * 10 < len(mock_doc.page_content)
+    assert any("HNSW graphs" in p for p in prompts)